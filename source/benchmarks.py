@@ -0,0 +1,433 @@
+import argparse
+import contextlib
+import gc
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+import timeit
+import tracemalloc
+from datetime import datetime
+
+from revolver import Revolver
+from logger import Logger
+from game import RussianRoulette
+import graphics
+import kernel
+import tables
+
+# Registered benchmarks: name -> factory returning (stmt, setup) callables
+BENCHMARKS = {}
+
+# Seed used before every benchmark so runs are comparable
+BENCH_SEED = 1234
+
+# Default relative slowdown that counts as a regression (10%)
+DEFAULT_THRESHOLD = 0.10
+
+# Memory budgets in bytes, checked by --memory and the unit tests
+# (measured on CPython 3.11: ~1450 per idle table, ~105 per logged event)
+MEMORY_BUDGETS = {"table": 1600, "event": 128}
+
+
+def benchmark(name):
+    """Register a benchmark factory under the given name.
+
+    The factory receives a scratch directory and returns a tuple of
+    (stmt, setup) callables. `setup` runs once before each repeat.
+    """
+    def register(factory):
+        BENCHMARKS[name] = factory
+        return factory
+    return register
+
+
+# === Engine Benchmarks ===
+
+@benchmark("revolver.pull_trigger")
+def _bench_pull_trigger(scratch):
+    # Reload every `chambers` pulls, so every pull fires a live round
+    # instead of falling through to the empty drum after the first few
+    revolver = Revolver()
+    pulls = [0]
+
+    def stmt():
+        if pulls[0] % revolver.chambers == 0:
+            revolver.speed_reload()
+        pulls[0] += 1
+        revolver.pull_trigger()
+
+    def setup():
+        pulls[0] = 0
+    return stmt, setup
+
+
+@benchmark("revolver.free_spin_drum")
+def _bench_free_spin_drum(scratch):
+    revolver = Revolver()
+    return revolver.free_spin_drum, revolver.unload_drum
+
+
+@benchmark("revolver.load_bullets_randomly")
+def _bench_load_bullets_randomly(scratch):
+    revolver = Revolver()
+
+    def stmt():
+        revolver.unload_drum()
+        revolver.load_bullets_randomly(3)
+    return stmt, revolver.unload_drum
+
+
+@benchmark("game.play_auto[logging=on]")
+def _bench_play_auto_logging_on(scratch):
+    def stmt():
+        game = RussianRoulette(animations=False, sound=False, records_directory=scratch)
+        game.play_auto()
+    return stmt, None
+
+
+@benchmark("game.play_auto[logging=off]")
+def _bench_play_auto_logging_off(scratch):
+    def stmt():
+        game = RussianRoulette(animations=False, sound=False, records_directory=None)
+        game.logger.echo = False
+        game.logger.record = False
+        game.play_auto()
+    return stmt, None
+
+
+@benchmark("game.play_headless")
+def _bench_play_headless(scratch):
+    def stmt():
+        game = RussianRoulette(animations=False, sound=False, records_directory=None)
+        game.logger.echo = False
+        game.play_headless()
+    return stmt, None
+
+
+@benchmark("kernel.play_game")
+def _bench_kernel_play_game(scratch):
+    def stmt():
+        kernel.play_game()
+    return stmt, None
+
+
+# === Logger Benchmarks ===
+
+@benchmark("logger._log")
+def _bench_logger_log(scratch):
+    logger = Logger()
+
+    def stmt():
+        logger._log("ACTION", "", "Crupier spins the drum")
+    return stmt, logger.clear_history
+
+
+@benchmark("logger.save_to_file")
+def _bench_logger_save_to_file(scratch):
+    # A typical game produces a few dozen entries
+    logger = Logger(echo=False)
+    for turn in range(40):
+        logger.player("Player 1", "takes the revolver")
+
+    def stmt():
+        logger.save_to_file(scratch)
+    return stmt, None
+
+
+# === Graphics Benchmarks ===
+
+@benchmark("graphics.display_drum")
+def _bench_display_drum(scratch):
+    drum = [None, True, False, None, True, False]
+
+    def stmt():
+        graphics.display_drum(drum)
+    return stmt, None
+
+
+# === Memory Benchmarks ===
+
+def _traced_bytes(build):
+    """Bytes still allocated (per tracemalloc) after build() returns, and its result."""
+    gc.collect()
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = build()
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    if not tracing:
+        tracemalloc.stop()
+    return after - before, kept
+
+
+def measure_memory(tables=1000, events=10000):
+    """Measure the memory footprint of idle tables and of log history.
+
+    Args:
+        tables: Idle games to create (none of them played)
+        events: Entries logged into one game's history
+
+    Returns:
+        dict: Bytes per idle table ("table") and per logged event ("event")
+    """
+    def build_tables():
+        return [RussianRoulette(animations=False, sound=False, records_directory=None)
+                for _ in range(tables)]
+
+    game = RussianRoulette(animations=False, sound=False, records_directory=None)
+    game.logger.echo = False
+
+    def log_events():
+        for _ in range(events):
+            game.logger.player(game.player1.name, "takes the revolver")
+
+    table_bytes, _ = _traced_bytes(build_tables)
+    event_bytes, _ = _traced_bytes(log_events)
+    return {"table": table_bytes / tables, "event": event_bytes / events}
+
+
+def check_memory(footprint, budgets=MEMORY_BUDGETS):
+    """Compare a measure_memory result with budgets.
+
+    Returns:
+        list: (name, bytes, budget, over budget) for every budgeted measure
+    """
+    return [(name, footprint[name], budget, footprint[name] > budget)
+            for name, budget in budgets.items()]
+
+
+def print_memory(rows):
+    """Print a memory table, marking measures over budget."""
+    print(f"\n{'Memory':<36} {'bytes':>12} {'budget':>12}")
+    for name, size, budget, over in rows:
+        flag = "  OVER BUDGET" if over else ""
+        print(f"{'per ' + name:<36} {size:>12.0f} {budget:>12}{flag}")
+
+
+# === GC Benchmarks ===
+
+def measure_gc_pauses(games=2000, pooled=False, **settings):
+    """Time the garbage collector while automatic matches are played.
+
+    Games with subscribers (sound, animations or a broadcaster) are
+    reference cycles, so discarded games are only freed by the cyclic
+    collector. A TablePool keeps them alive and resets them instead.
+
+    Args:
+        games: Matches to play
+        pooled: Recycle games through a TablePool instead of creating one per match
+        **settings: RussianRoulette arguments (animations, sound and records off by default)
+
+    Returns:
+        dict: "collections", total "pause_ns", "max_pause_ns" and "elapsed_s"
+    """
+    pauses = []
+    started = [0]
+
+    def on_gc(phase, info):
+        if phase == "start":
+            started[0] = time.perf_counter_ns()
+        else:
+            pauses.append(time.perf_counter_ns() - started[0])
+
+    pool = tables.TablePool(1, **settings)
+    random.seed(BENCH_SEED)
+    gc.collect()
+    gc.callbacks.append(on_gc)
+    start = time.perf_counter()
+    try:
+        with open(os.devnull, 'w') as null, contextlib.redirect_stdout(null):
+            for _ in range(games):
+                if pooled:
+                    with pool.table() as game:
+                        game.play_auto()
+                else:
+                    game = RussianRoulette(**pool.settings)
+                    game.logger.echo = False
+                    game.play_auto()
+    finally:
+        gc.callbacks.remove(on_gc)
+    return {
+        "collections": len(pauses),
+        "pause_ns": sum(pauses),
+        "max_pause_ns": max(pauses, default=0),
+        "elapsed_s": time.perf_counter() - start,
+    }
+
+
+def print_gc_pauses(fresh, pooled):
+    """Print GC pauses of fresh games next to pooled ones."""
+    print(f"\n{'GC while playing':<36} {'collections':>12} {'total':>12} {'max':>12}")
+    for label, result in (("new game per match", fresh), ("TablePool", pooled)):
+        print(f"{label:<36} {result['collections']:>12} "
+              f"{_format_ns(result['pause_ns']):>12} {_format_ns(result['max_pause_ns']):>12}")
+
+
+def run_benchmark(name, scratch, repeat=5):
+    """Time a single registered benchmark.
+
+    Args:
+        name: Registered benchmark name
+        scratch: Directory for files written by the benchmark
+        repeat: Number of timed repeats
+
+    Returns:
+        dict: Per-operation timings in nanoseconds
+    """
+    random.seed(BENCH_SEED)
+    stmt, setup = BENCHMARKS[name](scratch)
+    timer = timeit.Timer(stmt, setup=setup if setup else "pass")
+    number, _ = timer.autorange()
+    timings = [t / number * 1e9 for t in timer.repeat(repeat=repeat, number=number)]
+    return {
+        "number": number,
+        "repeat": repeat,
+        "min_ns": min(timings),
+        "median_ns": statistics.median(timings),
+        "mean_ns": statistics.mean(timings),
+        "stdev_ns": statistics.stdev(timings) if len(timings) > 1 else 0.0,
+    }
+
+
+def run_all(names=None, repeat=5):
+    """Run benchmarks with stdout redirected to a null stream.
+
+    Args:
+        names: Benchmark names to run (default: all registered)
+        repeat: Number of timed repeats per benchmark
+
+    Returns:
+        dict: Results document ready to be saved as JSON
+    """
+    names = list(BENCHMARKS) if names is None else names
+    results = {}
+    with tempfile.TemporaryDirectory() as scratch:
+        with open(os.devnull, 'w') as null, contextlib.redirect_stdout(null):
+            for name in names:
+                results[name] = run_benchmark(name, scratch, repeat=repeat)
+    return {
+        "date": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+
+def save_results(document, path):
+    """Save a results document as JSON."""
+    with open(path, 'w') as f:
+        json.dump(document, f, indent=2)
+    return path
+
+
+def load_results(path):
+    """Load a results document saved by save_results."""
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare(document, baseline, threshold=DEFAULT_THRESHOLD, metric="median_ns"):
+    """Compare results against a saved baseline.
+
+    Args:
+        document: Current results document
+        baseline: Baseline results document
+        threshold: Relative slowdown that counts as a regression
+        metric: Timing field to compare
+
+    Returns:
+        list: (name, baseline_ns, current_ns, ratio, regressed) for every
+              benchmark present in both documents
+    """
+    rows = []
+    for name, current in document["results"].items():
+        previous = baseline["results"].get(name)
+        if previous is None:
+            continue
+        ratio = current[metric] / previous[metric]
+        rows.append((name, previous[metric], current[metric], ratio, ratio > 1 + threshold))
+    return rows
+
+
+def _format_ns(ns):
+    """Format a duration in nanoseconds with a readable unit."""
+    for unit, scale in (("s", 1e9), ("ms", 1e6), ("us", 1e3)):
+        if ns >= scale:
+            return f"{ns / scale:.2f} {unit}"
+    return f"{ns:.0f} ns"
+
+
+def print_results(document):
+    """Print a results table."""
+    print(f"{'Benchmark':<36} {'median':>12} {'min':>12} {'loops':>8}")
+    for name, result in document["results"].items():
+        print(f"{name:<36} {_format_ns(result['median_ns']):>12} "
+              f"{_format_ns(result['min_ns']):>12} {result['number']:>8}")
+
+
+def print_comparison(rows, threshold=DEFAULT_THRESHOLD):
+    """Print a comparison table, marking regressions."""
+    print(f"\n{'Benchmark':<36} {'baseline':>12} {'current':>12} {'change':>9}")
+    for name, previous, current, ratio, regressed in rows:
+        flag = "  REGRESSION" if regressed else ""
+        print(f"{name:<36} {_format_ns(previous):>12} {_format_ns(current):>12} "
+              f"{(ratio - 1) * 100:>+8.1f}%{flag}")
+    regressions = sum(1 for row in rows if row[4])
+    print(f"\n{regressions} regression(s) above {threshold * 100:.0f}%")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Python Roulette benchmarks")
+    parser.add_argument("-o", "--output", default="bench_results.json",
+                        help="Where to store the JSON results (default: bench_results.json)")
+    parser.add_argument("-c", "--compare", metavar="BASELINE",
+                        help="Compare against a saved results file and flag regressions")
+    parser.add_argument("-t", "--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Relative slowdown counted as a regression (default: 0.10)")
+    parser.add_argument("-r", "--repeat", type=int, default=5,
+                        help="Timed repeats per benchmark (default: 5)")
+    parser.add_argument("-k", "--filter", default="",
+                        help="Only run benchmarks whose name contains this text")
+    parser.add_argument("-m", "--memory", action="store_true",
+                        help="Also measure bytes per idle table and per logged event "
+                             "and fail when over budget")
+    parser.add_argument("-g", "--gc", action="store_true",
+                        help="Also compare GC pauses of new games and pooled games "
+                             "(games with sound subscribers)")
+    args = parser.parse_args(argv)
+
+    names = [name for name in BENCHMARKS if args.filter in name]
+    if not names:
+        print(f"No benchmarks match '{args.filter}'", file=sys.stderr)
+        return 2
+    document = run_all(names, repeat=args.repeat)
+    print_results(document)
+    save_results(document, args.output)
+    print(f"\nResults saved to: {args.output}")
+
+    status = 0
+    if args.compare:
+        rows = compare(document, load_results(args.compare), threshold=args.threshold)
+        print_comparison(rows, threshold=args.threshold)
+        if any(row[4] for row in rows):
+            status = 1
+    if args.gc:
+        print_gc_pauses(measure_gc_pauses(pooled=False, sound=True),
+                        measure_gc_pauses(pooled=True, sound=True))
+    if args.memory:
+        rows = check_memory(measure_memory())
+        print_memory(rows)
+        if any(row[3] for row in rows):
+            status = 1
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
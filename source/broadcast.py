@@ -0,0 +1,318 @@
+import collections
+import json
+import selectors
+import socket
+import sys
+import threading
+
+# Default number of queued messages per viewer before frames are dropped
+DEFAULT_MAX_QUEUE = 64
+
+# Seconds close() waits for each viewer to take its queued messages
+DEFAULT_DRAIN_TIMEOUT = 1.0
+
+
+class _Subscriber:
+    """Connected viewer with its own queue of shared, already-encoded messages."""
+
+    def __init__(self, sock, address):
+        self.sock = sock
+        self.address = address
+        self.queue = collections.deque()  # (payload bytes, is_frame)
+        self.offset = 0                   # bytes of queue[0] already sent
+        self.sending = False              # queue[0] is being sent outside the lock
+        self.dropped = 0
+        self.lagging = False
+        self.writing = False              # registered for EVENT_WRITE
+
+    def drop_oldest_frame(self):
+        """Drop the oldest frame not currently being sent. Returns True if one was dropped."""
+        for index, (payload, is_frame) in enumerate(self.queue):
+            if is_frame and not (index == 0 and (self.offset or self.sending)):
+                del self.queue[index]
+                self.dropped += 1
+                return True
+        return False
+
+
+class Broadcaster:
+    """Fan game events and frames out to spectators over a local TCP socket.
+
+    Every message is encoded once and the same bytes object is queued for all
+    viewers. A single network thread does the writes, so publishing never
+    blocks the game loop. When a viewer falls behind, its oldest queued frames
+    are dropped; events are kept unless the viewer is hopelessly behind, in
+    which case it is disconnected.
+
+    Messages are JSON lines: {"type": "event", "event": ..., ...} or
+    {"type": "frame", "text": ..., "duration": ...}.
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, max_queue=DEFAULT_MAX_QUEUE):
+        """Initialize the broadcaster (call start() to begin accepting viewers).
+
+        Args:
+            host: Interface to listen on (default: localhost only)
+            port: TCP port, 0 picks a free one (default: 0)
+            max_queue: Queued messages per viewer before frames are dropped
+        """
+        self.host = host
+        self.port = port
+        self.max_queue = max_queue
+        self.subscribers = []
+        self.published = 0
+        self._lock = threading.Lock()
+        self._selector = None
+        self._server = None
+        self._wake_recv, self._wake_send = None, None
+        self._thread = None
+        self._running = False
+
+    @property
+    def address(self):
+        """(host, port) the broadcaster is listening on."""
+        return self._server.getsockname()
+
+    def start(self):
+        """Open the listening socket and start the network thread."""
+        self._server = socket.create_server((self.host, self.port))
+        self._server.setblocking(False)
+        self._wake_recv, self._wake_send = socket.socketpair()
+        self._wake_recv.setblocking(False)
+        self._wake_send.setblocking(False)
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(self._server, selectors.EVENT_READ, "accept")
+        self._selector.register(self._wake_recv, selectors.EVENT_READ, "wake")
+        self._running = True
+        self._thread = threading.Thread(target=self._serve, name="broadcaster", daemon=True)
+        self._thread.start()
+        return self
+
+    def close(self, timeout=DEFAULT_DRAIN_TIMEOUT):
+        """Stop the network thread, send what is still queued and disconnect all viewers.
+
+        Args:
+            timeout: Seconds to wait for each viewer to take its queued messages
+        """
+        if not self._running:
+            return
+        self._running = False
+        self._wake()
+        self._thread.join()
+        with self._lock:
+            subscribers, self.subscribers = self.subscribers, []
+        for subscriber in subscribers:
+            self._drain(subscriber, timeout)
+            subscriber.sock.close()
+        self._selector.close()
+        self._server.close()
+        self._wake_recv.close()
+        self._wake_send.close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def viewer_count(self):
+        """Number of connected viewers."""
+        with self._lock:
+            return len(self.subscribers)
+
+    # === Publishing ===
+
+    def publish_event(self, event, **data):
+        """Publish a game event to every viewer. Events are not dropped."""
+        if not self.subscribers:
+            return
+        message = {"type": "event", "event": event, **data}
+        self._fan_out(json.dumps(message).encode() + b"\n", is_frame=False)
+
+    def publish_frame(self, frame):
+        """Publish a graphics Frame to every viewer. Dropped for slow viewers."""
+        if frame.text is None or not self.subscribers:
+            return
+        message = {"type": "frame", "text": frame.text, "duration": frame.duration}
+        self._fan_out(json.dumps(message).encode() + b"\n", is_frame=True)
+
+    def tee_frames(self, frames):
+        """Pass frames through unchanged, publishing each one on the way.
+
+        Returns:
+            The wrapped generator's return value
+        """
+        while True:
+            try:
+                frame = next(frames)
+            except StopIteration as stop:
+                return stop.value
+            self.publish_frame(frame)
+            yield frame
+
+    def _fan_out(self, payload, is_frame):
+        """Queue one shared payload for every viewer and wake the network thread."""
+        with self._lock:
+            if not self.subscribers:
+                return
+            self.published += 1
+            for subscriber in self.subscribers:
+                if len(subscriber.queue) >= self.max_queue:
+                    if is_frame:
+                        subscriber.dropped += 1
+                        continue
+                    # Make room for the event by dropping a frame instead
+                    if not subscriber.drop_oldest_frame() and len(subscriber.queue) >= self.max_queue * 4:
+                        subscriber.lagging = True
+                        continue
+                subscriber.queue.append((payload, is_frame))
+        self._wake()
+
+    def _wake(self):
+        """Interrupt the selector so it picks up new work."""
+        if self._wake_send is None:
+            return
+        try:
+            self._wake_send.send(b"\0")
+        except (BlockingIOError, OSError):
+            pass
+
+    # === Network Thread ===
+
+    def _serve(self):
+        """Accept viewers and flush their queues until closed."""
+        while self._running:
+            for key, mask in self._selector.select(timeout=1.0):
+                if key.data == "accept":
+                    self._accept()
+                elif key.data == "wake":
+                    self._drain_wake()
+                else:
+                    if mask & selectors.EVENT_READ:
+                        self._read(key.data)
+                    if mask & selectors.EVENT_WRITE:
+                        self._flush(key.data)
+            self._update_interest()
+
+    def _accept(self):
+        """Register a new viewer."""
+        try:
+            sock, address = self._server.accept()
+        except BlockingIOError:
+            return
+        sock.setblocking(False)
+        subscriber = _Subscriber(sock, address)
+        with self._lock:
+            self.subscribers.append(subscriber)
+        self._selector.register(sock, selectors.EVENT_READ, subscriber)
+
+    def _drain_wake(self):
+        """Empty the wake-up socket."""
+        try:
+            while self._wake_recv.recv(4096):
+                pass
+        except BlockingIOError:
+            pass
+
+    def _read(self, subscriber):
+        """Discard anything a viewer sends and notice when it hangs up."""
+        try:
+            data = subscriber.sock.recv(4096)
+        except BlockingIOError:
+            return
+        except OSError:
+            data = b""
+        if not data:
+            self._disconnect(subscriber)
+
+    def _update_interest(self):
+        """Watch for writability only on viewers with queued data."""
+        with self._lock:
+            subscribers = list(self.subscribers)
+        for subscriber in subscribers:
+            if subscriber.lagging:
+                self._disconnect(subscriber)
+                continue
+            writing = bool(subscriber.queue)
+            if writing == subscriber.writing:
+                continue
+            events = selectors.EVENT_READ | selectors.EVENT_WRITE if writing else selectors.EVENT_READ
+            try:
+                self._selector.modify(subscriber.sock, events, subscriber)
+            except (KeyError, ValueError, OSError):
+                self._disconnect(subscriber)
+                continue
+            subscriber.writing = writing
+
+    def _flush(self, subscriber):
+        """Send as much of a viewer's queue as the socket accepts."""
+        while True:
+            with self._lock:
+                if not subscriber.queue:
+                    return
+                payload = subscriber.queue[0][0]
+                offset = subscriber.offset
+                # Keep drop_oldest_frame off the head while it is on the wire
+                subscriber.sending = True
+            try:
+                sent = subscriber.sock.send(memoryview(payload)[offset:])
+            except BlockingIOError:
+                subscriber.sending = False
+                return
+            except OSError:
+                subscriber.sending = False
+                self._disconnect(subscriber)
+                return
+            with self._lock:
+                subscriber.sending = False
+                subscriber.offset += sent
+                if subscriber.offset >= len(payload):
+                    subscriber.queue.popleft()
+                    subscriber.offset = 0
+
+    def _drain(self, subscriber, timeout):
+        """Send a viewer's queue with blocking writes (network thread stopped)."""
+        try:
+            subscriber.sock.settimeout(timeout)
+            while subscriber.queue:
+                payload = subscriber.queue[0][0]
+                subscriber.sock.sendall(memoryview(payload)[subscriber.offset:])
+                subscriber.queue.popleft()
+                subscriber.offset = 0
+        except OSError:
+            pass
+
+    def _disconnect(self, subscriber):
+        """Forget a viewer and close its socket."""
+        with self._lock:
+            if subscriber not in self.subscribers:
+                return
+            self.subscribers.remove(subscriber)
+        try:
+            self._selector.unregister(subscriber.sock)
+        except (KeyError, ValueError):
+            pass
+        subscriber.sock.close()
+
+
+def watch(host, port, out=sys.stdout):
+    """Connect to a broadcaster and show the match on this terminal."""
+    import graphics
+
+    with socket.create_connection((host, port)) as sock:
+        for line in sock.makefile('r', encoding='utf-8'):
+            message = json.loads(line)
+            if message["type"] == "frame":
+                out.write(graphics.Frame(message["text"], message["duration"]).encode().decode())
+            else:
+                details = {key: value for key, value in message.items() if key not in ("type", "event")}
+                out.write(f"[{message['event']}] {details}\n")
+            out.flush()
+
+
+if __name__ == '__main__':
+    # Spectator client: python3 broadcast.py HOST:PORT
+    address = sys.argv[1] if len(sys.argv) > 1 else "127.0.0.1:7777"
+    host, port = address.rsplit(":", 1)
+    watch(host, int(port))
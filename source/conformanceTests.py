@@ -0,0 +1,291 @@
+import itertools
+import math
+import random
+import unittest
+from collections import Counter
+from revolver import Revolver
+from crupier import Crupier
+from game import RussianRoulette
+from logger import Logger
+import enumerator
+import estimator
+import kernel
+
+# Aliases for test logging helpers
+log_test = Logger.Tests.log_test
+log_info = Logger.Tests.log_info
+
+# Quiet mode (ROULETTE_QUIET_TESTS=1) prints helper output only for failed tests
+load_tests = Logger.Tests.load_tests
+
+# Reject a distribution only below this p-value. Every test uses a fixed
+# seed, so a passing run passes every time; the threshold only decides how
+# far off an engine may drift before a test notices.
+ALPHA = 1e-4
+
+# Draws per sampled distribution
+DRAWS = 120_000
+
+
+# === Statistics Helpers ===
+
+def chi_square_sf(statistic, dof):
+    """Survival function of the chi-square distribution (exact, by recurrence on dof)."""
+    half = statistic / 2
+    if dof % 2:
+        p, k = math.erfc(math.sqrt(half)), 1
+    else:
+        p, k = math.exp(-half), 2
+    while k < dof:
+        p += math.exp((k / 2) * math.log(half) - half - math.lgamma(k / 2 + 1)) if half else 0.0
+        k += 2
+    return min(p, 1.0)
+
+
+def chi_square(observed, probabilities):
+    """Pearson goodness-of-fit test.
+
+    Args:
+        observed: Counts per category
+        probabilities: Expected probability per category (same order)
+
+    Returns:
+        tuple: (statistic, p-value)
+    """
+    total = sum(observed)
+    statistic = sum((count - total * p) ** 2 / (total * p)
+                    for count, p in zip(observed, probabilities))
+    return statistic, chi_square_sf(statistic, len(observed) - 1)
+
+
+def chi_square_homogeneity(counts_a, counts_b):
+    """Test whether two count vectors come from the same distribution.
+
+    Returns:
+        tuple: (statistic, p-value)
+    """
+    total_a, total_b = sum(counts_a), sum(counts_b)
+    statistic = 0.0
+    cells = 0
+    for a, b in zip(counts_a, counts_b):
+        if a + b == 0:
+            continue
+        cells += 1
+        for count, total in ((a, total_a), (b, total_b)):
+            expected = total * (a + b) / (total_a + total_b)
+            statistic += (count - expected) ** 2 / expected
+    return statistic, chi_square_sf(statistic, cells - 1)
+
+
+def kolmogorov_sf(statistic, n):
+    """P(D > statistic) for the one-sample Kolmogorov-Smirnov statistic of n draws.
+
+    Uses the asymptotic Kolmogorov distribution with Stephens' correction.
+    On discrete data the test is conservative (p-values are too large), so
+    it can miss a difference but does not invent one.
+    """
+    root = math.sqrt(n)
+    scaled = (root + 0.12 + 0.11 / root) * statistic
+    if scaled < 0.2:
+        return 1.0
+    p = 2 * sum((-1) ** (k - 1) * math.exp(-2 * k * k * scaled * scaled) for k in range(1, 101))
+    return max(0.0, min(p, 1.0))
+
+
+def ks_test(samples, cdf):
+    """One-sample KS test of integer samples against a discrete CDF.
+
+    Args:
+        samples: Observed values
+        cdf: Function value -> P(X <= value)
+
+    Returns:
+        tuple: (statistic, p-value)
+    """
+    counts = Counter(samples)
+    n = len(samples)
+    seen = 0
+    statistic = 0.0
+    for value in sorted(counts):
+        seen += counts[value]
+        statistic = max(statistic, abs(seen / n - cdf(value)))
+    return statistic, kolmogorov_sf(statistic, n)
+
+
+def ks_two_sample(samples_a, samples_b):
+    """Two-sample KS test.
+
+    Returns:
+        tuple: (statistic, p-value)
+    """
+    counts_a, counts_b = Counter(samples_a), Counter(samples_b)
+    n_a, n_b = len(samples_a), len(samples_b)
+    seen_a = seen_b = 0
+    statistic = 0.0
+    for value in sorted(counts_a.keys() | counts_b.keys()):
+        seen_a += counts_a[value]
+        seen_b += counts_b[value]
+        statistic = max(statistic, abs(seen_a / n_a - seen_b / n_b))
+    return statistic, kolmogorov_sf(statistic, n_a * n_b / (n_a + n_b))
+
+
+def spin_offsets():
+    """Exact distribution of free_spin_drum's position change (randint(10, 100) mod 6)."""
+    counts = Counter(steps % kernel.CHAMBERS for steps in range(10, 101))
+    return [counts[offset] / 91 for offset in range(kernel.CHAMBERS)]
+
+
+def bullet_offsets(gun):
+    """Live chambers counted from the active chamber (1 = fires next)."""
+    return tuple(sorted((chamber - gun.activeChamberPosition - 1) % gun.chambers + 1
+                        for chamber, state in enumerate(gun.drum) if state is True))
+
+
+# === Statistics Helper Tests ===
+
+class TestStatisticsHelpers(unittest.TestCase):
+
+    def test_114_reference_values(self):
+        """Test the p-value functions against tabulated values"""
+        log_test("114 Testing chi-square and Kolmogorov p-values")
+        # Critical values at p = 0.05
+        for statistic, dof in ((3.841, 1), (5.991, 2), (11.070, 5), (24.996, 15)):
+            self.assertAlmostEqual(chi_square_sf(statistic, dof), 0.05, places=3)
+        self.assertAlmostEqual(kolmogorov_sf(1.358 / math.sqrt(10 ** 6), 10 ** 6), 0.05, places=3)
+        self.assertEqual(chi_square([10, 10], [0.5, 0.5]), (0.0, 1.0))
+        statistic, p = ks_test([1, 2, 3, 4] * 100, lambda value: value / 4)
+        self.assertEqual((statistic, p), (0.0, 1.0))
+
+
+# === Revolver Distribution Tests ===
+
+class TestRevolverDistributions(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(20240601)
+        self.revolver = Revolver()
+        self.crupier = Crupier(self.revolver)
+
+    def test_115_bullet_placement_uniform(self):
+        """Test load_bullets_randomly picks every chamber and every layout equally often"""
+        log_test("115 Testing bullet placement")
+        singles = Counter()
+        for _ in range(DRAWS):
+            self.crupier.dump_and_load_bullets_randomly(1)
+            singles[self.revolver.drum.index(True)] += 1
+        statistic, p = chi_square([singles[c] for c in range(6)], [1 / 6] * 6)
+        log_info("One bullet: chi-square, p", (round(statistic, 2), round(p, 4)))
+        self.assertGreater(p, ALPHA)
+
+        layouts = list(itertools.combinations(range(6), 2))
+        pairs = Counter()
+        for _ in range(DRAWS):
+            self.crupier.dump_and_load_bullets_randomly(2)
+            pairs[tuple(c for c, state in enumerate(self.revolver.drum) if state)] += 1
+        statistic, p = chi_square([pairs[layout] for layout in layouts], [1 / 15] * 15)
+        log_info("Two bullets: chi-square, p", (round(statistic, 2), round(p, 4)))
+        self.assertGreater(p, ALPHA)
+
+    def test_116_spin_landing(self):
+        """Test free_spin_drum lands as randint(10, 100) predicts, and loads stay fair"""
+        log_test("116 Testing spin landing positions")
+        landings = Counter()
+        offsets = Counter()
+        for _ in range(DRAWS):
+            self.revolver.activeChamberPosition = 5
+            self.crupier.setup_round_with_random_bullet_positions(1)
+            landings[(self.revolver.activeChamberPosition - 5) % 6] += 1
+            offsets[bullet_offsets(self.revolver)[0]] += 1
+        observed = [landings[offset] for offset in range(6)]
+        statistic, p = chi_square(observed, spin_offsets())
+        log_info("Landing offsets", observed)
+        self.assertGreater(p, ALPHA)
+        # 91 possible steps do not split evenly over 6 chambers: one offset
+        # comes up 16/91 of the time, so the landing alone is not uniform
+        self.assertLess(chi_square(observed, [1 / 6] * 6)[1], ALPHA)
+        # The load is uniform, so the bullet's distance from the hammer is
+        statistic, p = chi_square([offsets[distance] for distance in range(1, 7)], [1 / 6] * 6)
+        log_info("Bullet distance: chi-square, p", (round(statistic, 2), round(p, 4)))
+        self.assertGreater(p, ALPHA)
+
+    def test_117_first_shot_probability(self):
+        """Test the first pull after loading fires with probability bullets / 6"""
+        log_test("117 Testing first-shot fire probability")
+        for bullets in range(1, 6):
+            fired = 0
+            draws = DRAWS // 3
+            for _ in range(draws):
+                self.crupier.setup_round_with_random_bullet_positions(bullets)
+                fired += self.revolver.pull_trigger() is True
+            statistic, p = chi_square([fired, draws - fired], [bullets / 6, 1 - bullets / 6])
+            log_info(f"{bullets} bullet(s): fired, p", (round(fired / draws, 4), round(p, 4)))
+            self.assertGreater(p, ALPHA)
+
+    def test_118_target_choice(self):
+        """Test automatic target choices split evenly"""
+        log_test("118 Testing target choice")
+        game = RussianRoulette(animations=False, sound=False, records_directory=None)
+        choices = Counter(game.get_player_choice(auto=True) for _ in range(DRAWS))
+        statistic, p = chi_square([choices["self"], choices["other"]], [0.5, 0.5])
+        log_info("Choices", dict(choices))
+        self.assertGreater(p, ALPHA)
+        choices = Counter(kernel.random_strategy(random, 0) for _ in range(DRAWS))
+        self.assertGreater(chi_square([choices["self"], choices["other"]], [0.5, 0.5])[1], ALPHA)
+
+
+# === Engine Cross-Check Tests ===
+
+class TestEngineConformance(unittest.TestCase):
+
+    def test_119_estimator_random_source(self):
+        """Test the estimator's random source draws the same distributions as random.Random"""
+        log_test("119 Testing estimator._Uniforms against random.Random")
+        layouts = list(itertools.combinations(range(6), 2))
+        for antithetic in (False, True):
+            rng = estimator._Uniforms(7, antithetic)
+            pairs = Counter(tuple(sorted(rng.sample(range(6), 2))) for _ in range(DRAWS))
+            self.assertGreater(chi_square([pairs[layout] for layout in layouts], [1 / 15] * 15)[1],
+                               ALPHA)
+            spins = Counter(rng.randint(10, 100) % 6 for _ in range(DRAWS))
+            self.assertGreater(chi_square([spins[o] for o in range(6)], spin_offsets())[1], ALPHA)
+            choices = Counter(rng.choice(kernel.TARGETS) for _ in range(DRAWS))
+            statistic, p = chi_square([choices["self"], choices["other"]], [0.5, 0.5])
+            log_info(f"antithetic={antithetic}: choice p", round(p, 4))
+            self.assertGreater(p, ALPHA)
+
+    def test_120_game_lengths_match(self):
+        """Test Revolver games, kernel games and the exact distribution agree on game length"""
+        log_test("120 Testing game lengths across engines")
+        exact = enumerator.marginal(enumerator.enumerate_game(2, 2, exact=False).outcomes, "turns")
+        lengths = sorted(exact)
+
+        def cdf(turns):
+            return sum(p for length, p in exact.items() if length <= turns)
+
+        random.seed(11)
+        reference = []
+        for _ in range(10_000):
+            game = RussianRoulette(lives=2, bullets_per_round=2, animations=False, sound=False,
+                                   records_directory=None)
+            game.logger.echo = False
+            game.play_auto()
+            reference.append(game.turns_played)
+        rng = random.Random(12)
+        fast = [kernel.play_game(2, 2, rng=rng).turns for _ in range(DRAWS)]
+
+        for label, samples in (("Revolver", reference), ("Kernel", fast)):
+            statistic, p = ks_test(samples, cdf)
+            log_info(f"{label}: KS, p", (round(statistic, 4), round(p, 4)))
+            self.assertGreater(p, ALPHA)
+            self.assertTrue(set(samples) <= set(lengths))
+            counts = Counter(samples)
+            self.assertGreater(chi_square([counts[t] for t in lengths],
+                                          [exact[t] for t in lengths])[1], ALPHA)
+        self.assertGreater(ks_two_sample(reference, fast)[1], ALPHA)
+        counts_a, counts_b = Counter(reference), Counter(fast)
+        self.assertGreater(chi_square_homogeneity([counts_a[t] for t in lengths],
+                                                  [counts_b[t] for t in lengths])[1], ALPHA)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,23 @@
+import os
+
+# Quiet, device-free defaults for pytest runs (set either to 0 to opt out).
+# They must be set before the test modules import logger and soundEffects.
+os.environ.setdefault("ROULETTE_QUIET_TESTS", "1")
+os.environ.setdefault("ROULETTE_STUB_MIXER", "1")
+
+import pytest
+
+from logger import Logger
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    """Attach a failed test's captured helper output to its report."""
+    outcome = yield
+    report = outcome.get_result()
+    if report.when == "setup":
+        Logger.Tests.discard()
+    elif report.when == "call":
+        output = Logger.Tests.captured_output()
+        if report.failed and output:
+            report.sections.append(("Captured test log", output))
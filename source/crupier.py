@@ -1,30 +1,54 @@
+import threading
+
+from events import DrumLoaded, RevolverHanded
 from revolver import Revolver
 
 class Crupier:
+    __slots__ = ("_lock", "name", "revolverInHand", "events")
+
     def __init__(self, revolver=None):
+        self._lock = threading.Lock()
         self.name = "Crupier"
         self.revolverInHand = revolver if revolver else Revolver()
+        # EventBus the crupier reports loads and hand-offs to (see events.py)
+        self.events = None
 
     def give_revolver_to_player(self, player):
         """Hand the revolver to a player."""
-        player.revolverInHand = self.revolverInHand
-        self.revolverInHand = None
+        with self._lock:
+            revolver = player.revolverInHand = self.revolverInHand
+            self.revolverInHand = None
+        events = self.events
+        if events is not None and RevolverHanded in events.subscribed:
+            events.publish(RevolverHanded(revolver, self, player))
 
     def dump_and_load_single_bullet(self):
         """Clear drum and load a single bullet in chamber 0."""
-        self.revolverInHand.unload_drum()
-        self.revolverInHand.load_bullet(0)
+        with self._lock:
+            self.revolverInHand.unload_drum()
+            self.revolverInHand.load_bullet(0)
+        self._emit_loaded()
 
     def dump_and_load_bullets_randomly(self, count=1):
         """Clear drum and load specified number of bullets randomly."""
-        self.revolverInHand.unload_drum()
-        self.revolverInHand.load_bullets_randomly(count)
+        with self._lock:
+            self.revolverInHand.unload_drum()
+            self.revolverInHand.load_bullets_randomly(count)
+        self._emit_loaded()
 
     def setup_round_with_random_bullet_positions(self, bullets=3):
         """Setup a round with multiple randomly positioned bullets."""
-        self.revolverInHand.unload_drum()
-        self.revolverInHand.load_bullets_randomly(bullets)
+        with self._lock:
+            self.revolverInHand.unload_drum()
+            self.revolverInHand.load_bullets_randomly(bullets)
+        self._emit_loaded()
         self.revolverInHand.free_spin_drum()
 
         """Check if crupier is holding the revolver."""
-        return self.revolverInHand is not None
\ No newline at end of file
+        return self.revolverInHand is not None
+
+    def _emit_loaded(self):
+        events = self.events
+        if events is not None and DrumLoaded in events.subscribed:
+            revolver = self.revolverInHand
+            events.publish(DrumLoaded(revolver, revolver.live_count()))
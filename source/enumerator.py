@@ -0,0 +1,172 @@
+import itertools
+import math
+import sys
+from collections import defaultdict, namedtuple
+from fractions import Fraction
+
+import estimator
+import kernel
+
+# Spin steps drawn by Revolver.free_spin_drum (randint(10, 100))
+SPIN_STEPS = range(10, 101)
+
+Outcome = namedtuple("Outcome", ["winner", "rounds", "turns", "shots", "lives"])
+
+Enumeration = namedtuple("Enumeration", ["outcomes", "states", "transpositions"])
+Enumeration.__doc__ = """Exact result of a game-tree walk.
+
+outcomes maps each Outcome to its probability (they sum to exactly 1 with
+exact=True), states is the number of distinct drum states expanded and
+transpositions the number of times a state was reused instead.
+"""
+
+
+def _rotate_mask(mask, steps):
+    """Rotate a chamber mask so chamber `steps` becomes chamber 0."""
+    return ((mask >> steps) | (mask << (kernel.CHAMBERS - steps))) & kernel.FULL_MASK
+
+
+def canonical_state(code):
+    """Rotate a state code so the active chamber is chamber 0.
+
+    Rotations of the drum are equivalent: the same chambers come up in
+    the same order, and the next round's load is uniform whatever the
+    position. Equivalent states share one canonical code.
+    """
+    live, fired, position = kernel.unpack_state(code)
+    return kernel.pack_state(_rotate_mask(live, position), _rotate_mask(fired, position), 0)
+
+
+def _spin_weights(one):
+    """Probability of each drum position change after a spin."""
+    counts = [0] * kernel.CHAMBERS
+    for steps in SPIN_STEPS:
+        counts[steps % kernel.CHAMBERS] += 1
+    return [count * one / len(SPIN_STEPS) for count in counts]
+
+
+def _choice_weights(strategy, code, half):
+    """Targets a strategy can pick in a state, with their probabilities."""
+    if strategy is kernel.random_strategy:
+        return (("self", half), ("other", half))
+    return ((strategy(None, code), 1),)
+
+
+class _Walker:
+    """Memoized walk over the game tree of one configuration."""
+
+    def __init__(self, bullets_per_round, strategies, exact):
+        self.bullets = min(bullets_per_round, kernel.CHAMBERS)
+        self.strategies = strategies
+        self.one = Fraction(1) if exact else 1.0
+        self.half = self.one / 2
+        self.spin = _spin_weights(self.one)
+        layouts = list(itertools.combinations(range(kernel.CHAMBERS), self.bullets))
+        self.layouts = [sum(1 << chamber for chamber in chambers) for chambers in layouts]
+        self.layout_weight = self.one / len(layouts)
+        self.memo = {}
+        self.transpositions = 0
+
+    def round(self, remaining, current):
+        """Outcomes from the start of a round (load and spin)."""
+        key = ("round", remaining, current)
+        if key in self.memo:
+            self.transpositions += 1
+            return self.memo[key]
+        outcomes = defaultdict(lambda: 0 * self.one)
+        for live in self.layouts:
+            for shift, spin_weight in enumerate(self.spin):
+                code = canonical_state(kernel.pack_state(live, 0, shift))
+                weight = self.layout_weight * spin_weight
+                for (winner, rounds, turns, lives), p in self.turns(remaining, current, code).items():
+                    outcomes[(winner, rounds + 1, turns, lives)] += weight * p
+        self.memo[key] = outcomes = dict(outcomes)
+        return outcomes
+
+    def turns(self, remaining, current, code):
+        """Outcomes from a turn with the drum in a canonical state."""
+        key = (remaining, current, code)
+        if key in self.memo:
+            self.transpositions += 1
+            return self.memo[key]
+        outcomes = defaultdict(lambda: 0 * self.one)
+        result = kernel.TRIGGER[code]
+        fired = result & 1
+        following = canonical_state(result >> 1)
+        for target, p in _choice_weights(self.strategies[current], code, self.half):
+            after = list(remaining)
+            if fired:
+                after[current if target == "self" else current ^ 1] -= 1
+            after = tuple(after)
+            if min(after) <= 0:
+                alive = [i for i in (0, 1) if after[i] > 0]
+                winner = alive[0] if len(alive) == 1 else None
+                outcomes[(winner, 0, 1, after)] += p
+                continue
+            if following & kernel.FULL_MASK:
+                branch = self.turns(after, current ^ 1, following)
+            else:
+                branch = self.round(after, current ^ 1)
+            for (winner, rounds, turns, lives), q in branch.items():
+                outcomes[(winner, rounds, turns + 1, lives)] += p * q
+        self.memo[key] = outcomes = dict(outcomes)
+        return outcomes
+
+
+def enumerate_game(lives=1, bullets_per_round=1, strategies=("random", "random"), first=0,
+                   exact=True):
+    """Exact outcome distribution of an automatic game.
+
+    Walks every drum layout, spin outcome and target choice from the first
+    load (Crupier.dump_and_load_bullets_randomly) to the end of the game,
+    reusing the result of drum states that are rotations of each other.
+    Intended for small configurations (a few lives); the number of
+    outcomes grows with the possible game lengths.
+
+    Args:
+        lives: Starting lives for each player, or a (player 1, player 2) pair
+        bullets_per_round: Bullets loaded each round (1-6)
+        strategies: (player 1, player 2) strategy names from kernel.STRATEGIES
+                    or strategy functions; 'random' branches both ways
+        first: Index of the player who shoots first
+        exact: Use Fractions (exact) instead of floats
+
+    Returns:
+        Enumeration
+    """
+    remaining = tuple(lives) if isinstance(lives, (list, tuple)) else (lives, lives)
+    walker = _Walker(bullets_per_round, estimator.resolve_strategies(strategies), exact)
+    limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(max(limit, 10000))
+    try:
+        tree = walker.round(remaining, first)
+    finally:
+        sys.setrecursionlimit(limit)
+    total = sum(remaining)
+    outcomes = {Outcome(winner, rounds, turns, total - sum(left), left): p
+                for (winner, rounds, turns, left), p in tree.items()}
+    states = sum(1 for key in walker.memo if key[0] != "round")
+    return Enumeration(outcomes, states, walker.transpositions)
+
+
+def marginal(outcomes, field):
+    """Distribution of one Outcome field, e.g. marginal(outcomes, "winner")."""
+    distribution = defaultdict(int)
+    for outcome, p in outcomes.items():
+        distribution[getattr(outcome, field)] += p
+    return dict(sorted(distribution.items(), key=lambda item: (item[0] is None, item[0])))
+
+
+def expected(outcomes, field):
+    """Expected value of a numeric Outcome field."""
+    return sum(getattr(outcome, field) * p for outcome, p in outcomes.items())
+
+
+def win_probability(outcomes, player=0):
+    """Probability that a player (0 or 1) wins."""
+    return marginal(outcomes, "winner").get(player, 0)
+
+
+def standard_error(p, games):
+    """Standard error of a sampled frequency with true probability p."""
+    return math.sqrt(float(p) * (1 - float(p)) / games)
@@ -0,0 +1,256 @@
+import itertools
+import math
+import random
+import statistics
+from collections import namedtuple
+
+import kernel
+
+# Games per batch before the confidence interval is checked again
+DEFAULT_BATCH_SIZE = 2000
+
+# Upper bound on games played by one estimate
+DEFAULT_MAX_GAMES = 2_000_000
+
+# XORed into a unit seed to get an independent stream for target choices
+_CHOICE_SALT = 0x5DEECE66D
+
+# Largest value of random.random(); u and _LAST_UNIFORM - u cover the same grid
+_LAST_UNIFORM = 1.0 - 2.0 ** -53
+
+Estimate = namedtuple("Estimate", ["value", "half_width", "confidence", "games", "batches",
+                                   "variance_ratio", "converged"])
+Estimate.__doc__ = """Result of an estimate.
+
+value is the estimated probability (or difference of probabilities),
+value +/- half_width is the confidence interval, and variance_ratio is how
+many plain Monte Carlo games each game played here was worth.
+"""
+
+
+class _Uniforms(random.Random):
+    """Random source that can mirror every draw for antithetic games.
+
+    Integer draws map a uniform u to int(u * n), so mirroring u to its
+    reflection inside [0, 1) mirrors every index: a mirrored game takes
+    the opposite target choices and spins. (Random's own integer draws use
+    the low bits of u, which mirroring does not reverse.)
+    """
+
+    def __init__(self, seed, antithetic=False):
+        self.antithetic = antithetic
+        super().__init__(seed)
+
+    def random(self):
+        u = super().random()
+        return _LAST_UNIFORM - u if self.antithetic else u
+
+    def _index(self, n):
+        """Uniform index in range(n)."""
+        return min(int(self.random() * n), n - 1)
+
+    def randint(self, a, b):
+        return a + self._index(b - a + 1)
+
+    def choice(self, seq):
+        return seq[self._index(len(seq))]
+
+    def sample(self, population, k):
+        pool = list(population)
+        size = len(pool)
+        result = []
+        for i in range(k):
+            j = self._index(size - i)
+            result.append(pool[j])
+            pool[j] = pool[size - i - 1]
+        return result
+
+
+def resolve_strategies(strategies):
+    """Turn a pair of strategy names or functions into functions."""
+    return tuple(kernel.STRATEGIES[s] if isinstance(s, str) else s for s in strategies)
+
+
+def first_round_layouts(bullets_per_round):
+    """First-round drum states used as strata.
+
+    Loading is uniform and independent of the spin, so relative to the
+    chamber about to fire every loaded set of chambers is equally likely.
+    The strata are those sets with the drum at START_POSITION.
+    """
+    bullets = min(bullets_per_round, kernel.CHAMBERS)
+    layouts = []
+    for chambers in itertools.combinations(range(kernel.CHAMBERS), bullets):
+        live = sum(1 << chamber for chamber in chambers)
+        layouts.append(kernel.pack_state(live, 0, kernel.START_POSITION))
+    return layouts
+
+
+def _z_score(confidence):
+    """Two-sided normal quantile for a confidence level."""
+    return statistics.NormalDist().inv_cdf((1 + confidence) / 2)
+
+
+def _play(lives, bullets_per_round, strategies, first_state, seed, antithetic):
+    """Play one kernel game; 1.0 if player 1 (index 0) wins, else 0.0."""
+    result = kernel.play_game(lives, bullets_per_round,
+                              rng=_Uniforms(seed, antithetic),
+                              choice_rng=_Uniforms(seed ^ _CHOICE_SALT, antithetic),
+                              strategies=strategies, first_state=first_state)
+    return 1.0 if result.winner == 0 else 0.0
+
+
+def _run(sample_unit, strata, games_per_unit, target_width, confidence, batch_size,
+         max_games, seed):
+    """Sample units over equally weighted strata until the interval is narrow enough.
+
+    Args:
+        sample_unit: Function (stratum, unit seed) -> value of one unit
+        strata: Stratum values passed to sample_unit
+        games_per_unit: Games played by one unit
+        target_width: Stop once the full confidence interval is this narrow
+        confidence: Confidence level of the interval
+        batch_size: Games per batch (rounded to whole units per stratum)
+        max_games: Stop after this many games even if not converged
+        seed: Seed for the unit seeds
+
+    Returns:
+        tuple: (value, variance of the value, games, batches, converged)
+    """
+    master = random.Random(seed)
+    z = _z_score(confidence)
+    count = len(strata)
+    per_stratum = max(2, batch_size // (games_per_unit * count))
+    totals = [0.0] * count
+    squares = [0.0] * count
+    units = 0
+    games = batches = 0
+
+    while True:
+        for index, stratum in enumerate(strata):
+            total = square = 0.0
+            for _ in range(per_stratum):
+                value = sample_unit(stratum, master.getrandbits(64))
+                total += value
+                square += value * value
+            totals[index] += total
+            squares[index] += square
+        units += per_stratum
+        games += per_stratum * count * games_per_unit
+        batches += 1
+
+        # Stratified mean and its variance: sum of W^2 s^2 / n with W = 1 / count
+        value = sum(totals) / (units * count)
+        variance = 0.0
+        for total, square in zip(totals, squares):
+            mean = total / units
+            variance += max(square / units - mean * mean, 0.0) * units / (units - 1)
+        variance /= count * count * units
+
+        converged = 2 * z * math.sqrt(variance) <= target_width
+        if converged or games >= max_games:
+            return value, variance, games, batches, converged
+
+
+def _finish(value, variance, games, batches, converged, confidence, naive_variance):
+    """Build an Estimate, comparing against plain Monte Carlo with as many games."""
+    if variance > 0:
+        ratio = naive_variance / (games * variance)
+    else:
+        ratio = math.inf if naive_variance > 0 else 1.0
+    return Estimate(value, _z_score(confidence) * math.sqrt(variance), confidence,
+                    games, batches, ratio, converged)
+
+
+def estimate_win_probability(lives=3, bullets_per_round=1, strategies=("random", "random"),
+                             target_width=0.01, confidence=0.95, antithetic=True,
+                             stratified=True, batch_size=DEFAULT_BATCH_SIZE,
+                             max_games=DEFAULT_MAX_GAMES, seed=None):
+    """Estimate the probability that player 1 wins.
+
+    Games run in batches until the confidence interval is narrower than
+    `target_width`. Antithetic pairs replay each game with mirrored random
+    draws, and stratified sampling plays an equal share of games from every
+    first-round drum layout.
+
+    Args:
+        lives: Starting lives for each player
+        bullets_per_round: Bullets loaded each round
+        strategies: (player 1, player 2) strategy names from kernel.STRATEGIES
+                    or strategy functions (layout strata assume they only
+                    depend on bullet counts, like the built-in ones)
+        target_width: Full width of the confidence interval to reach
+        confidence: Confidence level (default: 0.95)
+        antithetic: Play antithetic pairs
+        stratified: Stratify over first-round drum layouts
+        batch_size: Games per batch
+        max_games: Stop after this many games even if not converged
+        seed: Seed for reproducible estimates
+
+    Returns:
+        Estimate
+    """
+    strategies = resolve_strategies(strategies)
+    strata = first_round_layouts(bullets_per_round) if stratified else [None]
+    mirrors = (False, True) if antithetic else (False,)
+
+    def sample_unit(first_state, unit_seed):
+        return sum(_play(lives, bullets_per_round, strategies, first_state, unit_seed, mirror)
+                   for mirror in mirrors) / len(mirrors)
+
+    value, variance, games, batches, converged = _run(
+        sample_unit, strata, len(mirrors), target_width, confidence, batch_size, max_games, seed)
+    return _finish(value, variance, games, batches, converged, confidence,
+                   value * (1 - value))
+
+
+def compare_strategies(strategies_a, strategies_b, lives=3, bullets_per_round=1,
+                       target_width=0.01, confidence=0.95, antithetic=True, stratified=True,
+                       batch_size=DEFAULT_BATCH_SIZE, max_games=DEFAULT_MAX_GAMES, seed=None):
+    """Estimate how much strategies_a changes player 1's win probability over strategies_b.
+
+    Both strategy pairs play every game from the same seed (common random
+    numbers): the drum is loaded and spun the same way, so the difference
+    only reflects the strategies.
+
+    Args:
+        strategies_a: (player 1, player 2) strategies of the first setup
+        strategies_b: (player 1, player 2) strategies of the second setup
+        Other arguments as in estimate_win_probability
+
+    Returns:
+        Estimate of P(player 1 wins | a) - P(player 1 wins | b). Its
+        variance_ratio compares against running both setups independently.
+    """
+    strategies_a = resolve_strategies(strategies_a)
+    strategies_b = resolve_strategies(strategies_b)
+    strata = first_round_layouts(bullets_per_round) if stratified else [None]
+    mirrors = (False, True) if antithetic else (False,)
+    wins = [0.0, 0.0]
+
+    def sample_unit(first_state, unit_seed):
+        difference = 0.0
+        for mirror in mirrors:
+            a = _play(lives, bullets_per_round, strategies_a, first_state, unit_seed, mirror)
+            b = _play(lives, bullets_per_round, strategies_b, first_state, unit_seed, mirror)
+            wins[0] += a
+            wins[1] += b
+            difference += a - b
+        return difference / len(mirrors)
+
+    value, variance, games, batches, converged = _run(
+        sample_unit, strata, 2 * len(mirrors), target_width, confidence, batch_size,
+        max_games, seed)
+    # Independent runs would split the games between the two setups
+    p_a, p_b = (2 * w / games for w in wins)
+    naive = 2 * (p_a * (1 - p_a) + p_b * (1 - p_b))
+    return _finish(value, variance, games, batches, converged, confidence, naive)
+
+
+def format_estimate(estimate):
+    """One-line summary of an Estimate."""
+    status = "" if estimate.converged else " (not converged)"
+    return (f"{estimate.value:.4f} +/- {estimate.half_width:.4f} "
+            f"({estimate.confidence:.0%} CI) from {estimate.games} games in "
+            f"{estimate.batches} batch(es), worth {estimate.variance_ratio:.1f}x "
+            f"plain Monte Carlo{status}")
@@ -0,0 +1,78 @@
+from collections import Counter, namedtuple
+
+# === Engine Events ===
+# Emitted by Revolver, Crupier and Player once the change is made (outside
+# their locks, so handlers may use the object again).
+
+DrumLoaded = namedtuple("DrumLoaded", ["revolver", "bullets"])
+DrumSpun = namedtuple("DrumSpun", ["revolver", "steps"])
+TriggerPulled = namedtuple("TriggerPulled", ["revolver", "chamber", "result"])
+RevolverHanded = namedtuple("RevolverHanded", ["revolver", "giver", "receiver"])
+LifeLost = namedtuple("LifeLost", ["player", "lives"])
+
+# === Game Events ===
+# Published by RussianRoulette; `auto` is True for automatic play.
+
+RoundStarted = namedtuple("RoundStarted", ["number", "bullets", "auto"])
+TurnStarted = namedtuple("TurnStarted", ["player", "auto"])
+ShotResolved = namedtuple("ShotResolved", ["shooter", "target", "fired"])
+GameOver = namedtuple("GameOver", ["winner"])
+
+
+# Subscribed types of a bus without handlers (one shared empty set)
+_NO_TYPES = frozenset()
+
+
+class EventBus:
+    """Dispatches events to the handlers subscribed to their type.
+
+    Emitters check `subscribed` before building an event:
+
+        events = self.events
+        if events is not None and TriggerPulled in events.subscribed:
+            events.publish(TriggerPulled(self, chamber, result))
+
+    so an event nobody listens to costs one set lookup and is never created.
+    """
+
+    __slots__ = ("subscribed", "_handlers")
+
+    def __init__(self):
+        self.subscribed = _NO_TYPES
+        self._handlers = {}
+
+    def subscribe(self, event_type, handler):
+        """Call handler(event) for every published event of event_type."""
+        self._handlers[event_type] = self._handlers.get(event_type, ()) + (handler,)
+        self.subscribed = frozenset(self._handlers) if self._handlers else _NO_TYPES
+
+    def unsubscribe(self, event_type, handler):
+        """Stop calling a handler (no error if it was not subscribed)."""
+        handlers = tuple(h for h in self._handlers.get(event_type, ()) if h != handler)
+        if handlers:
+            self._handlers[event_type] = handlers
+        else:
+            self._handlers.pop(event_type, None)
+        self.subscribed = frozenset(self._handlers) if self._handlers else _NO_TYPES
+
+    def publish(self, event):
+        """Call the handlers of the event's type, in subscription order."""
+        for handler in self._handlers.get(type(event), ()):
+            handler(event)
+
+    def emit(self, event_type, *fields):
+        """Build and publish an event only if its type has subscribers."""
+        if event_type in self.subscribed:
+            self.publish(event_type(*fields))
+
+
+class EventCounter:
+    """Stats subscriber counting events by type name."""
+
+    def __init__(self, bus, event_types):
+        self.counts = Counter()
+        for event_type in event_types:
+            bus.subscribe(event_type, self._count)
+
+    def _count(self, event):
+        self.counts[type(event).__name__] += 1
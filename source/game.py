@@ -1,16 +1,53 @@
+import argparse
+import contextlib
+import functools
 import random
+import sys
+from collections import deque, namedtuple
 from player import Player
 from crupier import Crupier
+from revolver import Revolver, MAX_CHAMBERS
 from logger import Logger
 import graphics
+import kernel
+from events import (EventBus, DrumLoaded, DrumSpun, TriggerPulled, RoundStarted,
+                    TurnStarted, ShotResolved, GameOver)
 import soundEffects
+from profiler import Profiler, profile_call
+
+# Shared no-op span used when no profiler is attached
+_NO_SPAN = contextlib.nullcontext()
+
+# Immutable settings of a table type, shared by all its games (see table_config)
+TableConfig = namedtuple("TableConfig",
+                         ["lives", "bullets_per_round", "chambers", "revolvers",
+                          "animations", "sound"])
+
+
+@functools.lru_cache(maxsize=256)
+def table_config(lives=3, bullets_per_round=1, chambers=6, revolvers=1,
+                 animations=True, sound=True):
+    """The one TableConfig object of a table type."""
+    return TableConfig(lives, bullets_per_round, chambers, revolvers, animations, sound)
 
 
 class RussianRoulette:
-    """Main game class for Russian Roulette."""
+    """Main game class for Russian Roulette.
+    
+    Table settings live in a TableConfig shared by every game with the same
+    setup; lives, bullets_per_round, animations and sound read from it.
+    """
+    
+    __slots__ = ("config", "revolvers", "crupier", "logger", "records_directory",
+                 "record_writer", "profiler", "broadcaster", "round_number",
+                 "turns_played", "shots_fired", "shots", "game_over", "player1", "player2",
+                 "current_player", "other_player", "auto", "events", "effects", "status")
     
     def __init__(self, player1_name="Player 1", player2_name="Player 2", 
-                 lives=3, bullets_per_round=1, animations=True, sound=True):
+                 lives=3, bullets_per_round=1, animations=True, sound=True,
+                 records_directory="records", profiler=None, broadcaster=None,
+                 history_store=None, record_writer=None, chambers=6, revolvers=1,
+                 log_capacity=None):
         """Initialize the game.
         
         Args:
@@ -20,23 +57,248 @@ class RussianRoulette:
             bullets_per_round: Number of bullets loaded each round (default: 1)
             animations: Enable graphics animations (default: True)
             sound: Enable sound effects (default: True)
+            records_directory: Where game records are saved (default: 'records').
+                               None disables saving records
+            profiler: Optional Profiler recording per-phase timing spans
+            broadcaster: Optional Broadcaster streaming events and frames to spectators
+            history_store: Optional HistoryStore the finished game is saved to
+            record_writer: Optional RecordWriter that saves records in the background
+            chambers: Chambers per revolver, up to 64 (default: 6)
+            revolvers: Revolvers on the table (default: 1). Every revolver is
+                       loaded each round and turns pass them around in
+                       rotation; the round ends when all are empty
+            log_capacity: Log entries and shots kept in memory (default:
+                          unbounded). Older log entries are spilled to a
+                          temporary file, so records and the history store
+                          still get the whole log; `shots` keeps the newest
+        
+        Raises:
+            ValueError: If lives or revolvers is below 1
         """
-        self.crupier = Crupier()
-        self.logger = Logger()
-        self.animations = animations
-        self.sound = sound
-        self.bullets_per_round = bullets_per_round
+        if lives < 1:
+            raise ValueError(f"Players need at least 1 life, got {lives}")
+        if revolvers < 1:
+            raise ValueError(f"A table needs at least 1 revolver, got {revolvers}")
+        self.config = table_config(lives, bullets_per_round, chambers, revolvers,
+                                   animations, sound)
+        self.revolvers = [Revolver(chambers) for _ in range(revolvers)]
+        self.crupier = Crupier(self.revolvers[0])
+        self.logger = Logger(store=history_store, capacity=log_capacity,
+                             spill=log_capacity is not None)
+        self.records_directory = records_directory
+        self.record_writer = record_writer
+        self.profiler = profiler
+        self.broadcaster = broadcaster
         self.round_number = 0
+        self.turns_played = 0
+        self.shots_fired = 0
+        self.shots = self._new_shots()
         self.game_over = False
         
-        # Create players without revolvers (crupier manages the gun)
-        self.player1 = Player(player1_name, lives=lives, revolver=None)
+        # Create players without revolvers (crupier manages the gun). Passing
+        # the table's revolver keeps Player from building a spare one
+        self.player1 = Player(player1_name, lives=lives, revolver=self.revolvers[0])
         self.player1.revolverInHand = None
-        self.player2 = Player(player2_name, lives=lives, revolver=None)
+        self.player2 = Player(player2_name, lives=lives, revolver=self.revolvers[0])
         self.player2.revolverInHand = None
         
         self.current_player = self.player1
         self.other_player = self.player2
+        # StatusView, created by the first display_status (automatic games
+        # without spectators never draw one)
+        self.status = None
+        
+        # Engine objects report to one event bus; sound, animations and
+        # spectator drum frames are subscribers. They only act on
+        # interactive turns (self.auto is False)
+        self.auto = False
+        self.events = EventBus()
+        # Sound and animation work queued by subscribers during an engine
+        # call; run_effects plays it once the call's span has closed
+        self.effects = []
+        for obj in (*self.revolvers, self.crupier, self.player1, self.player2):
+            obj.events = self.events
+        if animations:
+            _Animations(self).subscribe(self.events)
+        if sound:
+            _Audio(self).subscribe(self.events)
+        if broadcaster is not None:
+            _DrumFrames(self).subscribe(self.events)
+
+    def reset(self, player1_name=None, player2_name=None):
+        """Return the game to its starting state for a new match.
+        
+        Keeps the table's objects (revolvers, crupier, players, logger and
+        event bus with its subscribers), so a recycled game allocates
+        almost nothing. Profiler, broadcaster, store and record settings
+        are kept too.
+        
+        Args:
+            player1_name: New name of the first player (default: unchanged)
+            player2_name: New name of the second player (default: unchanged)
+        
+        Returns:
+            RussianRoulette: The game itself
+        """
+        for revolver in self.revolvers:
+            revolver.reset()
+        self.crupier.revolverInHand = self.revolvers[0]
+        for player, name in ((self.player1, player1_name), (self.player2, player2_name)):
+            if name is not None:
+                player.name = sys.intern(name)
+            player.lives = self.config.lives
+            player.revolverInHand = None
+        self.logger.clear_history()
+        self.round_number = 0
+        self.turns_played = 0
+        self.shots_fired = 0
+        # A new list: the previous match's shots may still be referenced
+        # (e.g. by simulation.run_game results)
+        self.shots = self._new_shots()
+        self.game_over = False
+        self.current_player = self.player1
+        self.other_player = self.player2
+        if self.status is not None:
+            self.status.reset()
+        self.effects = []
+        self.auto = False
+        return self
+
+    def _new_shots(self):
+        """An empty shot list, bounded like the log when it has a capacity."""
+        capacity = self.logger.capacity
+        return [] if capacity is None else deque(maxlen=capacity)
+
+    @property
+    def lives(self):
+        """Starting lives of each player."""
+        return self.config.lives
+
+    @property
+    def bullets_per_round(self):
+        """Bullets loaded into every revolver each round."""
+        return self.config.bullets_per_round
+
+    @property
+    def animations(self):
+        """True if interactive turns are animated."""
+        return self.config.animations
+
+    @property
+    def sound(self):
+        """True if interactive turns play sound effects."""
+        return self.config.sound
+
+    def _span(self, phase):
+        """Return a timing span for a game phase (no-op without a profiler)."""
+        if self.profiler is None:
+            return _NO_SPAN
+        return self.profiler.span(phase)
+
+    def run_effects(self):
+        """Play the sound and animation work queued during the last engine call.
+        
+        Subscribers queue this work instead of doing it inside the engine's
+        "load", "spin" or "fire" span, so those spans (and the profiler's
+        totals) only time the engine itself.
+        """
+        effects, self.effects = self.effects, []
+        for effect in effects:
+            effect()
+
+    def _publish(self, event, **data):
+        """Publish a game event to spectators (no-op without a broadcaster)."""
+        if self.broadcaster is not None:
+            self.broadcaster.publish_event(event, **data)
+
+    def _publish_drum(self, revolver):
+        """Publish a still frame of the drum when no animation is being shown."""
+        if self.broadcaster is not None:
+            self.broadcaster.publish_frame(graphics.Frame(graphics.render_drum(graphics.DrumView(revolver)), 0))
+
+    def _frames(self, frames):
+        """Route animation frames through the broadcaster, if any."""
+        if self.broadcaster is None:
+            return frames
+        return self.broadcaster.tee_frames(frames)
+
+    def _lives(self):
+        """Map of player name to remaining lives."""
+        return {self.player1.name: self.player1.lives, self.player2.name: self.player2.lives}
+
+    def summary(self):
+        """Return the game result as a dict (players, winner and counters)."""
+        alive = self.get_alive_players()
+        return {
+            "player1": self.player1.name,
+            "player2": self.player2.name,
+            "lives": self.lives,
+            "bullets": self.bullets_per_round,
+            "chambers": self.revolvers[0].chambers,
+            "revolvers": len(self.revolvers),
+            "winner": alive[0].name if len(alive) == 1 else None,
+            "rounds": self.round_number,
+            "turns": self.turns_played,
+            "shots": self.shots_fired,
+            "remaining_lives": [self.player1.lives, self.player2.lives],
+        }
+
+    def save_records(self):
+        """Persist the finished game to the records directory and/or history store.
+        
+        Returns:
+            str: Path to the saved record file, or None
+        """
+        filepath = None
+        with self._span("persist"):
+            if self.records_directory is not None:
+                filepath = self.logger.save_to_file(self.records_directory, self.record_writer)
+            if self.logger.store is not None:
+                self.logger.save_to_store(self.summary(), self.shots)
+        return filepath
+
+    def has_observers(self):
+        """Return True if anything watches the game beyond its final result."""
+        return bool(self.logger.echo or self.logger.store is not None
+                    or self.records_directory is not None or self.record_writer is not None
+                    or self.profiler is not None or self.broadcaster is not None
+                    or self.events.subscribed)
+
+    def kernel_table(self):
+        """True if the table is the one the turn kernel models (one six-chamber revolver)."""
+        return len(self.revolvers) == 1 and self.revolvers[0].chambers == kernel.CHAMBERS
+
+    def play_headless(self):
+        """Automatic game through the lookup-table turn kernel.
+        
+        Skips revolver handoffs, logging and records, but draws the same random
+        numbers as play_auto, so a seeded game has the same result. Use it only
+        when has_observers() is False.
+        
+        The kernel models one six-chamber revolver; other tables fall back to
+        play_auto (which, without observers, only differs in speed).
+        """
+        if not self.kernel_table():
+            return self.play_auto()
+        players = (self.player1, self.player2)
+        first = 0 if self.current_player is self.player1 else 1
+        revolver = self.crupier.revolverInHand
+        result = kernel.play_game(
+            lives=[self.player1.lives, self.player2.lives],
+            bullets_per_round=self.bullets_per_round,
+            position=revolver.activeChamberPosition, first=first)
+        
+        # Sync the objects with the kernel's final state
+        kernel.state_to_revolver(result.state, revolver)
+        self.player1.lives, self.player2.lives = result.lives
+        self.round_number += result.rounds
+        self.turns_played += result.turns
+        self.shots_fired += result.shots
+        self.current_player = players[result.current]
+        self.other_player = players[result.current ^ 1]
+        self.game_over = True
+        
+        return players[result.winner] if result.winner is not None else None
 
     def get_alive_players(self):
         """Return list of players still alive."""
@@ -58,35 +320,48 @@ class RussianRoulette:
 
     def setup_round(self):
         """Setup a new round - crupier loads bullets and spins drum."""
-        self.round_number += 1
-        self.logger.round(self.round_number)
-        
-        # Crupier prepares the revolver
-        self.crupier.dump_and_load_bullets_randomly(self.bullets_per_round)
-        
-        if self.sound:
-            soundEffects.play_shells_drop(block=False)
-        
-        self.logger.action(f"Crupier loads {self.bullets_per_round} bullet(s)")
-        
-        # Spin the drum
-        if self.animations:
-            steps = self.crupier.revolverInHand.free_spin_drum()
-            graphics.spin_drum_animation(self.crupier.revolverInHand.drum, steps)
-        else:
-            self.crupier.revolverInHand.free_spin_drum()
+        with self._span("setup_round"):
+            self.auto = False
+            self.round_number += 1
+            self.logger.round(self.round_number)
+            self._publish("round", round=self.round_number, bullets=self.bullets_per_round)
+            self.events.emit(RoundStarted, self.round_number, self.bullets_per_round, False)
+            
+            # Crupier prepares every revolver
+            for revolver in self.revolvers:
+                self.crupier.revolverInHand = revolver
+                with self._span("load"):
+                    self.crupier.dump_and_load_bullets_randomly(self.bullets_per_round)
+                self.run_effects()
+                self.logger.action(f"Crupier loads {self.bullets_per_round} bullet(s)")
+                
+                # Spin the drum
+                with self._span("spin"):
+                    self.crupier.revolverInHand.free_spin_drum()
+                self.run_effects()
+                self.logger.action("Crupier spins the drum")
+            self.crupier.revolverInHand = self.revolvers[0]
+
+    def display_status(self, force=False, echo=True, flush=False):
+        """Display current game status if lives changed since it was last shown.
         
-        if self.sound:
-            soundEffects.play_spin()
+        Redraws are limited to one per graphics.STATUS_INTERVAL; spectators
+        get a "status" event with each redraw. Animations clear the screen,
+        so they reset the status view and the next call redraws.
         
-        self.logger.action("Crupier spins the drum")
-
-    def display_status(self):
-        """Display current game status."""
-        print("\n" + "=" * 40)
-        print(f"  {self.player1.name}: {'❤️ ' * self.player1.lives}{'🖤 ' * (3 - self.player1.lives)}")
-        print(f"  {self.player2.name}: {'❤️ ' * self.player2.lives}{'🖤 ' * (3 - self.player2.lives)}")
-        print("=" * 40 + "\n")
+        Args:
+            force: Redraw even if nothing changed or the interval has not passed
+            echo: Print the status (otherwise only spectators get it)
+            flush: Draw a change held back by the interval now
+        """
+        if self.status is None:
+            self.status = graphics.StatusView((self.player1, self.player2), self.lives)
+        text = self.status.render(force, flush)
+        if text is None:
+            return
+        if echo:
+            print(text)
+        self._publish("status", lives=self._lives())
 
     def get_player_choice(self, auto=False):
         """Prompt current player to choose target.
@@ -116,51 +391,54 @@ class RussianRoulette:
         Args:
             auto: If True, run in automatic mode (no input/animations)
         """
-        # Give revolver to current player
-        self.crupier.give_revolver_to_player(self.current_player)
-        self.logger.player(self.current_player.name, "takes the revolver")
-        
-        if self.sound and not auto:
-            soundEffects.play_cock()
-        
-        # Get player choice
-        choice = self.get_player_choice(auto=auto)
-        
-        if choice == "self":
-            target = self.current_player
-            self.logger.danger(f"{self.current_player.name} points at themselves...")
-        else:
-            target = self.other_player
-            self.logger.danger(f"{self.current_player.name} points at {self.other_player.name}...")
-        
-        if not auto:
-            input("\nPress ENTER to pull the trigger...")
-        
-        # Fire animation
-        if self.animations and not auto:
-            fired, new_drum = graphics.fire_revolver_animation(
-                self.current_player.revolverInHand.drum
-            )
-            self.current_player.revolverInHand.drum = new_drum
-        else:
-            fired = self.current_player.revolverInHand.pull_trigger()
-        
-        # Handle result
-        if fired:
-            if self.sound:
-                soundEffects.play_gunshot()
-            target.take_damage()
-            self.logger.result(f"BANG! {target.name} loses a life!")
+        with self._span("play_turn"):
+            self.auto = auto
+            # Give revolver to current player
+            with self._span("take"):
+                self.crupier.give_revolver_to_player(self.current_player)
+            self.logger.player(self.current_player.name, "takes the revolver")
+            self.events.emit(TurnStarted, self.current_player, auto)
             
-            if not target.is_alive():
-                self.logger.result(f"{target.name} is eliminated!")
-        else:
-            if self.sound:
-                soundEffects.play_dryfire()
-            self.logger.result(f"*click* - {target.name} survives!")
-        
-        # Return revolver to crupier
-        self.current_player.give_revolver_to_crupier(self.crupier)
+            # Get player choice
+            with self._span("aim"):
+                choice = self.get_player_choice(auto=auto)
+            
+            if choice == "self":
+                target = self.current_player
+                self.logger.danger(f"{self.current_player.name} points at themselves...")
+            else:
+                target = self.other_player
+                self.logger.danger(f"{self.current_player.name} points at {self.other_player.name}...")
+            
+            if not auto:
+                input("\nPress ENTER to pull the trigger...")
+            
+            # Every mode fires through the revolver (TriggerPulled subscribers
+            # queue the shot's animation and sound, played after the span)
+            with self._span("fire"):
+                fired = self.current_player.revolverInHand.pull_trigger()
+            self.run_effects()
+            
+            # Handle result
+            self.turns_played += 1
+            self.shots.append((self.round_number, self.current_player.name, target.name, bool(fired)))
+            if fired:
+                self.shots_fired += 1
+                target.take_damage()
+                self.logger.result(f"BANG! {target.name} loses a life!")
+                
+                if not target.is_alive():
+                    self.logger.result(f"{target.name} is eliminated!")
+            else:
+                self.logger.result(f"*click* - {target.name} survives!")
+            
+            self._publish("shot", shooter=self.current_player.name, target=target.name,
+                          fired=bool(fired), lives=self._lives())
+            self.events.emit(ShotResolved, self.current_player, target, fired)
+            
+            # Return revolver to crupier
+            self.current_player.give_revolver_to_crupier(self.crupier)
+            self._next_revolver()
         
         return fired
 
@@ -175,10 +453,21 @@ class RussianRoulette:
             return None
         return None
 
+    def _next_revolver(self):
+        """Pass the crupier the next revolver in rotation that still has live bullets."""
+        count = len(self.revolvers)
+        if count == 1:
+            return
+        start = self.revolvers.index(self.crupier.revolverInHand)
+        for step in range(1, count + 1):
+            revolver = self.revolvers[(start + step) % count]
+            if revolver.has_live_rounds():
+                self.crupier.revolverInHand = revolver
+                return
+
     def check_drum_empty(self):
-        """Check if drum has any live bullets left."""
-        drum = self.crupier.revolverInHand.drum
-        return not any(bullet is True for bullet in drum)
+        """Check if no revolver has any live bullets left."""
+        return not any(revolver.has_live_rounds() for revolver in self.revolvers)
 
     def play(self):
         """Main game loop."""
@@ -189,6 +478,8 @@ class RussianRoulette:
         print("       🔫 PYTHON ROULETTE 🔫")
         print("=" * 50)
         print(f"\n{self.player1.name} vs {self.player2.name}")
+        self._publish("game_start", players=[self.player1.name, self.player2.name],
+                      lives=self.player1.lives, bullets=self.bullets_per_round)
         print(f"Lives: {self.player1.lives} | Bullets per round: {self.bullets_per_round}")
         print("\n" + "=" * 50)
         
@@ -223,8 +514,10 @@ class RussianRoulette:
                 input("Press ENTER to continue...")
         
         # Game over
-        self.display_status()
+        self.display_status(force=True)
         winner = self.get_alive_players()
+        self._publish("game_over", winner=winner[0].name if winner else None, lives=self._lives())
+        self.events.emit(GameOver, winner[0] if winner else None)
         if winner:
             self.logger.game_over(winner[0].name)
             print(f"\n🎉 {winner[0].name} WINS! 🎉\n")
@@ -233,23 +526,35 @@ class RussianRoulette:
             print("\n💀 No survivors! 💀\n")
         
         # Save game record
-        filepath = self.logger.save_to_file()
-        print(f"📝 Game record saved to: {filepath}\n")
+        filepath = self.save_records()
+        if filepath:
+            print(f"📝 Game record saved to: {filepath}\n")
 
     def play_auto(self):
         """Automatic game mode - no graphics, no sound, just logs."""
         self.logger.info("=== AUTOMATIC MODE ===")
         self.logger.info(f"{self.player1.name} vs {self.player2.name}")
         self.logger.info(f"Lives: {self.player1.lives} | Bullets: {self.bullets_per_round}")
+        self._publish("game_start", players=[self.player1.name, self.player2.name],
+                      lives=self.player1.lives, bullets=self.bullets_per_round)
         
         while not self.game_over:
             # Setup new round (no animations)
-            self.round_number += 1
-            self.logger.round(self.round_number)
-            self.crupier.dump_and_load_bullets_randomly(self.bullets_per_round)
-            self.logger.action(f"Crupier loads {self.bullets_per_round} bullet(s)")
-            self.crupier.revolverInHand.free_spin_drum()
-            self.logger.action("Crupier spins the drum")
+            with self._span("setup_round"):
+                self.auto = True
+                self.round_number += 1
+                self.logger.round(self.round_number)
+                self._publish("round", round=self.round_number, bullets=self.bullets_per_round)
+                self.events.emit(RoundStarted, self.round_number, self.bullets_per_round, True)
+                for revolver in self.revolvers:
+                    self.crupier.revolverInHand = revolver
+                    with self._span("load"):
+                        self.crupier.dump_and_load_bullets_randomly(self.bullets_per_round)
+                    self.logger.action(f"Crupier loads {self.bullets_per_round} bullet(s)")
+                    with self._span("spin"):
+                        self.crupier.revolverInHand.free_spin_drum()
+                    self.logger.action("Crupier spins the drum")
+                self.crupier.revolverInHand = self.revolvers[0]
             
             # Play until drum is empty or game over
             while not self.check_drum_empty() and not self.game_over:
@@ -260,6 +565,8 @@ class RussianRoulette:
                 
                 # Log status
                 self.logger.info(f"{self.player1.name}: {self.player1.lives} lives | {self.player2.name}: {self.player2.lives} lives")
+                if self.broadcaster is not None:
+                    self.display_status(echo=False)
                 
                 # Play turn in auto mode
                 self.play_turn(auto=True)
@@ -274,21 +581,110 @@ class RussianRoulette:
             if not self.game_over:
                 self.logger.info("Drum empty - new round")
         
-        # Game over
+        # Game over (spectators get the last status even if the throttle held it back)
+        if self.broadcaster is not None:
+            self.display_status(echo=False, flush=True)
         winner = self.get_alive_players()
+        self._publish("game_over", winner=winner[0].name if winner else None, lives=self._lives())
+        self.events.emit(GameOver, winner[0] if winner else None)
         if winner:
             self.logger.game_over(winner[0].name)
         else:
             self.logger.game_over()
         
         # Save game record
-        filepath = self.logger.save_to_file()
-        self.logger.info(f"Game record saved to: {filepath}")
+        filepath = self.save_records()
+        if filepath:
+            self.logger.info(f"Game record saved to: {filepath}")
         
         return winner[0] if winner else None
 
 
-if __name__ == '__main__':
+# === Event Subscribers ===
+
+class _Animations:
+    """Plays the spin and shot animations of interactive turns."""
+    
+    def __init__(self, game):
+        self.game = game
+    
+    def subscribe(self, events):
+        events.subscribe(DrumSpun, self.on_spin)
+        events.subscribe(TriggerPulled, self.on_shot)
+    
+    def on_spin(self, event):
+        if not self.game.auto:
+            self.game.effects.append(lambda: self._play(
+                graphics.spin_drum_frames(event.revolver, event.steps)))
+    
+    def on_shot(self, event):
+        if not self.game.auto:
+            self.game.effects.append(lambda: self._play(
+                graphics.fire_revolver_frames(event.revolver, event.result)))
+    
+    def _play(self, frames):
+        with self.game._span("render"):
+            graphics.play_frames(self.game._frames(frames))
+        self._screen_cleared()
+    
+    def _screen_cleared(self):
+        # Frames cleared the screen (and the spectators'): the status bar must be redrawn
+        if self.game.status is not None:
+            self.game.status.reset()
+
+
+class _Audio:
+    """Plays the sound effects of interactive turns."""
+    
+    def __init__(self, game):
+        self.game = game
+    
+    def subscribe(self, events):
+        events.subscribe(DrumLoaded, self.on_load)
+        events.subscribe(DrumSpun, self.on_spin)
+        events.subscribe(TurnStarted, self.on_turn)
+        events.subscribe(TriggerPulled, self.on_shot)
+    
+    def on_load(self, event):
+        if not self.game.auto:
+            self.game.effects.append(lambda: self._play(soundEffects.play_shells_drop, block=False))
+    
+    def on_spin(self, event):
+        if not self.game.auto:
+            self.game.effects.append(lambda: self._play(soundEffects.play_spin))
+    
+    def on_turn(self, event):
+        if not event.auto:
+            with self.game._span("audio"):
+                soundEffects.play_cock()
+    
+    def on_shot(self, event):
+        if not self.game.auto:
+            play = soundEffects.play_gunshot if event.result else soundEffects.play_dryfire
+            self.game.effects.append(lambda: self._play(play))
+    
+    def _play(self, sound, **options):
+        with self.game._span("audio"):
+            sound(**options)
+
+
+class _DrumFrames:
+    """Sends spectators a still frame of the drum after spins and shots that are not animated."""
+    
+    def __init__(self, game):
+        self.game = game
+    
+    def subscribe(self, events):
+        events.subscribe(DrumSpun, self.on_change)
+        events.subscribe(TriggerPulled, self.on_change)
+    
+    def on_change(self, event):
+        if self.game.auto or not self.game.animations:
+            self.game._publish_drum(event.revolver)
+
+
+def prompt_and_play(profiler=None):
+    """Ask for mode, names and bullets on stdin, then run one game."""
     print("\n🔫 PYTHON ROULETTE 🔫\n")
     
     # Mode selection
@@ -321,10 +717,410 @@ if __name__ == '__main__':
         player2_name=p2_name,
         bullets_per_round=bullets,
         animations=not auto_mode,
-        sound=not auto_mode
+        sound=not auto_mode,
+        profiler=profiler
     )
     
     if auto_mode:
         game.play_auto()
     else:
-        game.play()
\ No newline at end of file
+        game.play()
+
+
+def _positive_int(text):
+    """argparse type: an integer of at least 1."""
+    value = int(text)
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return value
+
+
+def _add_game_options(parser):
+    """Add the options shared by commands that create a game."""
+    parser.add_argument("--player1", default="Player 1", help="Name of first player")
+    parser.add_argument("--player2", default="Player 2", help="Name of second player")
+    parser.add_argument("-b", "--bullets", type=int, default=1, choices=range(1, MAX_CHAMBERS + 1),
+                        metavar="B", help="Bullets per round, up to the chamber count (default: 1)")
+    parser.add_argument("-l", "--lives", type=_positive_int, default=3,
+                        help="Starting lives for each player (default: 3)")
+    parser.add_argument("--chambers", type=int, default=6, choices=range(1, MAX_CHAMBERS + 1),
+                        metavar="N", help=f"Chambers per revolver, 1-{MAX_CHAMBERS} (default: 6)")
+    parser.add_argument("--revolvers", type=_positive_int, default=1,
+                        help="Revolvers on the table, used in rotation (default: 1)")
+
+
+def _require_kernel_table(args, command):
+    """Exit unless the table is the one the turn kernel models."""
+    if args.chambers != kernel.CHAMBERS or args.revolvers != 1:
+        raise SystemExit(f"{command}: only supports one {kernel.CHAMBERS}-chamber revolver")
+
+
+def build_parser():
+    """Build the command line parser."""
+    parser = argparse.ArgumentParser(
+        description="Python Roulette. Run without a command for the interactive prompts.")
+    parser.add_argument("--profile", action="store_true",
+                        help="Run under cProfile and print sorted stats afterwards")
+    parser.add_argument("--profile-sort", default="cumulative",
+                        help="pstats sort key for --profile (default: cumulative)")
+    parser.add_argument("--profile-output", metavar="FILE",
+                        help="Also dump raw cProfile stats to FILE")
+    parser.add_argument("--trace", metavar="FILE",
+                        help="Record per-phase spans and save them as Chrome trace-event JSON")
+    commands = parser.add_subparsers(dest="command")
+
+    play = commands.add_parser("play", help="Play an interactive game")
+    _add_game_options(play)
+    play.add_argument("--no-sound", action="store_true", help="Disable sound effects")
+    play.add_argument("--no-animations", action="store_true", help="Disable animations")
+    play.add_argument("--broadcast", type=int, metavar="PORT",
+                      help="Stream the match to spectators on localhost:PORT")
+
+    auto = commands.add_parser("auto", help="Play automatic games and stream results as JSON lines")
+    _add_game_options(auto)
+    auto.add_argument("-n", "--games", type=int, default=1, help="Number of games (default: 1)")
+    auto.add_argument("-w", "--workers", type=int, default=1,
+                      help="Worker processes (default: 1)")
+    auto.add_argument("-s", "--seed", type=int,
+                      help="Base seed; game i uses seed + i (default: random)")
+    auto.add_argument("-q", "--quiet", action="store_true",
+                      help="Do not print game logs (logs go to stderr otherwise)")
+    auto.add_argument("-o", "--output", metavar="FILE",
+                      help="Write JSON lines to FILE instead of stdout")
+    auto.add_argument("--records", metavar="DIR",
+                      help="Also save a text record of every game to DIR")
+    auto.add_argument("--async-records", action="store_true",
+                      help="Write --records on a background thread (single worker only)")
+    auto.add_argument("--compress-records", action="store_true",
+                      help="gzip records written with --async-records")
+    auto.add_argument("--fsync", choices=("always", "batch", "never"), default="batch",
+                      help="fsync policy for --async-records (default: batch)")
+    auto.add_argument("--db", metavar="FILE",
+                      help="Also save every game and its shots to a SQLite history database")
+    auto.add_argument("--summary", action="store_true",
+                      help="Print aggregate statistics instead of one line per game "
+                           "(workers write results to shared memory; implies --quiet)")
+
+    replay = commands.add_parser("replay", help="Replay an automatic game from its seed")
+    _add_game_options(replay)
+    replay.add_argument("-s", "--seed", type=int, help="Seed of the game to replay")
+    replay.add_argument("--from", dest="source", metavar="FILE",
+                        help="Take seed, lives and bullets from a JSON lines results file")
+    replay.add_argument("-g", "--game", type=int, default=0,
+                        help="Game index to replay from --from (default: 0)")
+
+    history = commands.add_parser("history", help="Query a SQLite history database")
+    history.add_argument("db", help="History database file")
+    history.add_argument("--leaderboard", type=int, nargs="?", const=10, metavar="N",
+                         help="Top N players by wins (default: 10)")
+    history.add_argument("--head-to-head", nargs=2, metavar=("A", "B"),
+                         help="Results of games between players A and B")
+    history.add_argument("--first-shot", metavar="NAME",
+                         help="Games where the first shot hit NAME")
+
+    archive = commands.add_parser("archive", help="Compact game records into a compressed archive")
+    archive.add_argument("action", choices=("fold", "show", "list"),
+                         help="fold record files in, show one game, or list archived games")
+    archive.add_argument("game_id", nargs="?", help="Game to show, e.g. game_record_2025-01-01_12:00:00_4242-000001")
+    archive.add_argument("--records", default="records",
+                         help="Records directory, relative to the project root (default: records)")
+    archive.add_argument("--archive", metavar="FILE",
+                         help="Archive file (default: <records>/archive.dat)")
+    archive.add_argument("--remove", action="store_true",
+                         help="Delete record files once they are archived (fold)")
+
+    estimate = commands.add_parser("estimate", help="Estimate win odds to a target precision")
+    _add_game_options(estimate)
+    strategy_names = sorted(kernel.STRATEGIES)
+    estimate.add_argument("--strategies", nargs=2, default=("random", "random"),
+                          choices=strategy_names, metavar=("S1", "S2"),
+                          help=f"Strategies of player 1 and 2: {', '.join(strategy_names)} "
+                               "(default: random random)")
+    estimate.add_argument("--versus", nargs=2, choices=strategy_names, metavar=("S1", "S2"),
+                          help="Estimate the change in player 1's odds against these strategies")
+    estimate.add_argument("--width", type=float, default=0.01,
+                          help="Confidence interval width to reach (default: 0.01)")
+    estimate.add_argument("--confidence", type=float, default=0.95,
+                          help="Confidence level (default: 0.95)")
+    estimate.add_argument("--max-games", type=int, default=2_000_000,
+                          help="Stop after this many games (default: 2000000)")
+    estimate.add_argument("-s", "--seed", type=int, help="Seed for a reproducible estimate")
+    estimate.add_argument("--no-antithetic", action="store_true",
+                          help="Do not play antithetic pairs")
+    estimate.add_argument("--no-stratify", action="store_true",
+                          help="Do not stratify over first-round drum layouts")
+    estimate.add_argument("--exact", action="store_true",
+                          help="Enumerate the whole game tree instead of sampling "
+                               "(small lives only)")
+
+    tables = commands.add_parser("tables", help="Host automatic tables in threads of one process")
+    _add_game_options(tables)
+    tables.add_argument("-t", "--tables", type=int, default=4, help="Number of tables (default: 4)")
+    tables.add_argument("-n", "--games", type=int, default=100,
+                        help="Games per table (default: 100)")
+    tables.add_argument("-w", "--workers", type=int,
+                        help="Threads (default: one per table)")
+
+    sweep = commands.add_parser("sweep", help="Estimate win odds over a parameter grid (cached)")
+    sweep.add_argument("-l", "--lives", default="1-10",
+                       help="Lives values, e.g. 1-10 or 1,3,5 (default: 1-10)")
+    sweep.add_argument("-b", "--bullets", default="1-6",
+                       help="Bullets per round values (default: 1-6)")
+    sweep.add_argument("--strategies", default=",".join(strategy_names),
+                       help="Comma-separated strategies; every ordered pair is swept "
+                            "(default: all)")
+    sweep.add_argument("-w", "--workers", type=int, default=1,
+                       help="Worker processes (default: 1)")
+    sweep.add_argument("--width", type=float, default=0.01,
+                       help="Confidence interval width per cell (default: 0.01)")
+    sweep.add_argument("--confidence", type=float, default=0.95,
+                       help="Confidence level (default: 0.95)")
+    sweep.add_argument("-s", "--seed", type=int, default=1, help="Seed for every cell (default: 1)")
+    sweep.add_argument("--cache", default=".sweep_cache",
+                       help="Cache directory, relative to the project root (default: .sweep_cache)")
+    sweep.add_argument("--no-cache", action="store_true", help="Recompute every cell")
+    sweep.add_argument("-o", "--output", metavar="FILE",
+                       help="Write JSON lines to FILE instead of stdout")
+
+    commands.add_parser("bench", help="Run the benchmark suite (extra arguments go to benchmarks.py)")
+    return parser
+
+
+def run_command(args, extra=(), profiler=None):
+    """Run the parsed command.
+
+    Args:
+        args: Parsed arguments
+        extra: Unparsed arguments, forwarded to the benchmark suite
+        profiler: Optional Profiler attached to interactive and replayed games
+
+    Returns:
+        int: Exit status
+    """
+    if args.command is None:
+        prompt_and_play(profiler)
+        return 0
+
+    if args.command == "play":
+        broadcaster = None
+        if args.broadcast is not None:
+            from broadcast import Broadcaster
+            broadcaster = Broadcaster(port=args.broadcast).start()
+            host, port = broadcaster.address
+            print(f"Spectators: python3 broadcast.py {host}:{port}")
+        game = RussianRoulette(args.player1, args.player2, lives=args.lives,
+                               bullets_per_round=args.bullets,
+                               animations=not args.no_animations, sound=not args.no_sound,
+                               profiler=profiler, broadcaster=broadcaster,
+                               chambers=args.chambers, revolvers=args.revolvers)
+        try:
+            game.play()
+        finally:
+            if broadcaster:
+                broadcaster.close()
+        return 0
+
+    if args.command == "auto":
+        import json
+        import simulation
+        seed = args.seed if args.seed is not None else random.randrange(2 ** 32)
+        if args.summary:
+            if args.records or args.db:
+                raise SystemExit("auto: --summary cannot be combined with --records or --db")
+            _require_kernel_table(args, "auto --summary")
+            with simulation.run_shared(args.games, seed, workers=args.workers, lives=args.lives,
+                                       bullets_per_round=args.bullets) as results:
+                summary = {"seed": seed, **results.aggregate()}
+            text = json.dumps(summary)
+            if args.output:
+                with open(args.output, 'w') as f:
+                    f.write(text + "\n")
+            else:
+                print(text)
+            return 0
+        store = writer = None
+        options = {}
+        if args.async_records:
+            if args.workers > 1:
+                raise SystemExit("auto: --async-records needs --workers 1")
+            from recordWriter import RecordWriter
+            writer = RecordWriter(compress=args.compress_records, fsync=args.fsync)
+            options["record_writer"] = writer
+        results = simulation.iter_games(
+            args.games, seed, workers=args.workers, lives=args.lives,
+            bullets_per_round=args.bullets, player1_name=args.player1,
+            player2_name=args.player2, quiet=args.quiet, records_directory=args.records,
+            shot_log=args.db is not None, chambers=args.chambers, revolvers=args.revolvers,
+            **options)
+        if args.db:
+            from historyStore import HistoryStore
+            store = HistoryStore(args.db)
+            results = simulation.store_results(results, store)
+        try:
+            if args.output:
+                with open(args.output, 'w') as f:
+                    simulation.write_json_lines(results, f)
+            else:
+                simulation.write_json_lines(results, sys.stdout)
+        finally:
+            if store:
+                store.close()
+            if writer:
+                writer.close()
+                print(f"Record writer: {writer.metrics()}", file=sys.stderr)
+        return 0
+
+    if args.command == "replay":
+        import simulation
+        seed, lives, bullets = args.seed, args.lives, args.bullets
+        chambers, revolvers = args.chambers, args.revolvers
+        if args.source:
+            result = simulation.read_json_line(args.source, args.game)
+            seed, lives, bullets = result["seed"], result["lives"], result["bullets"]
+            chambers, revolvers = result.get("chambers", 6), result.get("revolvers", 1)
+        if seed is None:
+            raise SystemExit("replay: give --seed or --from")
+        random.seed(seed)
+        game = RussianRoulette(args.player1, args.player2, lives=lives,
+                               bullets_per_round=bullets, animations=False, sound=False,
+                               records_directory=None, profiler=profiler,
+                               chambers=chambers, revolvers=revolvers)
+        game.play_auto()
+        return 0
+
+    if args.command == "history":
+        from historyStore import HistoryStore
+        with HistoryStore(args.db) as store:
+            print(f"{store.count_games()} games")
+            if args.leaderboard:
+                print(f"\n{'Player':<20} {'wins':>8} {'games':>8}")
+                for name, wins, games in store.leaderboard(args.leaderboard):
+                    print(f"{name:<20} {wins:>8} {games:>8}")
+            if args.head_to_head:
+                print()
+                for name, wins in store.head_to_head(*args.head_to_head).items():
+                    print(f"{name:<20} {wins:>8}")
+            if args.first_shot:
+                game_ids = store.games_hit_on_first_shot(args.first_shot)
+                print(f"\n{len(game_ids)} games where the first shot hit {args.first_shot}")
+        return 0
+
+    if args.command == "archive":
+        import os
+        from recordArchive import RecordArchive, fold_records
+        records_dir = os.path.join(os.path.dirname(__file__), '..', args.records)
+        archive = RecordArchive(args.archive or os.path.join(records_dir, "archive.dat"))
+        if args.action == "fold":
+            added = fold_records(records_dir, archive, remove=args.remove)
+            print(f"Archived {added} record(s), {len(archive)} in total")
+        elif args.action == "show":
+            if not args.game_id:
+                raise SystemExit("archive show: give a game id")
+            print(Logger.read_record(args.game_id, args.records, archive), end="")
+        else:
+            for game_id in archive.game_ids():
+                print(game_id)
+        return 0
+
+    if args.command == "estimate":
+        import estimator
+        _require_kernel_table(args, "estimate")
+        if args.exact:
+            import enumerator
+            p = enumerator.win_probability(
+                enumerator.enumerate_game(args.lives, args.bullets, args.strategies).outcomes)
+            label = f"P({args.player1} wins), {' vs '.join(args.strategies)}"
+            if args.versus:
+                p -= enumerator.win_probability(
+                    enumerator.enumerate_game(args.lives, args.bullets, args.versus).outcomes)
+                label = (f"Change in P({args.player1} wins), {' vs '.join(args.strategies)} "
+                         f"over {' vs '.join(args.versus)}")
+            print(f"{label}: {float(p):.6f} (exact, {p})")
+            return 0
+        options = dict(lives=args.lives, bullets_per_round=args.bullets,
+                       target_width=args.width, confidence=args.confidence,
+                       antithetic=not args.no_antithetic, stratified=not args.no_stratify,
+                       max_games=args.max_games, seed=args.seed)
+        if args.versus:
+            result = estimator.compare_strategies(args.strategies, args.versus, **options)
+            label = (f"Change in P({args.player1} wins), {' vs '.join(args.strategies)} "
+                     f"over {' vs '.join(args.versus)}")
+        else:
+            result = estimator.estimate_win_probability(strategies=args.strategies, **options)
+            label = f"P({args.player1} wins), {' vs '.join(args.strategies)}"
+        print(f"{label}: {estimator.format_estimate(result)}")
+        return 0
+
+    if args.command == "tables":
+        from tables import free_threaded, timed_run_tables
+        results, elapsed, rate = timed_run_tables(
+            args.tables, args.games, workers=args.workers, lives=args.lives,
+            bullets_per_round=args.bullets, player1_name=args.player1,
+            player2_name=args.player2, chambers=args.chambers, revolvers=args.revolvers)
+        wins = {args.player1: 0, args.player2: 0}
+        for result in results:
+            if result["winner"] in wins:
+                wins[result["winner"]] += 1
+        build = "free-threaded" if free_threaded() else "GIL"
+        print(f"{len(results)} games on {args.tables} tables in {elapsed:.2f}s "
+              f"({rate:.0f} games/s, {build} build)")
+        for name, count in wins.items():
+            print(f"  {name}: {count} wins")
+        return 0
+
+    if args.command == "sweep":
+        import os
+        import simulation
+        from sweep import SweepCache, build_grid, parse_values, run_sweep
+        strategies = args.strategies.split(",")
+        unknown = [name for name in strategies if name not in kernel.STRATEGIES]
+        if unknown:
+            raise SystemExit(f"sweep: unknown strategies: {', '.join(unknown)}")
+        cells = build_grid(parse_values(args.lives), parse_values(args.bullets), strategies)
+        cache = None
+        if not args.no_cache:
+            cache = SweepCache(os.path.join(os.path.dirname(__file__), '..', args.cache))
+        results = run_sweep(cells, workers=args.workers, cache=cache, target_width=args.width,
+                            confidence=args.confidence, seed=args.seed)
+        if args.output:
+            with open(args.output, 'w') as f:
+                simulation.write_json_lines(results, f)
+        else:
+            simulation.write_json_lines(results, sys.stdout)
+        hits = sum(result["cached"] for result in results)
+        print(f"{len(results)} cells: {len(results) - hits} computed, {hits} cached",
+              file=sys.stderr)
+        return 0
+
+    if args.command == "bench":
+        import benchmarks
+        return benchmarks.main(list(extra))
+
+
+def main(argv=None):
+    parser = build_parser()
+    args, extra = parser.parse_known_args(argv)
+    if extra and args.command != "bench":
+        parser.error(f"unrecognized arguments: {' '.join(extra)}")
+
+    bullets, chambers = getattr(args, "bullets", None), getattr(args, "chambers", None)
+    if isinstance(bullets, int) and chambers is not None and bullets > chambers:
+        parser.error(f"--bullets {bullets} is more than --chambers {chambers}")
+
+    profiler = Profiler() if args.trace else None
+    if args.profile:
+        # Stats go to stderr so they never mix into a command's stdout (e.g. JSON lines)
+        status = profile_call(lambda: run_command(args, extra, profiler),
+                              sort=args.profile_sort, output=args.profile_output,
+                              stream=sys.stderr)
+    else:
+        status = run_command(args, extra, profiler)
+
+    if profiler:
+        profiler.print_summary()
+        print(f"Trace saved to: {profiler.export_chrome_trace(args.trace)}")
+    return status
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -1,26 +1,58 @@
 import time
 import os
+from collections import namedtuple
+
+# ANSI sequence that clears the screen and moves the cursor home
+CLEAR_SEQUENCE = "\033[2J\033[H"
+
+# Shortest time between two status redraws (seconds)
+STATUS_INTERVAL = 0.1
+
+REVOLVER_POINTED_AT_PLAYER = (
+    "          ^\n"
+    "         | |\n"
+    "       @#####@\n"
+    "     (###   ###)-.\n"
+    "   .(###     ###) \\\n"
+    "  /  (###   ###)   )\n"
+    " (=-  .@#####@|_--\"\n"
+    " /\\    \\_|l|_/ (\\\n"
+    "(=-\\     |l|    /\n"
+    " \\  \\.___|l|___/\n"
+    " /\\      |_|   /\n"
+    "(=-\\._________/\\\n"
+    " \\             /\n"
+    "   \\._________/\n"
+    "     #  ----  #\n"
+    "     #   __   #\n"
+    "     \\########/\n"
+)
+
+
+class Frame(namedtuple("Frame", ["text", "duration"])):
+    """One animation frame: full-screen text and how long it stays on screen.
+    
+    A frame with text None holds the current screen for its duration.
+    """
+    
+    __slots__ = ()
+    
+    def encode(self, encoding="utf-8"):
+        """Return the frame as bytes, prefixed with the clear-screen sequence."""
+        if self.text is None:
+            return b""
+        return (CLEAR_SEQUENCE + self.text).encode(encoding)
+
+
+def render_revolver_pointed_at_player():
+    """Return the revolver pointed at the player in ASCII art."""
+    return REVOLVER_POINTED_AT_PLAYER
+
 
 def print_revolver_pointed_at_player():
     """Print the revolver pointed at the player in ASCII art."""
-    print("          ^")
-    print("         | |")
-    print("       @#####@")
-    print("     (###   ###)-.")
-    print("   .(###     ###) \\")
-    print("  /  (###   ###)   )")
-    print(" (=-  .@#####@|_--\"")
-    print(" /\\    \\_|l|_/ (\\")
-    print("(=-\\     |l|    /")
-    print(" \\  \\.___|l|___/")
-    print(" /\\      |_|   /")
-    print("(=-\\._________/\\")
-    print(" \\             /")
-    print("   \\._________/")
-    print("     #  ----  #")
-    print("     #   __   #")
-    print("     \\########/")
-    
+    print(render_revolver_pointed_at_player(), end="")
+
 
 def clear_screen():
     """Clear the terminal screen."""
@@ -44,70 +76,258 @@ def get_chamber_symbol(state):
         return '@'
 
 
-def display_drum(drum):
-    """Display the revolver drum state in ASCII art.
+def render_drum(drum):
+    """Return the revolver drum state in ASCII art.
     
     Args:
-        drum: List of 6 chamber states (None, True, or False)
+        drum: List of chamber states (None, True, or False)
     
-    Drum layout:
+    Six-chamber drum layout:
            [5]
         [4]   [0]
         [3]   [1]
            [2]
+    
+    Other sizes are drawn as a ring of two rows (see render_ring_drum).
     """
-    currentDrum = drum.copy()
-    chamberSymbols = [get_chamber_symbol(chamber) for chamber in currentDrum]
+    if len(drum) != 6:
+        return render_ring_drum(drum)
+    chamberSymbols = [get_chamber_symbol(chamber) for chamber in drum]
+    
+    return (
+        f"   _________\n"
+        f"  /         \\\n"
+        f" /    [{chamberSymbols[5]}]    \\\n"
+        f" | [{chamberSymbols[4]}]   [{chamberSymbols[0]}] |\n"
+        f" | [{chamberSymbols[3]}]   [{chamberSymbols[1]}] |\n"
+        f" \\    [{chamberSymbols[2]}]    /\n"
+        f"  \\_________/\n"
+        f"\n"
+    )
+
+
+def render_ring_drum(drum):
+    """Return a drum of any size as a ring of two rows.
     
-    print(f"   _________")
-    print(f"  /         \\")
-    print(f" /    [{chamberSymbols[5]}]    \\")
-    print(f" | [{chamberSymbols[4]}]   [{chamberSymbols[0]}] |")
-    print(f" | [{chamberSymbols[3]}]   [{chamberSymbols[1]}] |")
-    print(f" \\    [{chamberSymbols[2]}]    /")
-    print(f"  \\_________/")
-    print()
+    The top row runs left to right from chamber 0, the bottom row continues
+    right to left, and the last chamber (the one under the hammer after a
+    turn, like [5] in the six-chamber art) is marked with a caret.
+    
+    Args:
+        drum: List of chamber states (None, True, or False)
+    """
+    symbols = [f"[{get_chamber_symbol(chamber)}]" for chamber in drum]
+    half = (len(symbols) + 1) // 2
+    top = "".join(symbols[:half])
+    bottom = "".join(reversed(symbols[half:])).rjust(len(top))
+    # Column of the last chamber's symbol: first of the bottom row, or the
+    # only chamber of a one-chamber drum
+    column = 4 + len(top) - len(symbols[half:]) * 3 if len(symbols) > 1 else 4
+    return (
+        f"  {'_' * (len(top) + 2)}\n"
+        f" / {top} \\\n"
+        f" | {bottom} |\n"
+        f" \\{'_' * (len(top) + 2)}/\n"
+        f"{' ' * column}^\n"
+        f"\n"
+    )
 
 
-def reload_in_given_order_animation(drum, bulletsToLoad, chambersToLoad, delay=0.5):
-    """Animate loading bullets into the drum one by one.
+def display_drum(drum):
+    """Display the revolver drum state in ASCII art.
+    
+    Args:
+        drum: List of chamber states (None, True, or False)
+    """
+    print(render_drum(drum), end="")
+
+
+class DrumView:
+    """Read-only view of a Revolver's drum in display order.
+    
+    Index i is the chamber i + 1 places after the active one, so index 0
+    fires next and the last index is the chamber under the hammer ([5] in
+    the six-chamber art). Every access reads the revolver; nothing is
+    copied, so a view can be rendered (render_drum) for each frame.
+    
+    Args:
+        revolver: Revolver to show
+        turns: Show the drum turned this many chambers further (negative: back)
+        shown: Optional (chamber, state) pair shown instead of that chamber's
+               real state, e.g. a bullet just fired, before the reveal
+    """
+    
+    __slots__ = ("revolver", "turns", "shown")
+    
+    def __init__(self, revolver, turns=0, shown=None):
+        self.revolver = revolver
+        self.turns = turns
+        self.shown = shown
+    
+    def __len__(self):
+        return self.revolver.chambers
+    
+    def __getitem__(self, index):
+        size = self.revolver.chambers
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("chamber out of range")
+        chamber = (self.revolver.activeChamberPosition + self.turns + 1 + index) % size
+        if self.shown is not None and self.shown[0] == chamber:
+            return self.shown[1]
+        return self.revolver.chamber_state(chamber)
+
+
+def render_status(players, max_lives):
+    """Return the heart bars of the players, one line each.
+    
+    Args:
+        players: Players to show, in order
+        max_lives: Hearts in a full bar (starting lives)
+    """
+    lines = ["\n" + "=" * 40]
+    for player in players:
+        lives = max(0, min(player.lives, max_lives))
+        lines.append(f"  {player.name}: {'❤️ ' * lives}{'🖤 ' * (max_lives - lives)}")
+    lines.append("=" * 40 + "\n")
+    return "\n".join(lines)
+
+
+class StatusView:
+    """Status of the players, redrawn only when their lives change.
+    
+    render() returns the status text when the lives differ from the last
+    status shown and at least `min_interval` seconds have passed since it;
+    otherwise None. Changes within the interval are coalesced, but the view
+    has no timer: a held-back change is only drawn by a later render()
+    call (once the interval has passed) or by render(flush=True), which
+    draws a pending change without waiting. Call reset() when the screen
+    has been cleared, so the next render() draws again.
+    
+    Args:
+        players: Players to show, in order
+        max_lives: Hearts in a full bar (starting lives)
+        min_interval: Shortest time between two redraws (seconds)
+        clock: Time source in seconds (default: time.monotonic)
+    """
+    
+    __slots__ = ("players", "max_lives", "min_interval", "clock", "_shown", "_drawn_at")
+    
+    def __init__(self, players, max_lives, min_interval=STATUS_INTERVAL, clock=time.monotonic):
+        self.players = tuple(players)
+        self.max_lives = max_lives
+        self.min_interval = min_interval
+        self.clock = clock
+        self.reset()
+    
+    def reset(self):
+        """Forget the last status shown, so the next render() draws."""
+        self._shown = None
+        self._drawn_at = None
+    
+    def lives(self):
+        """Current lives of the players, in order."""
+        return tuple(player.lives for player in self.players)
+    
+    def pending(self):
+        """True if the lives differ from the last status shown."""
+        return self.lives() != self._shown
+    
+    def render(self, force=False, flush=False):
+        """Return the status text if it should be redrawn now, else None.
+        
+        Args:
+            force: Draw even if nothing changed or the interval has not passed
+            flush: Draw a change held back by the interval now (trailing redraw)
+        """
+        lives = self.lives()
+        if not force:
+            if lives == self._shown:
+                return None
+            if (not flush and self._drawn_at is not None
+                    and self.clock() - self._drawn_at < self.min_interval):
+                return None
+        self._shown = lives
+        self._drawn_at = self.clock()
+        return render_status(self.players, self.max_lives)
+
+
+# === Frame Consumers ===
+
+def play_frames(frames):
+    """Show frames on the terminal, clearing the screen before each one.
+    
+    Args:
+        frames: Iterator of Frame, usually one of the *_frames generators
+    
+    Returns:
+        The generator's return value (if any)
+    """
+    while True:
+        try:
+            frame = next(frames)
+        except StopIteration as stop:
+            return stop.value
+        if frame.text is not None:
+            clear_screen()
+            print(frame.text, end="")
+        if frame.duration:
+            time.sleep(frame.duration)
+
+
+def collect_frames(frames):
+    """Collect frames without displaying or sleeping (recorders, tests).
+    
+    Returns:
+        Tuple of (list of Frame, generator's return value)
+    """
+    collected = []
+    while True:
+        try:
+            collected.append(next(frames))
+        except StopIteration as stop:
+            return collected, stop.value
+
+
+# === Frame Sources ===
+
+def reload_in_given_order_frames(drum, bulletsToLoad, chambersToLoad, delay=0.5):
+    """Yield frames of loading bullets into the drum one by one.
     
     Args:
-        drum: List of 6 chamber states to modify
+        drum: List of chamber states
         bulletsToLoad: Number of bullets to load
         chambersToLoad: List of chambers to load bullets into
         delay: Time between each frame in seconds
+    
+    Returns:
+        The drum state after loading
     """
-    # Find empty positions
     currentDrum = drum.copy()
     
     if bulletsToLoad > len(chambersToLoad):
         bulletsToLoad = len(chambersToLoad)
     
-    clear_screen()
-    display_drum(currentDrum)
-    time.sleep(delay)
+    yield Frame(render_drum(currentDrum), delay)
     
     for bullet in range(bulletsToLoad):
-        if bullet < len(chambersToLoad):
-            clear_screen()
-            
-            # Load bullet into position
-            chamber = chambersToLoad[bullet]
-            currentDrum[chamber] = True
-            
-            display_drum(currentDrum)
-            time.sleep(delay)
+        # Load bullet into position
+        chamber = chambersToLoad[bullet]
+        currentDrum[chamber] = True
+    
+        yield Frame(render_drum(currentDrum), delay)
+    
+    yield Frame(render_drum(currentDrum), 0)
     
-    clear_screen()
-    display_drum(currentDrum)
+    return currentDrum
 
 
-def unload_empty_cartridges_animation(drum, delay=0.5):
-    """Animate unloading fired cartridges from the drum.
+def unload_empty_cartridges_frames(drum, delay=0.5):
+    """Yield frames of unloading fired cartridges from the drum.
     
     Args:
-        drum: List of 6 chamber states (None, True, or False)
+        drum: List of chamber states (None, True, or False)
         delay: Time between each frame in seconds
     
     Returns:
@@ -115,118 +335,135 @@ def unload_empty_cartridges_animation(drum, delay=0.5):
     """
     current_drum = drum.copy()
     
-    clear_screen()
-    display_drum(current_drum)
-    time.sleep(delay)
+    yield Frame(render_drum(current_drum), delay)
     
-    for chamber in range(6):
+    for chamber in range(len(current_drum)):
         if current_drum[chamber] is False:
-            clear_screen()
-            
             # Unload the fired cartridge
             current_drum[chamber] = None
-            
-            display_drum(current_drum)
-            time.sleep(delay)
     
-    clear_screen()
-    display_drum(current_drum)
+            yield Frame(render_drum(current_drum), delay)
+    
+    yield Frame(render_drum(current_drum), 0)
     
     return current_drum
 
 
-def spin_drum_animation(drum, stepsToSpin, delay=0.08):
-    """Animate the actual drum spinning with all bullet states visible.
+def spin_drum_frames(revolver, stepsToSpin, delay=0.08):
+    """Yield frames of a spin the revolver has just made, with all bullet states visible.
+    
+    The frames turn a view of the drum from where it was before the spin
+    to where free_spin_drum left it; the revolver is only read.
     
     Args:
-        drum: List of 6 chamber states (None, True, or False)
-        stepsToSpin: Number of rotation steps
+        revolver: Revolver after free_spin_drum
+        stepsToSpin: Number of rotation steps (free_spin_drum's return value)
         delay: Time between each frame
-    
-    Returns:
-        The rotated drum state after spinning
     """
-    
-    # Copy the drum to avoid modifying original during animation
-    current_drum = drum.copy()
-    
-    time.sleep(0.3)
+    # Short pause on the current screen before spinning
+    yield Frame(None, 0.3)
     
     for step in range(stepsToSpin):
-        clear_screen()
-        
-        chamberSymbols = [get_chamber_symbol(chamber) for chamber in current_drum]
-        
-        print(f"   _________")
-        print(f"  /         \\")
-        print(f" /    [{chamberSymbols[5]}]    \\")
-        print(f" | [{chamberSymbols[4]}]   [{chamberSymbols[0]}] |")
-        print(f" | [{chamberSymbols[3]}]   [{chamberSymbols[1]}] |")
-        print(f" \\    [{chamberSymbols[2]}]    /")
-        print(f"  \\_________/")
-        
-        # Rotate the drum visually counter-clockwise (shift positions)
-        current_drum = current_drum[1:] + [current_drum[0]]
-        
         # Slow down near the end for dramatic effect
         if step > stepsToSpin - 10:
-            time.sleep(delay * 2)
+            duration = delay * 2
         elif step > stepsToSpin - 20:
-            time.sleep(delay * 1.5)
+            duration = delay * 1.5
         else:
-            time.sleep(delay)
+            duration = delay
     
-    clear_screen()
-    display_drum(current_drum)
+        yield Frame(render_drum(DrumView(revolver, step - stepsToSpin)), duration)
     
-    return current_drum
+    yield Frame(render_drum(DrumView(revolver)), 0)
 
 
-def fire_revolver_animation(drum, delay=0.1):
-    """Animate firing the revolver - drum rotates and fires if chamber is loaded.
+def fire_revolver_frames(revolver, fired, delay=0.1):
+    """Yield frames of a shot the revolver has just fired (pull_trigger).
+    
+    The drum is shown turning onto the chamber under the hammer, with a
+    fired bullet still shown live until the reveal; the revolver is only read.
     
     Args:
-        drum: List of 6 chamber states (None, True, or False)
+        revolver: Revolver after pull_trigger
+        fired: pull_trigger's result (True, False or None)
         delay: Time between animation frames
     
     Returns:
-        Tuple of (fired: bool/None, updated drum state)
+        fired
     """
-    current_drum = drum.copy()
-    
-    clear_screen()
-    print("Pulling trigger...")
-    display_drum(current_drum)
-    time.sleep(delay * 3)
+    # Before the reveal the chamber under the hammer shows its state before the shot
+    hammer = revolver.activeChamberPosition
+    before = (hammer, True) if fired else None
     
-    # Rotate drum counter-clockwise (active chamber is position 5)
-    clear_screen()
-    print("*click*")
-    current_drum = current_drum[1:] + [current_drum[0]]
-    display_drum(current_drum)
-    time.sleep(delay * 2)
+    yield Frame("Pulling trigger...\n" + render_drum(DrumView(revolver, -1, before)), delay * 3)
     
-    # Check if chamber 5 (active) has a live bullet
-    chamber_state = current_drum[5]
+    # The drum turns counter-clockwise onto the active chamber (the last position)
+    yield Frame("*click*\n" + render_drum(DrumView(revolver, 0, before)), delay * 2)
     
     # Show pointed_at_you graphic before result
-    clear_screen()
-    print_revolver_pointed_at_player()
-    time.sleep(delay * 5)
-    
-    clear_screen()
-    if chamber_state is True:
-        print("BANG!")
-        current_drum[5] = False  # Mark as fired
-    elif chamber_state is False:
-        print("*click* (already fired)")
+    yield Frame(render_revolver_pointed_at_player(), delay * 5)
+    
+    if fired is True:
+        message = "BANG!"
+    elif fired is False:
+        message = "*click* (already fired)"
     else:
-        print("*click* (empty)")
+        message = "*click* (empty)"
+    
+    yield Frame(message + "\n" + render_drum(DrumView(revolver)), delay * 3)
+    
+    return fired
+
+
+# === Terminal Animations ===
+
+def reload_in_given_order_animation(drum, bulletsToLoad, chambersToLoad, delay=0.5):
+    """Animate loading bullets into the drum one by one.
+    
+    Args:
+        drum: List of chamber states to modify
+        bulletsToLoad: Number of bullets to load
+        chambersToLoad: List of chambers to load bullets into
+        delay: Time between each frame in seconds
+    """
+    play_frames(reload_in_given_order_frames(drum, bulletsToLoad, chambersToLoad, delay))
+
+
+def unload_empty_cartridges_animation(drum, delay=0.5):
+    """Animate unloading fired cartridges from the drum.
+    
+    Args:
+        drum: List of chamber states (None, True, or False)
+        delay: Time between each frame in seconds
+    
+    Returns:
+        The drum state after unloading empty cartridges
+    """
+    return play_frames(unload_empty_cartridges_frames(drum, delay))
+
 
-    display_drum(current_drum)
-    time.sleep(delay * 3)
+def spin_drum_animation(revolver, stepsToSpin, delay=0.08):
+    """Animate a spin the revolver has just made, with all bullet states visible.
     
-    return chamber_state, current_drum
+    Args:
+        revolver: Revolver after free_spin_drum
+        stepsToSpin: Number of rotation steps
+        delay: Time between each frame
+    """
+    play_frames(spin_drum_frames(revolver, stepsToSpin, delay))
+
+
+def fire_revolver_animation(revolver, delay=0.1):
+    """Pull the trigger and animate the shot.
+    
+    Args:
+        revolver: Revolver to fire
+        delay: Time between animation frames
+    
+    Returns:
+        pull_trigger's result: True (fired), False (already fired) or None (empty)
+    """
+    return play_frames(fire_revolver_frames(revolver, revolver.pull_trigger(), delay))
 
 
 if __name__ == '__main__':
@@ -238,9 +475,12 @@ if __name__ == '__main__':
     # # test reload
     # reload_in_given_order_animation(emptyDrum, 4, chambersToLoad, delay=1)
     # # test spin
-    # spin_drum_animation(loadedDrum, 12, delay=0.05)
+    # spin_drum_animation(revolver, 12, delay=0.05)
     # # test unload
     # unload_empty_cartridges_animation(loadedDrum, delay=0.5)
-
+    
     # test firing
-    fire_revolver_animation(emptyDrum, delay=0.3)
\ No newline at end of file
+    from revolver import Revolver
+    revolver = Revolver()
+    revolver.drum = loadedDrum
+    fire_revolver_animation(revolver, delay=0.3)
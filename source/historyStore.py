@@ -0,0 +1,227 @@
+import sqlite3
+from datetime import datetime
+
+# Games buffered before they are written in one transaction
+DEFAULT_BATCH_SIZE = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    played_at TEXT NOT NULL,
+    player1 TEXT NOT NULL,
+    player2 TEXT NOT NULL,
+    winner TEXT,
+    lives INTEGER NOT NULL,
+    bullets_per_round INTEGER NOT NULL,
+    rounds INTEGER NOT NULL,
+    turns INTEGER NOT NULL,
+    shots INTEGER NOT NULL,
+    seed INTEGER
+);
+CREATE TABLE IF NOT EXISTS shots (
+    game_id INTEGER NOT NULL REFERENCES games(id),
+    turn INTEGER NOT NULL,
+    round INTEGER NOT NULL,
+    shooter TEXT NOT NULL,
+    target TEXT NOT NULL,
+    fired INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS events (
+    game_id INTEGER NOT NULL REFERENCES games(id),
+    seq INTEGER NOT NULL,
+    time TEXT NOT NULL,
+    level TEXT NOT NULL,
+    message TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS player_stats (
+    name TEXT PRIMARY KEY,
+    games INTEGER NOT NULL DEFAULT 0,
+    wins INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_games_players ON games(player1, player2);
+CREATE INDEX IF NOT EXISTS idx_games_player2 ON games(player2);
+CREATE INDEX IF NOT EXISTS idx_games_played_at ON games(played_at);
+CREATE INDEX IF NOT EXISTS idx_games_winner ON games(winner);
+CREATE INDEX IF NOT EXISTS idx_games_bullets ON games(bullets_per_round);
+CREATE INDEX IF NOT EXISTS idx_shots_first ON shots(turn, target, fired);
+CREATE INDEX IF NOT EXISTS idx_shots_game ON shots(game_id);
+CREATE INDEX IF NOT EXISTS idx_events_game ON events(game_id);
+CREATE INDEX IF NOT EXISTS idx_player_stats_wins ON player_stats(wins);
+"""
+
+
+class HistoryStore:
+    """SQLite store of finished games, their shots and (optionally) log events.
+
+    Games are buffered and written in batches, one transaction per batch.
+    The database runs in WAL mode so readers are not blocked by the writer.
+    Use a single HistoryStore per database for writing.
+    """
+
+    def __init__(self, path, batch_size=DEFAULT_BATCH_SIZE):
+        """Open (or create) a history database.
+
+        Args:
+            path: Database file, or ':memory:'
+            batch_size: Games buffered before a write (default: 500)
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self.pending = []
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def close(self):
+        """Write buffered games and close the database."""
+        self.flush()
+        self.conn.close()
+
+    # === Writing ===
+
+    def add_game(self, game, events=(), shots=()):
+        """Buffer one finished game.
+
+        Args:
+            game: Game summary dict (see RussianRoulette.summary)
+            events: Logger history entries as (time, level, message)
+            shots: Shots as (round, shooter, target, fired), in turn order
+        """
+        self.pending.append((game, list(events), list(shots)))
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Write all buffered games in one transaction."""
+        if not self.pending:
+            return
+        wins = {}
+        with self.conn:
+            cursor = self.conn.cursor()
+            for game, events, shots in self.pending:
+                cursor.execute(
+                    "INSERT INTO games (played_at, player1, player2, winner, lives, "
+                    "bullets_per_round, rounds, turns, shots, seed) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (game.get("played_at") or datetime.now().isoformat(timespec='seconds'),
+                     game["player1"], game["player2"], game["winner"], game["lives"],
+                     game["bullets"], game["rounds"], game["turns"], game["shots"],
+                     game.get("seed")))
+                game_id = cursor.lastrowid
+                if shots:
+                    cursor.executemany(
+                        "INSERT INTO shots VALUES (?, ?, ?, ?, ?, ?)",
+                        [(game_id, turn, round_number, shooter, target, int(bool(fired)))
+                         for turn, (round_number, shooter, target, fired) in enumerate(shots, 1)])
+                if events:
+                    cursor.executemany(
+                        "INSERT INTO events VALUES (?, ?, ?, ?, ?)",
+                        [(game_id, seq, str(time), level, message)
+                         for seq, (time, level, message) in enumerate(events)])
+                for name in (game["player1"], game["player2"]):
+                    played, won = wins.get(name, (0, 0))
+                    wins[name] = (played + 1, won + (game["winner"] == name))
+            cursor.executemany(
+                "INSERT INTO player_stats (name, games, wins) VALUES (?, ?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET games = games + excluded.games, "
+                "wins = wins + excluded.wins",
+                [(name, played, won) for name, (played, won) in wins.items()])
+        self.pending = []
+
+    # === Queries ===
+
+    def count_games(self):
+        """Number of stored games."""
+        self.flush()
+        return self.conn.execute("SELECT COUNT(*) FROM games").fetchone()[0]
+
+    def leaderboard(self, limit=10):
+        """Top players by wins.
+
+        Returns:
+            list: (name, wins, games) tuples
+        """
+        self.flush()
+        return self.conn.execute(
+            "SELECT name, wins, games FROM player_stats ORDER BY wins DESC, name LIMIT ?",
+            (limit,)).fetchall()
+
+    def head_to_head(self, player_a, player_b):
+        """Results of all games between two players.
+
+        Returns:
+            dict: Wins per player plus "none" for games without survivors
+        """
+        self.flush()
+        rows = self.conn.execute(
+            "SELECT winner, COUNT(*) FROM ("
+            "  SELECT winner FROM games WHERE player1 = ? AND player2 = ?"
+            "  UNION ALL"
+            "  SELECT winner FROM games WHERE player1 = ? AND player2 = ?"
+            ") GROUP BY winner",
+            (player_a, player_b, player_b, player_a)).fetchall()
+        results = {player_a: 0, player_b: 0, "none": 0}
+        for winner, count in rows:
+            results[winner if winner else "none"] = count
+        return results
+
+    def games_hit_on_first_shot(self, player, limit=None):
+        """Ids of games where the first shot of the game hit `player`."""
+        self.flush()
+        query = "SELECT game_id FROM shots WHERE turn = 1 AND target = ? AND fired = 1 ORDER BY game_id"
+        params = (player,)
+        if limit is not None:
+            query += " LIMIT ?"
+            params += (limit,)
+        return [row[0] for row in self.conn.execute(query, params)]
+
+    def games(self, player=None, winner=None, bullets_per_round=None, since=None, limit=100):
+        """Stored games matching all given filters, newest first.
+
+        Args:
+            player: Games where this player took part
+            winner: Games won by this player
+            bullets_per_round: Games with this many bullets per round
+            since: ISO date/time; games played at or after it
+            limit: Maximum rows (default: 100)
+
+        Returns:
+            list: Rows as dicts
+        """
+        self.flush()
+        clauses, params = [], []
+        if player is not None:
+            clauses.append("(player1 = ? OR player2 = ?)")
+            params += [player, player]
+        if winner is not None:
+            clauses.append("winner = ?")
+            params.append(winner)
+        if bullets_per_round is not None:
+            clauses.append("bullets_per_round = ?")
+            params.append(bullets_per_round)
+        if since is not None:
+            clauses.append("played_at >= ?")
+            params.append(since)
+        query = "SELECT * FROM games"
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY id DESC LIMIT ?"
+        params.append(limit)
+        cursor = self.conn.execute(query, params)
+        columns = [column[0] for column in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor]
+
+    def events(self, game_id):
+        """Logged events of one game as (time, level, message)."""
+        self.flush()
+        return self.conn.execute(
+            "SELECT time, level, message FROM events WHERE game_id = ? ORDER BY seq",
+            (game_id,)).fetchall()
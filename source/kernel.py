@@ -0,0 +1,176 @@
+import random
+from collections import namedtuple
+
+# A drum state is packed into one int:
+#   bits 0-5   live bullets (chamber i loaded -> bit i)
+#   bits 6-11  fired cartridges
+#   bits 12-14 active chamber position
+CHAMBERS = 6
+FULL_MASK = (1 << CHAMBERS) - 1
+FIRED_SHIFT = CHAMBERS
+POSITION_SHIFT = 2 * CHAMBERS
+STATE_COUNT = CHAMBERS << POSITION_SHIFT
+
+# Same starting position as Revolver
+START_POSITION = 5
+
+TARGETS = ("self", "other")
+
+GameResult = namedtuple("GameResult", ["winner", "rounds", "turns", "shots", "lives", "state", "current"])
+
+
+def pack_state(live_mask, fired_mask, position):
+    """Pack live/fired masks and the active chamber into a state code."""
+    return live_mask | (fired_mask << FIRED_SHIFT) | (position << POSITION_SHIFT)
+
+
+def unpack_state(code):
+    """Return (live mask, fired mask, position) of a state code."""
+    return code & FULL_MASK, (code >> FIRED_SHIFT) & FULL_MASK, code >> POSITION_SHIFT
+
+
+def _build_trigger_table():
+    """Precompute pull_trigger for every state.
+
+    TRIGGER[code] is (next code << 1) | fired, or -1 for impossible states
+    (a chamber both live and fired).
+    """
+    table = [-1] * STATE_COUNT
+    for code in range(STATE_COUNT):
+        live, fired, position = unpack_state(code)
+        if live & fired:
+            continue
+        position = (position + 1) % CHAMBERS
+        bit = 1 << position
+        if live & bit:
+            table[code] = (pack_state(live & ~bit, fired | bit, position) << 1) | 1
+        else:
+            table[code] = pack_state(live, fired, position) << 1
+    return table
+
+
+TRIGGER = _build_trigger_table()
+
+
+def state_from_revolver(revolver):
+    """Pack a Revolver's drum and active chamber into a state code."""
+    live = fired = 0
+    for chamber, state in enumerate(revolver.drum):
+        if state is True:
+            live |= 1 << chamber
+        elif state is False:
+            fired |= 1 << chamber
+    return pack_state(live, fired, revolver.activeChamberPosition)
+
+
+def state_to_revolver(code, revolver):
+    """Write a state code back into a Revolver."""
+    live, fired, position = unpack_state(code)
+    revolver.drum = [True if live >> i & 1 else False if fired >> i & 1 else None
+                     for i in range(CHAMBERS)]
+    revolver.activeChamberPosition = position
+
+
+# === Strategies ===
+# A strategy picks "self" or "other" given the random source and the
+# current drum state code.
+
+def random_strategy(rng, code):
+    """Pick a target at random, like RussianRoulette.get_player_choice(auto=True)."""
+    return rng.choice(TARGETS)
+
+
+def always_self(rng, code):
+    """Always shoot yourself."""
+    return "self"
+
+
+def always_other(rng, code):
+    """Always shoot the opponent."""
+    return "other"
+
+
+def odds_strategy(rng, code):
+    """Shoot yourself only while the next chamber is more likely empty than loaded."""
+    live, fired, position = unpack_state(code)
+    loaded = bin(live).count("1")
+    unknown = CHAMBERS - bin(fired).count("1")
+    return "self" if loaded * 2 < unknown else "other"
+
+
+STRATEGIES = {
+    "random": random_strategy,
+    "self": always_self,
+    "other": always_other,
+    "odds": odds_strategy,
+}
+
+
+def play_game(lives=3, bullets_per_round=1, rng=random, position=START_POSITION, first=0,
+              strategies=None, choice_rng=None, first_state=None):
+    """Play one automatic game with the turn kernel.
+
+    With the default strategies, draws from `rng` in the same order as
+    RussianRoulette.play_auto (sample, randint, choice), so with the same
+    seed both produce the same game.
+
+    Args:
+        lives: Starting lives for each player, or a (player 0, player 1) pair
+        bullets_per_round: Bullets loaded each round (1-6)
+        rng: Random source (default: the random module)
+        position: Active chamber before the first round
+        first: Index of the player who shoots first (0 or 1)
+        strategies: (player 0, player 1) strategy functions (default: random)
+        choice_rng: Random source for strategies (default: rng)
+        first_state: State code to use for the first round instead of
+                     loading and spinning (e.g. for stratified sampling)
+
+    Returns:
+        GameResult with the winner index (or None), counters, remaining
+        lives, final drum state code and the player who shot last
+
+    Raises:
+        ValueError: If a player starts with fewer than 1 life
+    """
+    trigger = TRIGGER
+    sample, randint = rng.sample, rng.randint
+    choice_rng = rng if choice_rng is None else choice_rng
+    if strategies is None:
+        strategies = (random_strategy, random_strategy)
+    chambers = list(range(CHAMBERS))
+    bullets = min(bullets_per_round, CHAMBERS)
+    remaining = list(lives) if isinstance(lives, (list, tuple)) else [lives, lives]
+    if min(remaining) < 1:
+        raise ValueError(f"Players need at least 1 life, got {remaining}")
+    current = first
+    rounds = turns = shots = 0
+    code = pack_state(0, 0, position)
+
+    while True:
+        # Crupier dumps the drum, loads and spins
+        rounds += 1
+        if first_state is not None:
+            code, first_state = first_state, None
+        else:
+            live = 0
+            for chamber in sample(chambers, bullets):
+                live |= 1 << chamber
+            position = ((code >> POSITION_SHIFT) + randint(10, 100)) % CHAMBERS
+            code = live | (position << POSITION_SHIFT)
+
+        while code & FULL_MASK:
+            if remaining[current] <= 0:
+                current ^= 1
+                continue
+            target = current if strategies[current](choice_rng, code) == "self" else current ^ 1
+            result = trigger[code]
+            code = result >> 1
+            turns += 1
+            if result & 1:
+                shots += 1
+                remaining[target] -= 1
+                if remaining[0] <= 0 or remaining[1] <= 0:
+                    alive = [i for i in (0, 1) if remaining[i] > 0]
+                    winner = alive[0] if len(alive) == 1 else None
+                    return GameResult(winner, rounds, turns, shots, remaining, code, current)
+            current ^= 1
@@ -1,5 +1,20 @@
+from collections import deque
+import contextlib
 from datetime import datetime
+import gzip
+import io
+import itertools
+import json
 import os
+import sys
+import tempfile
+import threading
+import time
+import weakref
+
+# Sequence numbers that keep record names of one process unique
+_record_numbers = itertools.count(1)
+
 
 # ANSI color codes
 class Colors:
@@ -14,20 +29,98 @@ class Colors:
 
 
 class Logger:
-    """Logger for Russian Roulette game events."""
+    """Logger for Russian Roulette game events.
+    
+    History changes and snapshots hold a lock, so one logger can be shared
+    by threads (e.g. tables run by tables.run_tables).
+    
+    History entries are (timestamp, level, message) where the timestamp is
+    time.monotonic_ns(). One wall-clock anchor taken when the game's history
+    starts turns them into clock times on output (see datetime_of and
+    format_clock), so logging does no datetime work.
+    
+    With a capacity, history is a ring buffer holding the newest entries;
+    older ones are dropped, or appended to a temporary spill file when
+    `spill` is set, so memory stays constant however long the logger lives.
+    Entry levels are interned strings, so an entry costs its tuple, its
+    timestamp and its message.
+    """
+    
+    __slots__ = ("_lock", "history", "capacity", "spill", "spilled", "dropped",
+                 "_spill_path", "_spill_file", "echo", "record", "store",
+                 "_wall_anchor_ns", "_monotonic_anchor_ns", "_clock", "__weakref__")
+    
+    def __init__(self, echo=True, store=None, capacity=None, spill=False, record=True):
+        """Initialize the logger.
+        
+        Args:
+            echo: Print formatted messages to stdout (default: True).
+                  History is recorded either way.
+            store: Optional HistoryStore used by save_to_store
+            capacity: Entries kept in memory, at least 1 (default: unbounded)
+            spill: Write entries pushed out of the ring buffer to a
+                   temporary file instead of dropping them
+            record: Keep entries in the history (default: True). With
+                    neither echo nor record, logging does nothing
+        
+        Raises:
+            ValueError: If capacity is below 1
+        """
+        if capacity is not None and capacity < 1:
+            raise ValueError(f"Logger capacity must be at least 1, got {capacity}")
+        self._lock = threading.Lock()
+        self.history = [] if capacity is None else deque(maxlen=capacity)
+        self.capacity = capacity
+        self.spill = spill
+        self.spilled = 0
+        self.dropped = 0
+        self._spill_path = None
+        self._spill_file = None
+        self.echo = echo
+        self.record = record
+        self.store = store
+        self._reset_clock()
+    
+    def _reset_clock(self):
+        """Take a new wall-clock anchor for monotonic timestamps."""
+        self._wall_anchor_ns = time.time_ns()
+        self._monotonic_anchor_ns = time.monotonic_ns()
+        # (second, '%H:%M:%S' text) of the last formatted timestamp
+        self._clock = (None, "")
+    
+    def wall_time_ns(self, stamp):
+        """Wall-clock time in ns since the epoch of a history timestamp."""
+        return self._wall_anchor_ns + stamp - self._monotonic_anchor_ns
+    
+    def datetime_of(self, stamp):
+        """Wall-clock datetime of a history timestamp."""
+        return datetime.fromtimestamp(self.wall_time_ns(stamp) / 1e9)
     
-    def __init__(self):
-        self.history = []
+    def format_clock(self, stamp):
+        """'%H:%M:%S' of a history timestamp, formatted at most once per second."""
+        second = self.wall_time_ns(stamp) // 1_000_000_000
+        cached_second, text = self._clock
+        if second != cached_second:
+            text = datetime.fromtimestamp(second).strftime('%H:%M:%S')
+            self._clock = (second, text)
+        return text
     
-    def _get_timestamp(self):
+    def _get_timestamp(self, stamp):
         """Generate formatted timestamp."""
-        return f"{Colors.GRAY}[{datetime.now().strftime('%H:%M:%S')}]{Colors.RESET} "
+        return f"{Colors.GRAY}[{self.format_clock(stamp)}]{Colors.RESET} "
     
     def _log(self, level, color, message):
         """Internal logging method."""
-        formatted = f"{self._get_timestamp()}{color}{level}{Colors.RESET} {message}"
-        self.history.append((datetime.now(), level, message))
-        print(formatted)
+        if not (self.record or self.echo):
+            return
+        stamp = time.monotonic_ns()
+        if self.record:
+            with self._lock:
+                if self.capacity is not None and len(self.history) == self.capacity:
+                    self._evict(self.history[0])
+                self.history.append((stamp, level, message))
+        if self.echo:
+            print(f"{self._get_timestamp(stamp)}{color}{level}{Colors.RESET} {message}")
     
     def info(self, message):
         """Log informational message."""
@@ -51,7 +144,7 @@ class Logger:
     
     def player(self, player_name, message):
         """Log player-specific event."""
-        self._log(f"[{player_name}]", Colors.CYAN + Colors.BOLD, message)
+        self._log(sys.intern(f"[{player_name}]"), Colors.CYAN + Colors.BOLD, message)
     
     def round(self, round_number):
         """Log round start."""
@@ -64,19 +157,70 @@ class Logger:
         else:
             self._log("GAME OVER", Colors.RED + Colors.BOLD, "No survivors!")
     
+    def _evict(self, entry):
+        """Spill or count the oldest entry before the ring buffer overwrites it."""
+        if not self.spill:
+            self.dropped += 1
+            return
+        if self._spill_file is None:
+            fd, self._spill_path = tempfile.mkstemp(prefix="roulette_log_", suffix=".jsonl")
+            self._spill_file = os.fdopen(fd, 'w')
+            weakref.finalize(self, _remove_spill, self._spill_file, self._spill_path)
+        self._spill_file.write(json.dumps(entry) + "\n")
+        self.spilled += 1
+    
+    def iter_history(self):
+        """Iterate over the history, oldest first, without copying it.
+        
+        Spilled entries are read back from the spill file first. Do not log
+        from another thread while iterating; use get_history for a snapshot.
+        """
+        if self._spill_file is not None:
+            self._spill_file.flush()
+            with open(self._spill_path) as f:
+                for line in f:
+                    yield tuple(json.loads(line))
+        yield from self.history
+    
     def get_history(self):
-        """Return log history."""
-        return self.history.copy()
+        """Return a copy of the log history (including spilled entries)."""
+        with self._lock:
+            return list(self.iter_history())
     
     def clear_history(self):
         """Clear log history."""
-        self.history = []
+        with self._lock:
+            self.history.clear()
+            if self._spill_file is not None:
+                self._spill_file.seek(0)
+                self._spill_file.truncate()
+            self.spilled = self.dropped = 0
+            self._reset_clock()
+
+    def format_record(self):
+        """Return the game history formatted as a record file."""
+        lines = [
+            "=" * 50 + "\n",
+            "  PYTHON ROULETTE - GAME RECORD\n",
+            f"  Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n",
+            "=" * 50 + "\n\n",
+        ]
+        
+        with self._lock:
+            for stamp, level, message in self.iter_history():
+                lines.append(f"[{self.format_clock(stamp)}] {level}: {message}\n")
+        
+        lines.append("\n" + "=" * 50 + "\n")
+        return "".join(lines)
 
-    def save_to_file(self, directory="records"):
+    def save_to_file(self, directory="records", writer=None):
         """Save game history to a timestamped file.
         
         Args:
-            directory: Directory to save records (default: 'records')
+            directory: Directory to save records (default: 'records').
+                       Relative paths are resolved from the project root.
+            writer: Optional RecordWriter; the record is queued and written
+                    on its background thread instead of before returning
         
         Returns:
             str: Path to the saved file
@@ -85,29 +229,113 @@ class Logger:
         records_dir = os.path.join(os.path.dirname(__file__), '..', directory)
         os.makedirs(records_dir, exist_ok=True)
         
-        # Generate filename with timestamp
+        # Generate filename with timestamp; games finishing in the same
+        # second (batched writers, worker processes) get distinct names
         timestamp = datetime.now().strftime('%Y-%m-%d_%H:%M:%S')
-        filename = f"game_record_{timestamp}.txt"
+        filename = f"game_record_{timestamp}_{os.getpid()}-{next(_record_numbers):06d}.txt"
         filepath = os.path.join(records_dir, filename)
         
+        if writer is not None:
+            return writer.submit(filepath, self.format_record())
+        
         # Write history to file
         with open(filepath, 'w') as f:
-            f.write("=" * 50 + "\n")
-            f.write("  PYTHON ROULETTE - GAME RECORD\n")
-            f.write(f"  Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write("=" * 50 + "\n\n")
-            
-            for entry in self.history:
-                time, level, message = entry
-                f.write(f"[{time.strftime('%H:%M:%S')}] {level}: {message}\n")
-            
-            f.write("\n" + "=" * 50 + "\n")
+            f.write(self.format_record())
         
         return filepath
 
-    class Tests:
-        """Test logging helpers."""
+    @staticmethod
+    def read_record(game_id, directory="records", archive=None):
+        """Return the text of a saved game record.
+        
+        Looks for the record file (plain or .gz) first, then in the archive.
+        Only the archive block holding the game is decompressed.
+        
+        Args:
+            game_id: Record name without extension, e.g. 'game_record_2025-01-01_12:00:00_4242-000001'
+            directory: Directory of record files (default: 'records')
+            archive: Optional RecordArchive to search
+        
+        Raises:
+            KeyError: If the record cannot be found
+        """
+        records_dir = os.path.join(os.path.dirname(__file__), '..', directory)
+        filepath = os.path.join(records_dir, f"{game_id}.txt")
+        if os.path.exists(filepath):
+            with open(filepath) as f:
+                return f.read()
+        if os.path.exists(filepath + ".gz"):
+            with gzip.open(filepath + ".gz", 'rt') as f:
+                return f.read()
+        if archive is not None and game_id in archive:
+            return archive.read(game_id)
+        raise KeyError(f"Game record not found: {game_id}")
+
+    def save_to_store(self, game, shots=()):
+        """Save the game summary, its shots and the log history to the store.
         
+        Args:
+            game: Game summary dict (see RussianRoulette.summary)
+            shots: Shots as (round, shooter, target, fired)
+        """
+        events = [(self.datetime_of(stamp), level, message)
+                  for stamp, level, message in self.get_history()]
+        self.store.add_game(game, events, shots)
+
+    class Tests:
+        """Test logging helpers.
+
+        In quiet mode (ROULETTE_QUIET_TESTS=1, or Tests.quiet = True) the
+        log_* helpers only keep their arguments. A test's output is
+        formatted and printed if the test fails (see load_tests and
+        conftest.py) and dropped otherwise.
+        """
+
+        quiet = os.environ.get("ROULETTE_QUIET_TESTS", "") not in ("", "0")
+        _captured = []
+
+        @staticmethod
+        def _capture(helper, *args):
+            """Keep a helper call for captured_output (lists are copied)."""
+            Logger.Tests._captured.append(
+                (helper, tuple(list(arg) if isinstance(arg, list) else arg for arg in args)))
+
+        @staticmethod
+        def captured_output():
+            """Format and return the helper output captured since the last discard."""
+            entries = Logger.Tests._captured
+            Logger.Tests._captured = []
+            buffer = io.StringIO()
+            quiet, Logger.Tests.quiet = Logger.Tests.quiet, False
+            try:
+                with contextlib.redirect_stdout(buffer):
+                    for helper, args in entries:
+                        helper(*args)
+            finally:
+                Logger.Tests.quiet = quiet
+            return buffer.getvalue()
+
+        @staticmethod
+        def discard():
+            """Drop captured helper output."""
+            Logger.Tests._captured = []
+
+        @staticmethod
+        def load_tests(loader, tests, pattern):
+            """unittest load_tests hook printing a test's captured output only if it fails.
+
+            Use as `load_tests = Logger.Tests.load_tests` in a test module.
+            """
+            import unittest
+
+            class QuietSuite(unittest.TestSuite):
+                def run(self, result, debug=False):
+                    if Logger.Tests.quiet:
+                        _report_captured_on_failure(result)
+                    return super().run(result, debug)
+
+            return QuietSuite([tests])
+
         @staticmethod
         def format_drum(drum, activeChamberPosition=None):
             """Format drum state with colors: O=live (red), @=fired (gray), ○=empty (green)
@@ -125,28 +353,39 @@ class Logger:
                     result += f"({symbol}) "
                 else:
                     result += f"{symbol} "
-            return result + "]" + f" -> Active chamber: {activeChamberPosition}" if activeChamberPosition is not None else ""
+            active = f" -> Active chamber: {activeChamberPosition}" if activeChamberPosition is not None else ""
+            return result + "]" + active
 
         @staticmethod
         def log_test(msg):
+            if Logger.Tests.quiet:
+                return Logger.Tests._capture(Logger.Tests.log_test, msg)
             print(f"\n{Colors.BOLD}{Colors.CYAN}▶ {msg}{Colors.RESET}")
 
         @staticmethod
         def log_info(label, value):
+            if Logger.Tests.quiet:
+                return Logger.Tests._capture(Logger.Tests.log_info, label, value)
             print(f"  {Colors.YELLOW}{label}:{Colors.RESET} {value}")
 
         @staticmethod
         def log_drum(label, drum, activeChamberPosition=None):
+            if Logger.Tests.quiet:
+                return Logger.Tests._capture(Logger.Tests.log_drum, label, drum, activeChamberPosition)
             print(f"  {Colors.YELLOW}{label}:{Colors.RESET} {Logger.Tests.format_drum(drum, activeChamberPosition)}")
 
         @staticmethod
         def log_result(label, value):
+            if Logger.Tests.quiet:
+                return Logger.Tests._capture(Logger.Tests.log_result, label, value)
             color = Colors.RED if value else Colors.GREEN
             symbol = "BANG!" if value else "*click*"
             print(f"  {Colors.YELLOW}{label}:{Colors.RESET} {color}{symbol}{Colors.RESET}")
 
         @staticmethod
         def log_pass_fail(label, expected, actual):
+            if Logger.Tests.quiet:
+                return Logger.Tests._capture(Logger.Tests.log_pass_fail, label, expected, actual)
             color = Colors.GREEN if expected == actual else Colors.RED
             status = "PASS" if expected == actual else "FAIL"
             print(f"  {Colors.YELLOW}{label}:{Colors.RESET} {color}{status}{Colors.RESET} (expected: {expected}, got: {actual})")
@@ -156,6 +395,39 @@ class Logger:
             """Count live bullets (True) in drum."""
             return sum(1 for c in drum if c is True)
 
+def _report_captured_on_failure(result):
+    """Make a unittest result print captured test output when a test fails or errors."""
+    if getattr(result, "_quiet_hooked", False):
+        return
+    result._quiet_hooked = True
+    start_test, add_failure, add_error = result.startTest, result.addFailure, result.addError
+
+    def startTest(test):
+        Logger.Tests.discard()
+        start_test(test)
+
+    def report(add):
+        def add_with_output(test, err):
+            output = Logger.Tests.captured_output()
+            if output:
+                print(output, end="")
+            add(test, err)
+        return add_with_output
+
+    result.startTest = startTest
+    result.addFailure = report(add_failure)
+    result.addError = report(add_error)
+
+
+def _remove_spill(spill_file, path):
+    """Close and delete a logger's spill file."""
+    spill_file.close()
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
 if __name__ == '__main__':
     # Test the logger
     logger = Logger()
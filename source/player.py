@@ -1,19 +1,42 @@
+import sys
+import threading
+
+from events import LifeLost, RevolverHanded
 from revolver import Revolver
 
 class Player:
+    __slots__ = ("_lock", "name", "lives", "revolverInHand", "events")
+
     def __init__(self, name, lives=3, revolver=None):
-        self.name = name
+        self._lock = threading.Lock()
+        # Names repeat across tables and log entries; keep one copy of each
+        self.name = sys.intern(name)
         self.lives = lives
         self.revolverInHand = revolver if revolver else Revolver()
+        # EventBus the player reports lost lives and hand-offs to (see events.py)
+        self.events = None
 
     def is_alive(self):
         return self.lives > 0
 
     def take_damage(self):
-        self.lives -= 1
+        """Lose a life; lives never go below zero."""
+        with self._lock:
+            if self.lives <= 0:
+                return
+            self.lives -= 1
+            lives = self.lives
+        self._emit_life_lost(lives)
 
     def die(self):
-        self.lives = 0
+        with self._lock:
+            self.lives = 0
+        self._emit_life_lost(0)
+
+    def _emit_life_lost(self, lives):
+        events = self.events
+        if events is not None and LifeLost in events.subscribed:
+            events.publish(LifeLost(self, lives))
 
     def shoot_himself(self):
         if self.revolverInHand.pull_trigger():
@@ -24,5 +47,9 @@ class Player:
             player.take_damage()
 
     def give_revolver_to_crupier(self, crupier):
-        crupier.revolverInHand = self.revolverInHand
-        self.revolverInHand = None
+        with self._lock:
+            revolver = crupier.revolverInHand = self.revolverInHand
+            self.revolverInHand = None
+        events = self.events
+        if events is not None and RevolverHanded in events.subscribed:
+            events.publish(RevolverHanded(revolver, self, crupier))
@@ -0,0 +1,144 @@
+import cProfile
+import json
+import os
+import pstats
+import threading
+import time
+
+# Game phases instrumented by RussianRoulette
+PHASES = ("load", "spin", "take", "aim", "fire", "audio", "render", "persist")
+
+
+class _Span:
+    """Context manager recording one span into a Profiler."""
+
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.record(self.name, self.start, time.perf_counter_ns())
+        return False
+
+
+class Profiler:
+    """Per-phase span recorder backed by a fixed-size ring buffer.
+
+    Spans are stored as (name, start, end) in preallocated lists, so recording
+    never allocates beyond the span itself. When the buffer is full the oldest
+    spans are overwritten.
+    """
+
+    def __init__(self, capacity=4096):
+        """Initialize the profiler.
+
+        Args:
+            capacity: Maximum number of spans kept (default: 4096)
+        """
+        self.capacity = capacity
+        self.names = [None] * capacity
+        self.starts = [0] * capacity
+        self.ends = [0] * capacity
+        self.count = 0
+        self.pid = os.getpid()
+        self.tid = threading.get_ident()
+
+    def span(self, name):
+        """Return a context manager timing the enclosed block as `name`."""
+        return _Span(self, name)
+
+    def record(self, name, start_ns, end_ns):
+        """Record a span measured with time.perf_counter_ns()."""
+        index = self.count % self.capacity
+        self.names[index] = name
+        self.starts[index] = start_ns
+        self.ends[index] = end_ns
+        self.count += 1
+
+    def clear(self):
+        """Drop all recorded spans."""
+        self.count = 0
+
+    def spans(self):
+        """Return recorded spans, oldest first, as (name, start_ns, end_ns)."""
+        if self.count <= self.capacity:
+            order = range(self.count)
+        else:
+            first = self.count % self.capacity
+            order = list(range(first, self.capacity)) + list(range(first))
+        return [(self.names[i], self.starts[i], self.ends[i]) for i in order]
+
+    def summary(self):
+        """Aggregate spans per phase.
+
+        Returns:
+            dict: name -> {"count", "total_ns", "max_ns"}
+        """
+        totals = {}
+        for name, start, end in self.spans():
+            entry = totals.setdefault(name, {"count": 0, "total_ns": 0, "max_ns": 0})
+            entry["count"] += 1
+            entry["total_ns"] += end - start
+            entry["max_ns"] = max(entry["max_ns"], end - start)
+        return totals
+
+    def to_chrome_trace(self):
+        """Build a Chrome trace-event document (load in chrome://tracing or Perfetto)."""
+        events = []
+        for name, start, end in self.spans():
+            events.append({
+                "name": name,
+                "cat": "game",
+                "ph": "X",
+                "ts": start / 1000,
+                "dur": (end - start) / 1000,
+                "pid": self.pid,
+                "tid": self.tid,
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ns"}
+
+    def export_chrome_trace(self, path):
+        """Write recorded spans as Chrome trace-event JSON.
+
+        Returns:
+            str: Path to the written file
+        """
+        with open(path, 'w') as f:
+            json.dump(self.to_chrome_trace(), f)
+        return path
+
+    def print_summary(self):
+        """Print total time spent per phase."""
+        print(f"{'Phase':<14} {'count':>7} {'total ms':>10} {'max ms':>9}")
+        for name, entry in sorted(self.summary().items(), key=lambda item: -item[1]["total_ns"]):
+            print(f"{name:<14} {entry['count']:>7} {entry['total_ns'] / 1e6:>10.3f} "
+                  f"{entry['max_ns'] / 1e6:>9.3f}")
+
+
+def profile_call(func, sort="cumulative", limit=30, output=None, stream=None):
+    """Run func under cProfile and print sorted stats.
+
+    Args:
+        func: Callable to profile
+        sort: pstats sort key (default: 'cumulative')
+        limit: Number of rows to print (default: 30)
+        output: Optional path to dump raw stats for later analysis
+        stream: File the stats are printed to (default: sys.stdout)
+
+    Returns:
+        Whatever func returns
+    """
+    profile = cProfile.Profile()
+    try:
+        return profile.runcall(func)
+    finally:
+        if output:
+            profile.dump_stats(output)
+        pstats.Stats(profile, stream=stream).sort_stats(sort).print_stats(limit)
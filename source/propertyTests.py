@@ -0,0 +1,347 @@
+import contextlib
+import io
+import os
+import random
+import unittest
+from collections import namedtuple
+from game import RussianRoulette
+from logger import Logger
+
+# Aliases for test logging helpers
+log_test = Logger.Tests.log_test
+log_info = Logger.Tests.log_info
+
+# Quiet mode (ROULETTE_QUIET_TESTS=1) prints helper output only for failed tests
+load_tests = Logger.Tests.load_tests
+
+# Random examples per property; raise it for a long run, e.g.
+# PROPERTY_EXAMPLES=20000 python3 -m unittest propertyTests
+EXAMPLES = int(os.environ.get("PROPERTY_EXAMPLES", 1000))
+
+# Longest generated action sequence
+MAX_ACTIONS = 80
+
+# Every action carries its own seed, so a trace replays identically
+# even after the shrinker has removed the actions before it
+Action = namedtuple("Action", ["name", "args", "seed"])
+
+# Table setup of one example
+Config = namedtuple("Config", ["chambers", "revolvers", "lives", "bullets"])
+SIMPLEST_CONFIG = Config(6, 1, 1, 1)
+
+
+# === Property Driver ===
+
+class TableMachine:
+    """One game table driven by arbitrary actions, with invariants checked after each.
+
+    Actions reach the table through the same objects the game uses: the
+    Crupier, the Players, their revolvers and RussianRoulette.play_turn.
+    An action whose precondition does not hold is skipped, so any trace
+    (including a shrunk one) can be replayed.
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self.game = RussianRoulette(lives=config.lives, bullets_per_round=config.bullets,
+                                    animations=False, sound=False, records_directory=None,
+                                    chambers=config.chambers, revolvers=config.revolvers)
+        self.game.logger.echo = False
+        self.players = (self.game.player1, self.game.player2)
+        self.lives = [player.lives for player in self.players]
+
+    # --- actions ---
+
+    def enabled(self, action):
+        """Precondition of an action."""
+        name, args = action.name, action.args
+        crupier_holds = self.game.crupier.revolverInHand is not None
+        if name in ("load", "unload", "unload_fired", "dump", "spin", "rotate", "pull",
+                    "setup_round"):
+            return crupier_holds
+        if name == "hand":
+            return crupier_holds
+        if name in ("give_back", "shoot"):
+            return self.players[args[0]].revolverInHand is not None
+        if name == "turn":
+            return (crupier_holds and not self.game.game_over
+                    and self.game.current_player.is_alive())
+        return name == "switch"
+
+    def step(self, action):
+        """Apply one action."""
+        game, crupier = self.game, self.game.crupier
+        gun = crupier.revolverInHand
+        name, args = action.name, action.args
+        random.seed(action.seed)
+        if name == "load":
+            try:
+                gun.load_bullet(args[0])
+            except (IndexError, ValueError):
+                pass
+        elif name == "unload":
+            if args[0] < gun.chambers:
+                gun.unload_bullet(args[0])
+        elif name == "unload_fired":
+            gun.unload_empty_cartidges()
+        elif name == "dump":
+            crupier.dump_and_load_bullets_randomly(args[0])
+        elif name == "spin":
+            gun.free_spin_drum()
+        elif name == "rotate":
+            gun.rotate_drum_counter_clockwise()
+        elif name == "pull":
+            gun.pull_trigger()
+        elif name == "setup_round":
+            game.setup_round()
+        elif name == "hand":
+            crupier.give_revolver_to_player(self.players[args[0]])
+        elif name == "give_back":
+            self.players[args[0]].give_revolver_to_crupier(crupier)
+        elif name == "shoot":
+            shooter = self.players[args[0]]
+            if args[1]:
+                shooter.shoot_player(self.players[args[0] ^ 1])
+            else:
+                shooter.shoot_himself()
+        elif name == "turn":
+            game.play_turn(auto=True)
+            if not game.check_game_over():
+                game.switch_player()
+        elif name == "switch":
+            game.switch_player()
+
+    # --- invariants ---
+
+    def check(self):
+        """Assert the table invariants."""
+        for gun in self.game.revolvers:
+            drum = gun.drum
+            live, fired, empty = drum.count(True), drum.count(False), drum.count(None)
+            assert live + fired + empty == gun.chambers == len(drum), f"drum {drum}"
+            assert gun._live & gun._fired == 0, "a chamber is both live and fired"
+            assert gun.live_count() == live, "live_count disagrees with the drum"
+            assert 0 <= gun.activeChamberPosition < gun.chambers, "active chamber out of range"
+        holdings = [(party.name, party.revolverInHand)
+                    for party in (self.game.crupier, *self.players)
+                    if party.revolverInHand is not None]
+        assert len(holdings) == 1, f"revolver held by {[name for name, _ in holdings]}"
+        assert holdings[0][1] in self.game.revolvers, "held revolver is not a table revolver"
+        for index, player in enumerate(self.players):
+            assert player.lives >= 0, f"{player.name} has {player.lives} lives"
+            assert player.lives <= self.lives[index], f"{player.name} gained a life"
+            self.lives[index] = player.lives
+
+
+def finish_game(game, budget):
+    """Play a game to the end with play_auto's loop, in at most `budget` turns.
+
+    Returns:
+        int: Turns played, or -1 if the budget ran out
+    """
+    turns = 0
+    while not game.game_over:
+        game.setup_round()
+        while not game.check_drum_empty() and not game.game_over:
+            if not game.current_player.is_alive():
+                game.switch_player()
+                continue
+            game.play_turn(auto=True)
+            turns += 1
+            if turns > budget:
+                return -1
+            if game.check_game_over():
+                break
+            game.switch_player()
+    return turns
+
+
+# Action names with their argument generators
+ACTIONS = {
+    "load": lambda rng, config: (rng.randrange(config.chambers + 2),),
+    "unload": lambda rng, config: (rng.randrange(config.chambers),),
+    "unload_fired": lambda rng, config: (),
+    "dump": lambda rng, config: (rng.randrange(config.chambers + 2),),
+    "spin": lambda rng, config: (),
+    "rotate": lambda rng, config: (),
+    "pull": lambda rng, config: (),
+    "setup_round": lambda rng, config: (),
+    "hand": lambda rng, config: (rng.randrange(2),),
+    "give_back": lambda rng, config: (rng.randrange(2),),
+    "shoot": lambda rng, config: (rng.randrange(2), rng.randrange(2)),
+    "turn": lambda rng, config: (),
+    "switch": lambda rng, config: (),
+}
+
+
+def generate(rng):
+    """A random example: a table setup and an action sequence."""
+    config = Config(chambers=rng.choice((6, 6, rng.randint(1, 12))),
+                    revolvers=rng.choice((1, 1, 2, 3)),
+                    lives=rng.randint(1, 4), bullets=rng.randint(1, 4))
+    names = list(ACTIONS)
+    trace = []
+    for _ in range(rng.randint(1, MAX_ACTIONS)):
+        name = rng.choice(names)
+        trace.append(Action(name, ACTIONS[name](rng, config), rng.getrandbits(32)))
+    return config, trace
+
+
+def run_example(config, trace, machine_type=TableMachine):
+    """Replay a trace; returns (failing step, error) or None if every invariant held."""
+    machine = machine_type(config)
+    # Oversized loads print a warning (Revolver.validate_bullet_count)
+    with contextlib.redirect_stdout(io.StringIO()):
+        for index, action in enumerate(trace):
+            if not machine.enabled(action):
+                continue
+            try:
+                machine.step(action)
+                machine.check()
+            except Exception as error:
+                return index, error
+    return None
+
+
+def _smaller_configs(config):
+    """Simpler table setups to try while shrinking."""
+    for field, simplest in zip(Config._fields, SIMPLEST_CONFIG):
+        value = getattr(config, field)
+        if value != simplest:
+            yield config._replace(**{field: simplest})
+            if value > simplest + 1:
+                yield config._replace(**{field: (value + simplest) // 2})
+
+
+def _smaller_actions(action):
+    """Simpler versions of one action to try while shrinking."""
+    if action.seed:
+        yield action._replace(seed=0)
+    for position, value in enumerate(action.args):
+        for smaller in sorted({0, value // 2}):
+            if smaller < value:
+                args = action.args[:position] + (smaller,) + action.args[position + 1:]
+                yield action._replace(args=args)
+
+
+def shrink(config, trace, machine_type=TableMachine):
+    """Shrink a failing example to a minimal one that still fails.
+
+    Cuts the trace after the failing step, then repeatedly deletes chunks
+    of actions (halving the chunk size down to single actions), simplifies
+    the table setup and lowers action arguments and seeds, keeping every
+    change that still fails.
+
+    Returns:
+        tuple: (config, trace, (failing step, error))
+    """
+    failure = run_example(config, trace, machine_type)
+    trace = trace[:failure[0] + 1]
+    improved = True
+    while improved:
+        improved = False
+        chunk = len(trace) // 2 or 1
+        while chunk:
+            start = 0
+            while start < len(trace):
+                candidate = trace[:start] + trace[start + chunk:]
+                result = run_example(config, candidate, machine_type) if candidate else None
+                if result:
+                    trace, failure, improved = candidate[:result[0] + 1], result, True
+                else:
+                    start += chunk
+            chunk //= 2
+        for candidate in _smaller_configs(config):
+            result = run_example(candidate, trace, machine_type)
+            if result:
+                config, failure, improved = candidate, result, True
+                break
+        for index in range(len(trace)):
+            for action in _smaller_actions(trace[index]):
+                candidate = trace[:index] + [action] + trace[index + 1:]
+                result = run_example(config, candidate, machine_type)
+                if result:
+                    trace, failure, improved = candidate[:result[0] + 1], result, True
+                    break
+    return config, trace, failure
+
+
+def format_example(config, trace, failure):
+    """Readable report of a (shrunk) failing example."""
+    lines = [f"{config}, failed at step {failure[0]}: {failure[1]!r}"]
+    lines += [f"  {index}: {action.name}{action.args} seed={action.seed}"
+              for index, action in enumerate(trace)]
+    return "\n".join(lines)
+
+
+def check_examples(examples, seed, machine_type=TableMachine):
+    """Run random examples; returns the report of the first failure, shrunk, or None."""
+    rng = random.Random(seed)
+    for _ in range(examples):
+        config, trace = generate(rng)
+        if run_example(config, trace, machine_type):
+            return format_example(*shrink(config, trace, machine_type))
+    return None
+
+
+# === Property Tests ===
+
+class TestTableProperties(unittest.TestCase):
+
+    def test_121_table_invariants(self):
+        """Test random action sequences keep every table invariant"""
+        log_test("121 Testing table invariants over random action sequences")
+        state = random.getstate()
+        try:
+            report = check_examples(EXAMPLES, seed=121)
+        finally:
+            random.setstate(state)
+        log_info("Examples", EXAMPLES)
+        if report:
+            self.fail("Invariant broken; minimal example:\n" + report)
+
+    def test_122_games_terminate(self):
+        """Test games on random tables end within the number of turns their lives allow"""
+        log_test("122 Testing game termination")
+        rng = random.Random(122)
+        state = random.getstate()
+        try:
+            for _ in range(EXAMPLES):
+                config, _ = generate(rng)
+                random.seed(rng.getrandbits(32))
+                machine = TableMachine(config)
+                # Every round fires all its bullets and each shot costs a life,
+                # so at most 2 * lives - 1 rounds of chambers * revolvers turns
+                budget = (2 * config.lives - 1) * config.chambers * config.revolvers
+                with contextlib.redirect_stdout(io.StringIO()):
+                    turns = finish_game(machine.game, budget)
+                self.assertNotEqual(turns, -1, f"{config} did not finish in {budget} turns")
+                machine.check()
+                self.assertTrue(machine.game.game_over)
+                self.assertLessEqual(len(machine.game.get_alive_players()), 1)
+        finally:
+            random.setstate(state)
+
+    def test_123_shrinker_finds_minimal_trace(self):
+        """Test a broken invariant is reported with a minimal trace"""
+        log_test("123 Testing the shrinker")
+
+        class NoShots(TableMachine):
+            # Deliberately false property: nobody ever loses a life
+            def check(self):
+                super().check()
+                assert sum(p.lives for p in self.players) == 2 * self.config.lives, "shot fired"
+
+        rng = random.Random(5)
+        config, trace = generate(rng)
+        while not run_example(config, trace, NoShots):
+            config, trace = generate(rng)
+        config, trace, failure = shrink(config, trace, NoShots)
+        log_info("Minimal example", "\n" + format_example(config, trace, failure))
+        self.assertEqual(config, SIMPLEST_CONFIG)
+        self.assertLessEqual(len(trace), 3)
+        self.assertIn(trace[-1].name, ("turn", "shoot"))
+
+
+if __name__ == '__main__':
+    unittest.main()
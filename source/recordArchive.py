@@ -0,0 +1,191 @@
+import glob
+import gzip
+import os
+import zlib
+
+try:
+    import zstandard
+    ZSTD_ENABLED = True
+except ImportError:
+    ZSTD_ENABLED = False
+
+# Records packed into one compressed block
+DEFAULT_BLOCK_SIZE = 256
+
+RECORD_PATTERN = "game_record_*.txt*"
+
+
+def _compressor(codec):
+    """Return (compress, decompress) functions for a codec name."""
+    if codec == "zstd":
+        if not ZSTD_ENABLED:
+            raise RuntimeError("Archive uses zstd but the zstandard package is not installed")
+        return zstandard.ZstdCompressor().compress, zstandard.ZstdDecompressor().decompress
+    if codec == "zlib":
+        return (lambda data: zlib.compress(data, 6)), zlib.decompress
+    raise ValueError(f"Unknown archive codec: {codec}")
+
+
+class RecordArchive:
+    """Compressed archive of game records with per-game random access.
+
+    Records are packed into compressed blocks appended to `<path>`. An
+    append-only text index `<path>.idx` maps each game id to its block and
+    its position inside the decompressed block, so reading one game only
+    decompresses the block that holds it.
+    """
+
+    def __init__(self, path, codec=None):
+        """Open or create an archive.
+
+        Args:
+            path: Archive data file
+            codec: 'zstd' or 'zlib' for a new archive (default: zstd when
+                   available). Existing archives keep their codec.
+        """
+        self.path = path
+        self.index_path = path + ".idx"
+        self.blocks = []   # (offset, compressed length)
+        self.games = {}    # game id -> (block, start, length)
+        self._cached_block = (None, None)
+
+        if os.path.exists(self.index_path):
+            self._load_index()
+        else:
+            self.codec = codec or ("zstd" if ZSTD_ENABLED else "zlib")
+            with open(self.index_path, 'w') as f:
+                f.write(f"codec\t{self.codec}\n")
+        self._compress, self._decompress = _compressor(self.codec)
+
+    def _load_index(self):
+        """Read the index file."""
+        with open(self.index_path) as f:
+            self.codec = f.readline().rstrip("\n").split("\t")[1]
+            for line in f:
+                fields = line.rstrip("\n").split("\t")
+                if fields[0] == "B":
+                    self.blocks.append((int(fields[1]), int(fields[2])))
+                elif fields[0] == "G":
+                    self.games[fields[1]] = (int(fields[2]), int(fields[3]), int(fields[4]))
+
+    def __contains__(self, game_id):
+        return game_id in self.games
+
+    def __len__(self):
+        return len(self.games)
+
+    def game_ids(self):
+        """Archived game ids in archive order."""
+        return list(self.games)
+
+    def add_records(self, records, block_size=DEFAULT_BLOCK_SIZE):
+        """Append records to the archive.
+
+        Args:
+            records: Iterable of (game id, record text)
+            block_size: Records per compressed block
+
+        Returns:
+            int: Number of records added (ids already archived are skipped)
+        """
+        added = 0
+        batch = []
+        batch_ids = set()
+        for game_id, text in records:
+            if game_id in self.games or game_id in batch_ids:
+                continue
+            batch.append((game_id, text))
+            batch_ids.add(game_id)
+            if len(batch) >= block_size:
+                added += self._write_block(batch)
+                batch = []
+                batch_ids = set()
+        if batch:
+            added += self._write_block(batch)
+        return added
+
+    def _write_block(self, batch):
+        """Compress a batch into one block and index it."""
+        entries = []
+        chunks = []
+        position = 0
+        for game_id, text in batch:
+            data = text.encode()
+            entries.append((game_id, position, len(data)))
+            chunks.append(data)
+            position += len(data)
+        block = self._compress(b"".join(chunks))
+
+        with open(self.path, 'ab') as f:
+            offset = f.seek(0, os.SEEK_END)
+            f.write(block)
+        block_number = len(self.blocks)
+        self.blocks.append((offset, len(block)))
+
+        lines = [f"B\t{offset}\t{len(block)}\n"]
+        for game_id, start, length in entries:
+            self.games[game_id] = (block_number, start, length)
+            lines.append(f"G\t{game_id}\t{block_number}\t{start}\t{length}\n")
+        with open(self.index_path, 'a') as f:
+            f.write("".join(lines))
+        return len(batch)
+
+    def _read_block(self, block_number):
+        """Decompress one block (the last one read is cached)."""
+        if self._cached_block[0] == block_number:
+            return self._cached_block[1]
+        offset, length = self.blocks[block_number]
+        with open(self.path, 'rb') as f:
+            f.seek(offset)
+            data = self._decompress(f.read(length))
+        self._cached_block = (block_number, data)
+        return data
+
+    def read(self, game_id):
+        """Return the record text of one game.
+
+        Raises:
+            KeyError: If the game is not in the archive
+        """
+        block_number, start, length = self.games[game_id]
+        return self._read_block(block_number)[start:start + length].decode()
+
+
+def game_id_from_path(path):
+    """Game id of a record file: its name without .txt / .txt.gz."""
+    name = os.path.basename(path)
+    for suffix in (".gz", ".txt"):
+        if name.endswith(suffix):
+            name = name[:-len(suffix)]
+    return name
+
+
+def _read_record_file(path):
+    """Read a plain or gzip-compressed record file."""
+    if path.endswith(".gz"):
+        with gzip.open(path, 'rt') as f:
+            return f.read()
+    with open(path) as f:
+        return f.read()
+
+
+def fold_records(records_dir, archive, remove=False, block_size=DEFAULT_BLOCK_SIZE):
+    """Move game_record_*.txt files from a directory into an archive.
+
+    Args:
+        records_dir: Directory holding record files
+        archive: RecordArchive to append to
+        remove: Delete record files once they are archived
+        block_size: Records per compressed block
+
+    Returns:
+        int: Number of records added
+    """
+    paths = sorted(glob.glob(os.path.join(records_dir, RECORD_PATTERN)))
+    records = ((game_id_from_path(path), _read_record_file(path)) for path in paths)
+    added = archive.add_records(records, block_size=block_size)
+    if remove:
+        for path in paths:
+            if game_id_from_path(path) in archive:
+                os.remove(path)
+    return added
@@ -0,0 +1,140 @@
+import gzip
+import os
+import queue
+import sys
+import threading
+import time
+
+# fsync policies: after every record, once per batch, or leave it to the OS
+FSYNC_POLICIES = ("always", "batch", "never")
+
+
+class RecordWriter:
+    """Write game records to disk on a background thread.
+
+    Records are submitted to a bounded queue; the writer thread takes them in
+    batches, optionally gzip-compresses them and fsyncs according to the
+    policy. When the queue is full, submit() blocks, so a slow disk applies
+    backpressure instead of growing memory without bound.
+    """
+
+    def __init__(self, max_queue=1024, batch_size=64, compress=False, fsync="batch"):
+        """Start the writer thread.
+
+        Args:
+            max_queue: Records queued before submit() blocks (default: 1024)
+            batch_size: Maximum records written per batch (default: 64)
+            compress: Write gzip-compressed records with a .gz suffix (default: False)
+            fsync: 'always', 'batch' or 'never' (default: 'batch')
+        """
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"fsync must be one of {FSYNC_POLICIES}")
+        self.batch_size = batch_size
+        self.compress = compress
+        self.fsync = fsync
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.max_queue_depth = 0
+        self.written = 0
+        self.batches = 0
+        self.bytes_written = 0
+        self.errors = 0
+        self.write_seconds = 0.0
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="record-writer", daemon=True)
+        self._thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def submit(self, path, text):
+        """Queue a record for writing.
+
+        Returns:
+            str: Path the record will be written to
+        """
+        if self._closed:
+            raise RuntimeError("RecordWriter is closed")
+        if self.compress:
+            path += ".gz"
+        self.queue.put((path, text))
+        self.max_queue_depth = max(self.max_queue_depth, self.queue.qsize())
+        return path
+
+    def flush(self):
+        """Block until every submitted record is on disk."""
+        self.queue.join()
+
+    def close(self):
+        """Write remaining records and stop the writer thread."""
+        if self._closed:
+            return
+        self._closed = True
+        self.queue.put(None)
+        self._thread.join()
+
+    def metrics(self):
+        """Return queue depth and throughput counters."""
+        return {
+            "queue_depth": self.queue.qsize(),
+            "max_queue_depth": self.max_queue_depth,
+            "written": self.written,
+            "batches": self.batches,
+            "bytes_written": self.bytes_written,
+            "errors": self.errors,
+            "write_seconds": self.write_seconds,
+        }
+
+    def _run(self):
+        """Writer thread: take batches off the queue until the stop marker."""
+        while True:
+            batch = [self.queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = None in batch
+            self._write_batch([item for item in batch if item is not None])
+            for _ in batch:
+                self.queue.task_done()
+            if stop:
+                return
+
+    def _write_batch(self, batch):
+        """Write one batch of (path, text) records."""
+        if not batch:
+            return
+        start = time.perf_counter()
+        pending_sync = []
+        for path, text in batch:
+            data = text.encode()
+            if self.compress:
+                data = gzip.compress(data)
+            try:
+                with open(path, 'wb') as f:
+                    f.write(data)
+                    f.flush()
+                    if self.fsync == "always":
+                        os.fsync(f.fileno())
+                    elif self.fsync == "batch":
+                        pending_sync.append((path, os.dup(f.fileno())))
+            except OSError as e:
+                self.errors += 1
+                print(f"Warning: Could not write record {path}: {e}", file=sys.stderr)
+                continue
+            self.written += 1
+            self.bytes_written += len(data)
+        for path, fd in pending_sync:
+            try:
+                os.fsync(fd)
+            except OSError as e:
+                self.errors += 1
+                print(f"Warning: Could not sync record {path}: {e}", file=sys.stderr)
+            finally:
+                os.close(fd)
+        self.batches += 1
+        self.write_seconds += time.perf_counter() - start
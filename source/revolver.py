@@ -1,19 +1,82 @@
+import threading
+
+from events import DrumSpun, TriggerPulled
+
+# Largest supported drum (chamber states are bits of one int)
+MAX_CHAMBERS = 64
+
+
 class Revolver:
-    def __init__(self):
-        self.drum = [
-            None, None, 
-            None, None, 
-            None, None
-            ]
-        self.activeChamberPosition = 5
+    """Revolver with a drum of N chambers (six by default, up to 64).
+
+    The drum is stored as two bit masks, live bullets and fired cartridges,
+    so a pull of the trigger costs the same whatever the drum size. The
+    `drum` property gives (and accepts) the list form: None for empty,
+    True for a live bullet, False for a fired cartridge.
+
+    Public methods that change the drum hold the revolver's lock, so one
+    pull of the trigger (rotate, check and mark the chamber) or one reload
+    is a single atomic step when several threads share the revolver. The
+    underscore helpers do the work without locking.
+    
+    With an EventBus in `events`, spins and shots are published as
+    DrumSpun and TriggerPulled events after the lock is released.
+    """
+
+    __slots__ = ("_lock", "chambers", "_live", "_fired", "activeChamberPosition", "events")
+
+    def __init__(self, chambers=6):
+        if not 1 <= chambers <= MAX_CHAMBERS:
+            raise ValueError(f"A revolver has 1 to {MAX_CHAMBERS} chambers")
+        self._lock = threading.Lock()
+        # EventBus the revolver reports spins and shots to (see events.py)
+        self.events = None
+        self.chambers = chambers
+        self._live = 0
+        self._fired = 0
+        self.activeChamberPosition = chambers - 1
+
+    @property
+    def drum(self):
+        """Chamber states as a list (a new list on every access)."""
+        live, fired = self._live, self._fired
+        return [True if live >> chamber & 1 else False if fired >> chamber & 1 else None
+                for chamber in range(self.chambers)]
+
+    @drum.setter
+    def drum(self, states):
+        if len(states) != self.chambers:
+            raise ValueError(f"Drum has {self.chambers} chambers, got {len(states)} states")
+        live = fired = 0
+        for chamber, state in enumerate(states):
+            if state is True:
+                live |= 1 << chamber
+            elif state is False:
+                fired |= 1 << chamber
+        with self._lock:
+            self._live, self._fired = live, fired
+
+    def chamber_state(self, chamber):
+        """State of one chamber: None (empty), True (live) or False (fired)."""
+        bit = 1 << chamber
+        if self._live & bit:
+            return True
+        return False if self._fired & bit else None
+
+    def live_count(self):
+        """Number of live bullets in the drum."""
+        return self._live.bit_count()
+
+    def has_live_rounds(self):
+        """True if any chamber holds a live bullet."""
+        return self._live != 0
 
     def get_empty_chambers(self):
         """Returns a list of empty chambers."""
-        emptyChambers = []
-        for chamber in range(6):
-            if self.drum[chamber] is None:
-                emptyChambers.append(chamber)
-        return emptyChambers
+        occupied = self._live | self._fired
+        if not occupied:
+            return list(range(self.chambers))
+        return [chamber for chamber in range(self.chambers) if not occupied >> chamber & 1]
 
     def validate_bullet_count(self, bulletsToLoad):
         """Validates and adjusts bullet count based on empty chambers.
@@ -31,78 +94,118 @@ class Revolver:
         
         return bulletsToLoad, emptyChambers
 
+    def _load_bullet(self, chamber):
+        if not 0 <= chamber < self.chambers:
+            raise IndexError("Chamber out of range")
+        bit = 1 << chamber
+        if (self._live | self._fired) & bit:
+            raise ValueError("Chamber already has a bullet")
+        self._live |= bit
+
     def load_bullet(self, chamber):
         """Loads a bullet into the specified chamber."""
-        if self.drum[chamber] is not None:
-            raise ValueError("Chamber already has a bullet")
-        self.drum[chamber] = True
+        with self._lock:
+            self._load_bullet(chamber)
 
     def load_bullet_in_given_order(self, chambersToLoad):
         """Loads a bullets in a given order."""
-        for chamber in chambersToLoad:
-            self.load_bullet(chamber)
+        with self._lock:
+            for chamber in chambersToLoad:
+                self._load_bullet(chamber)
 
     def load_bullets_in_order(self, bulletsToLoad):
         """Loads a specified number of bullets into the revolver in order."""
-        bulletsToLoad, emptyChambers = self.validate_bullet_count(bulletsToLoad)
-        
-        for bullet in range(bulletsToLoad):
-            chamber = emptyChambers[bullet]
-            self.load_bullet(chamber)
+        with self._lock:
+            bulletsToLoad, emptyChambers = self.validate_bullet_count(bulletsToLoad)
+            
+            for bullet in range(bulletsToLoad):
+                chamber = emptyChambers[bullet]
+                self._load_bullet(chamber)
         return emptyChambers
 
     def load_bullets_randomly(self, bulletsToLoad):
         """Loads a specified number of bullets into the revolver randomly."""
         import random
         
-        bulletsToLoad, emptyChambers = self.validate_bullet_count(bulletsToLoad)
+        with self._lock:
+            bulletsToLoad, emptyChambers = self.validate_bullet_count(bulletsToLoad)
 
-        # Randomly select positions to load bullets
-        randomEmptyChambersToLoad = random.sample(emptyChambers, bulletsToLoad)
-        for chamber in randomEmptyChambersToLoad:
-            self.load_bullet(chamber)
+            # Randomly select positions to load bullets
+            randomEmptyChambersToLoad = random.sample(emptyChambers, bulletsToLoad)
+            for chamber in randomEmptyChambersToLoad:
+                self._load_bullet(chamber)
+
+    def _unload(self, chamber):
+        mask = ~(1 << chamber)
+        self._live &= mask
+        self._fired &= mask
 
     def unload_bullet(self, chamber):
         """Unloads a bullet from the specified chamber."""
-        self.drum[chamber] = None
+        with self._lock:
+            self._unload(chamber)
 
     def unload_empty_cartidges(self):
         """Unloads all fired bullets from its chambers."""
-        for chamber in range(6):
-            if self.drum[chamber] is False:
-                self.unload_bullet(chamber)
+        with self._lock:
+            self._fired = 0
 
     def unload_bullets_in_given_order(self, chambersToUnload):
         """Unloads bullets from a given order."""
-        for chamber in chambersToUnload:
-            self.unload_bullet(chamber)
+        with self._lock:
+            for chamber in chambersToUnload:
+                self._unload(chamber)
 
     def unload_drum(self):
         """Dumps all chambers, resetting the revolver."""
-        self.drum = [None, None, None, None, None, None]
+        with self._lock:
+            self._live = self._fired = 0
+
+    def reset(self):
+        """Empty the drum and return it to its starting position."""
+        with self._lock:
+            self._live = self._fired = 0
+            self.activeChamberPosition = self.chambers - 1
 
     def speed_reload(self):
         """Dumps current drum and loads all chambers with a bullet."""
-        self.unload_drum()
-        self.drum = [True, True, True, True, True, True]
+        with self._lock:
+            self._live = (1 << self.chambers) - 1
+            self._fired = 0
 
-    def rotate_drum_counter_clockwise(self):
+    def _rotate(self):
         self.activeChamberPosition += 1
-        if self.activeChamberPosition == 6:
+        if self.activeChamberPosition == self.chambers:
             self.activeChamberPosition = 0
 
+    def rotate_drum_counter_clockwise(self):
+        with self._lock:
+            self._rotate()
+
     def free_spin_drum(self):
         import random
         stepsToSpin = random.randint(10, 100)
-        for step in range(stepsToSpin):
-            self.rotate_drum_counter_clockwise()
+        with self._lock:
+            self.activeChamberPosition = (self.activeChamberPosition + stepsToSpin) % self.chambers
+        events = self.events
+        if events is not None and DrumSpun in events.subscribed:
+            events.publish(DrumSpun(self, stepsToSpin))
         return stepsToSpin
 
     def pull_trigger(self):
         """Pulls the trigger and returns True if the chamber is loaded, False otherwise."""
-        self.rotate_drum_counter_clockwise()
-        isChamberLoaded = self.drum[self.activeChamberPosition]
-        if isChamberLoaded:
-            self.drum[self.activeChamberPosition] = False
-        return isChamberLoaded
+        with self._lock:
+            self._rotate()
+            chamber = self.activeChamberPosition
+            bit = 1 << chamber
+            if self._live & bit:
+                self._live ^= bit
+                self._fired |= bit
+                result = True
+            else:
+                result = False if self._fired & bit else None
+        events = self.events
+        if events is not None and TriggerPulled in events.subscribed:
+            events.publish(TriggerPulled(self, chamber, result))
+        return result
 
@@ -0,0 +1,276 @@
+import contextlib
+import json
+import multiprocessing
+import random
+import struct
+import sys
+from multiprocessing import shared_memory
+
+from game import RussianRoulette
+import kernel
+
+# Games handed to a worker at a time when running in parallel
+CHUNK_SIZE = 64
+
+# Games filled by one worker task when writing to shared memory
+SHARED_CHUNK_SIZE = 4096
+
+# One game in a shared result buffer: seed, rounds, turns, shots, winner
+# (0 or 1 for player 1 or 2, -1 for none), padded to 8-byte alignment
+RESULT_RECORD = struct.Struct("<qIIIbxxx")
+
+
+def run_game(seed, lives=3, bullets_per_round=1, player1_name="Player 1",
+             player2_name="Player 2", quiet=True, records_directory=None,
+             shot_log=False, record_writer=None, chambers=6, revolvers=1):
+    """Play one automatic game with a fixed seed.
+
+    Args:
+        seed: Seed for the random module; the same seed replays the same game
+        lives: Starting lives for each player
+        bullets_per_round: Bullets loaded each round
+        player1_name: Name of first player
+        player2_name: Name of second player
+        quiet: If True, game logs are not printed. Otherwise they go to stderr
+        records_directory: Save the game record here (default: no record)
+        shot_log: Include every shot as (round, shooter, target, fired)
+                  under "shot_log", e.g. for a HistoryStore
+        record_writer: Optional RecordWriter for the record (same process only)
+        chambers: Chambers per revolver
+        revolvers: Revolvers on the table
+
+    Returns:
+        dict: Result of the game
+    """
+    random.seed(seed)
+    game = RussianRoulette(player1_name, player2_name, lives=lives,
+                           bullets_per_round=bullets_per_round,
+                           animations=False, sound=False,
+                           records_directory=records_directory,
+                           record_writer=record_writer, chambers=chambers,
+                           revolvers=revolvers)
+    game.logger.echo = not quiet
+    # Other tables would fall back to play_auto, whose warnings belong on stderr
+    if not game.has_observers() and not shot_log and game.kernel_table():
+        game.play_headless()
+    else:
+        with contextlib.redirect_stdout(sys.stderr):
+            game.play_auto()
+    result = {"seed": seed, **game.summary()}
+    if shot_log:
+        result["shot_log"] = game.shots
+    return result
+
+
+def _run_game_args(args):
+    """Unpack a (seed, kwargs) pair for Pool.imap."""
+    seed, kwargs = args
+    return run_game(seed, **kwargs)
+
+
+def iter_games(games, seed, workers=1, **kwargs):
+    """Play a batch of games and yield their results in order.
+
+    Game i uses seed + i, so any single game can be replayed later.
+
+    Args:
+        games: Number of games to play
+        seed: Base seed
+        workers: Number of worker processes (1 runs in this process)
+        **kwargs: Passed to run_game
+
+    Yields:
+        dict: Result of each game, with its index under "game"
+    """
+    jobs = ((seed + i, kwargs) for i in range(games))
+    if workers <= 1:
+        results = map(_run_game_args, jobs)
+        for index, result in enumerate(results):
+            yield {"game": index, **result}
+        return
+
+    with multiprocessing.Pool(workers) as pool:
+        results = pool.imap(_run_game_args, jobs, chunksize=CHUNK_SIZE)
+        for index, result in enumerate(results):
+            yield {"game": index, **result}
+
+
+def write_json_lines(results, stream):
+    """Write results to a stream as JSON lines, flushing after each one.
+
+    Returns:
+        int: Number of results written
+    """
+    count = 0
+    for result in results:
+        stream.write(json.dumps(result) + "\n")
+        stream.flush()
+        count += 1
+    return count
+
+
+def store_results(results, store):
+    """Save results to a HistoryStore as they pass through.
+
+    The "shot_log" of each result is stored and removed from the result.
+    """
+    for result in results:
+        store.add_game(result, shots=result.pop("shot_log", ()))
+        yield result
+
+
+def read_json_line(path, game):
+    """Return the result for a given game index from a JSON lines file."""
+    with open(path) as f:
+        for line in f:
+            result = json.loads(line)
+            if result.get("game") == game:
+                return result
+    raise ValueError(f"Game {game} not found in {path}")
+
+
+class SharedResults:
+    """Per-game results in a shared memory block, one fixed-size record per game.
+
+    The coordinator allocates the block; worker processes attach to it by
+    name and pack their results in place, so nothing is pickled back and
+    the parent reads the records without copying them.
+    """
+
+    def __init__(self, games, name=None):
+        """Create a buffer for `games` results, or attach to an existing one by name."""
+        self.games = games
+        size = max(games * RESULT_RECORD.size, 1)
+        if name is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=size)
+            self._owner = True
+        else:
+            self.shm = _attach(name)
+            self._owner = False
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def __len__(self):
+        return self.games
+
+    def write(self, index, seed, winner, rounds, turns, shots):
+        """Store the result of game `index`."""
+        RESULT_RECORD.pack_into(self.shm.buf, index * RESULT_RECORD.size,
+                                seed, rounds, turns, shots, -1 if winner is None else winner)
+
+    def __getitem__(self, index):
+        """(seed, rounds, turns, shots, winner) of one game."""
+        if not 0 <= index < self.games:
+            raise IndexError(index)
+        return RESULT_RECORD.unpack_from(self.shm.buf, index * RESULT_RECORD.size)
+
+    def __iter__(self):
+        """Iterate over (seed, rounds, turns, shots, winner) records in game order."""
+        view = self.shm.buf[:self.games * RESULT_RECORD.size]
+        try:
+            yield from RESULT_RECORD.iter_unpack(view)
+        finally:
+            view.release()
+
+    def aggregate(self):
+        """Summarize all games: wins per player, draws and mean counters."""
+        wins = [0, 0]
+        draws = rounds = turns = shots = 0
+        for _, game_rounds, game_turns, game_shots, winner in self:
+            if winner < 0:
+                draws += 1
+            else:
+                wins[winner] += 1
+            rounds += game_rounds
+            turns += game_turns
+            shots += game_shots
+        games = max(self.games, 1)
+        return {
+            "games": self.games,
+            "wins": wins,
+            "draws": draws,
+            "mean_rounds": rounds / games,
+            "mean_turns": turns / games,
+            "mean_shots": shots / games,
+        }
+
+    def close(self):
+        """Detach from the block; the creating process also frees it."""
+        self.shm.close()
+        if self._owner:
+            self.shm.unlink()
+            self._owner = False
+
+
+def _attach(name):
+    """Attach to a shared memory block owned by another process.
+
+    Pool workers share the coordinator's resource tracker, so only the
+    owner's unlink unregisters the block. Python 3.13+ can skip tracking
+    in the worker altogether.
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
+
+
+def _fill_shared(args):
+    """Play games [start, stop) with the turn kernel and pack them into the buffer.
+
+    Uses the same seeds and random draws as run_game with a quiet game, so
+    results match iter_games.
+    """
+    name, games, start, stop, seed, lives, bullets_per_round = args
+    results = SharedResults(games, name=name)
+    try:
+        for index in range(start, stop):
+            random.seed(seed + index)
+            result = kernel.play_game(lives, bullets_per_round)
+            results.write(index, seed + index, result.winner, result.rounds,
+                          result.turns, result.shots)
+    finally:
+        results.close()
+    return stop - start
+
+
+def run_shared(games, seed, workers=1, lives=3, bullets_per_round=1):
+    """Play quiet games in worker processes that write into shared memory.
+
+    Game i uses seed + i, as in iter_games.
+
+    Args:
+        games: Number of games to play
+        seed: Base seed
+        workers: Number of worker processes (1 runs in this process)
+        lives: Starting lives for each player
+        bullets_per_round: Bullets loaded each round
+
+    Returns:
+        SharedResults: Filled buffer; close it when done
+    """
+    results = SharedResults(games)
+    tasks = [(results.name, games, start, min(start + SHARED_CHUNK_SIZE, games),
+              seed, lives, bullets_per_round)
+             for start in range(0, games, SHARED_CHUNK_SIZE)]
+    try:
+        if workers <= 1:
+            for task in tasks:
+                _fill_shared(task)
+        else:
+            with multiprocessing.Pool(workers) as pool:
+                for _ in pool.imap_unordered(_fill_shared, tasks):
+                    pass
+    except BaseException:
+        results.close()
+        raise
+    return results
@@ -1,16 +1,57 @@
 import os
+import sys
 import time
 
-try:
-    import pygame
-    pygame.mixer.init()
+
+class StubMixer:
+    """Stand-in for pygame.mixer that records what would be played.
+
+    Selected with ROULETTE_STUB_MIXER=1 (the test runner's default), so
+    sound code runs without importing pygame or opening an audio device.
+    """
+
+    class error(Exception):
+        pass
+
+    def __init__(self):
+        self.played = []
+
+    def Sound(self, path):
+        return _StubSound(self, path)
+
+
+class _StubSound:
+    def __init__(self, mixer, path):
+        self.mixer = mixer
+        self.path = path
+
+    def play(self):
+        self.mixer.played.append(os.path.basename(self.path))
+
+    def get_length(self):
+        return 0.0
+
+
+# Mixer the sounds play through, and the error it raises
+mixer = None
+_mixer_error = Exception
+
+if os.environ.get("ROULETTE_STUB_MIXER", "") not in ("", "0"):
+    mixer = StubMixer()
+    _mixer_error = StubMixer.error
     SOUND_ENABLED = True
-except ImportError:
-    SOUND_ENABLED = False
-    print("Warning: pygame not installed. Sound effects disabled.")
-except Exception as e:
-    SOUND_ENABLED = False
-    print(f"Warning: pygame audio init failed. Sound effects disabled. ({e})")
+else:
+    try:
+        import pygame
+        pygame.mixer.init()
+        mixer, _mixer_error = pygame.mixer, pygame.error
+        SOUND_ENABLED = True
+    except ImportError:
+        SOUND_ENABLED = False
+        print("Warning: pygame not installed. Sound effects disabled.", file=sys.stderr)
+    except Exception as e:
+        SOUND_ENABLED = False
+        print(f"Warning: pygame audio init failed. Sound effects disabled. ({e})", file=sys.stderr)
 
 # Path to sound effects directory
 SFX_DIR = os.path.join(os.path.dirname(__file__), '..', 'sfx')
@@ -37,11 +78,11 @@ def _play(filename, block=True):
         return
     
     try:
-        sound = pygame.mixer.Sound(path)
+        sound = mixer.Sound(path)
         sound.play()
         if block:
             time.sleep(sound.get_length())
-    except pygame.error as e:
+    except _mixer_error as e:
         print(f"Warning: Could not play sound: {e}")
 
 
@@ -0,0 +1,187 @@
+import hashlib
+import inspect
+import itertools
+import json
+import multiprocessing
+import os
+
+import estimator
+import kernel
+
+# Default cache directory, relative to the project root
+DEFAULT_CACHE_DIR = ".sweep_cache"
+
+# Bump when the layout of cached results changes
+CACHE_FORMAT = 1
+
+def module_source(module, exclude=()):
+    """Source of a module's functions and classes plus the repr of its constants.
+
+    Names in `exclude` are left out, as are imported modules and functions
+    or classes defined elsewhere.
+    """
+    parts = []
+    for name, value in sorted(vars(module).items()):
+        if name.startswith("__") or name in exclude or inspect.ismodule(value):
+            continue
+        if inspect.isfunction(value) or inspect.isclass(value):
+            if value.__module__ != module.__name__:
+                continue
+            try:
+                parts.append(inspect.getsource(value))
+            except (OSError, TypeError):
+                # e.g. namedtuple classes, which have no source of their own
+                parts.append(f"{name}{getattr(value, '_fields', '')}")
+        else:
+            parts.append(f"{name} = {value!r}")
+    return "\n".join(parts)
+
+
+def core_source():
+    """Source of the code that decides every cell's result.
+
+    That is kernel (its functions, constants and tables such as TRIGGER)
+    and the estimator. Strategies and the STRATEGIES table are left out;
+    they are versioned one by one (see strategy_version).
+    """
+    strategies = {"STRATEGIES", *(function.__name__ for function in kernel.STRATEGIES.values())}
+    return module_source(kernel, strategies) + "\n" + module_source(estimator)
+
+
+def code_version():
+    """Hash of the code shared by every cell: the kernel core and the estimator.
+
+    Changing either invalidates every cached cell; adding or editing a
+    strategy does not (see strategy_version).
+    """
+    digest = hashlib.sha256(str(CACHE_FORMAT).encode())
+    digest.update(core_source().encode())
+    return digest.hexdigest()[:16]
+
+
+def strategy_version(name):
+    """Hash of one strategy's source; changing it invalidates only its cells."""
+    function = kernel.STRATEGIES[name]
+    try:
+        source = inspect.getsource(function)
+    except (OSError, TypeError):
+        source = f"{function.__module__}.{function.__qualname__}"
+    return hashlib.sha256(source.encode()).hexdigest()[:16]
+
+
+def cell_version(cell, core):
+    """Code version of one cell: the shared core plus its strategies."""
+    return "-".join([core] + [strategy_version(name) for name in sorted(set(cell["strategies"]))])
+
+
+def parse_values(text):
+    """Parse '1-10', '1,3,5' or a mix such as '1-3,6' into a list of ints."""
+    values = []
+    for part in text.split(","):
+        if "-" in part:
+            low, high = part.split("-")
+            values.extend(range(int(low), int(high) + 1))
+        else:
+            values.append(int(part))
+    return values
+
+
+def build_grid(lives, bullets, strategies):
+    """Every combination of lives, bullets per round and ordered strategy pair.
+
+    Args:
+        lives: Starting lives values
+        bullets: Bullets per round values
+        strategies: Strategy names; every ordered pair is a cell
+
+    Returns:
+        list: Cells as dicts with lives, bullets and strategies
+    """
+    pairs = list(itertools.product(strategies, repeat=2))
+    return [{"lives": l, "bullets": b, "strategies": list(pair)}
+            for l in lives for b in bullets for pair in pairs]
+
+
+def cell_key(cell, options, version):
+    """Cache key of a cell: hash of its parameters, estimate options and code version."""
+    document = json.dumps({"cell": cell, "options": options, "version": version}, sort_keys=True)
+    return hashlib.sha256(document.encode()).hexdigest()
+
+
+class SweepCache:
+    """Cell results stored as one JSON file per cache key."""
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".json")
+
+    def get(self, key):
+        """Cached result for a key, or None."""
+        try:
+            with open(self._path(key)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def put(self, key, result):
+        """Store a result; the file is replaced atomically."""
+        path = self._path(key)
+        with open(path + ".tmp", 'w') as f:
+            json.dump(result, f)
+        os.replace(path + ".tmp", path)
+
+
+def _run_cell(args):
+    """Estimate one cell (runs in a worker process)."""
+    cell, options = args
+    result = estimator.estimate_win_probability(
+        cell["lives"], cell["bullets"], cell["strategies"], **options)
+    return result._asdict()
+
+
+def run_sweep(cells, workers=1, cache=None, target_width=0.01, confidence=0.95, seed=1,
+              max_games=estimator.DEFAULT_MAX_GAMES):
+    """Estimate player 1's win probability for every cell of a grid.
+
+    Cells found in the cache are not recomputed; the others are spread over
+    a process pool and cached as they finish.
+
+    Args:
+        cells: Cells from build_grid
+        workers: Number of worker processes (1 runs in this process)
+        cache: Optional SweepCache
+        target_width, confidence, seed, max_games: Passed to the estimator
+
+    Returns:
+        list: One dict per cell, in grid order: the cell, its Estimate
+              fields and whether it came from the cache under "cached"
+    """
+    options = {"target_width": target_width, "confidence": confidence,
+               "seed": seed, "max_games": max_games}
+    core = code_version()
+    keys = [cell_key(cell, options, cell_version(cell, core)) for cell in cells]
+    results = [cache.get(key) if cache else None for key in keys]
+    pending = [i for i, result in enumerate(results) if result is None]
+    cached = [result is not None for result in results]
+
+    jobs = [(cells[i], options) for i in pending]
+    if workers <= 1 or len(jobs) <= 1:
+        computed = map(_run_cell, jobs)
+        _collect(computed, pending, keys, results, cache)
+    else:
+        with multiprocessing.Pool(workers) as pool:
+            _collect(pool.imap(_run_cell, jobs), pending, keys, results, cache)
+
+    return [{**cell, **result, "cached": hit}
+            for cell, result, hit in zip(cells, results, cached)]
+
+
+def _collect(computed, pending, keys, results, cache):
+    """Store computed results in grid order and in the cache."""
+    for index, result in zip(pending, computed):
+        results[index] = result
+        if cache:
+            cache.put(keys[index], result)
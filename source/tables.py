@@ -0,0 +1,140 @@
+import concurrent.futures
+import contextlib
+import sys
+import threading
+import time
+
+from game import RussianRoulette
+
+# Log entries (and shots) a pooled game keeps in memory; older entries are
+# spilled to disk, so a long match cannot grow a recycled game without bound
+TABLE_LOG_CAPACITY = 1024
+
+
+def free_threaded():
+    """True when running on a free-threaded (no GIL) Python build."""
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return is_gil_enabled is not None and not is_gil_enabled()
+
+
+class TablePool:
+    """Idle automatic games of one table type, recycled between matches.
+
+    acquire() hands out a reset game (a new one only when the pool is
+    empty) and release() takes it back, so a server with high match churn
+    reuses revolvers, players and logger buffers instead of allocating them
+    for every match. The pool holds its lock while taking or returning a
+    game, so threads can share it.
+    """
+
+    def __init__(self, capacity=64, **settings):
+        """Initialize the pool.
+
+        Args:
+            capacity: Idle games kept; games released to a full pool are dropped
+            **settings: RussianRoulette arguments of the table type (lives,
+                        bullets_per_round, chambers, ...). Animations, sound
+                        and records are off and log_capacity is
+                        TABLE_LOG_CAPACITY unless given
+        """
+        self.capacity = capacity
+        self.settings = {"animations": False, "sound": False, "records_directory": None,
+                         "log_capacity": TABLE_LOG_CAPACITY, **settings}
+        self.created = 0
+        self.reused = 0
+        self._idle = []
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._idle)
+
+    def acquire(self, player1_name="Player 1", player2_name="Player 2"):
+        """A game ready for a new match between two players."""
+        with self._lock:
+            game = self._idle.pop() if self._idle else None
+            if game is None:
+                self.created += 1
+            else:
+                self.reused += 1
+        if game is None:
+            game = RussianRoulette(player1_name, player2_name, **self.settings)
+            game.logger.echo = False
+            return game
+        return game.reset(player1_name, player2_name)
+
+    def release(self, game):
+        """Return a finished game to the pool."""
+        with self._lock:
+            if len(self._idle) < self.capacity:
+                self._idle.append(game)
+
+    @contextlib.contextmanager
+    def table(self, player1_name="Player 1", player2_name="Player 2"):
+        """Context manager acquiring a game and releasing it afterwards."""
+        game = self.acquire(player1_name, player2_name)
+        try:
+            yield game
+        finally:
+            self.release(game)
+
+
+def play_table(table, games, lives=3, bullets_per_round=1,
+               player1_name="Player 1", player2_name="Player 2", chambers=6, revolvers=1,
+               pool=None):
+    """Play automatic games one after another at one table.
+
+    Games come from a TablePool (by default one per table), so a table
+    recycles its game between matches and tables share no game objects.
+    The random module is shared by all threads: games are random but not
+    reproducible from a seed here (use simulation for that).
+
+    Args:
+        pool: Optional TablePool to draw games from, e.g. one shared by
+              all tables (its settings replace the table arguments)
+
+    Returns:
+        list: Game summaries, each with the table number under "table"
+    """
+    if pool is None:
+        pool = TablePool(1, lives=lives, bullets_per_round=bullets_per_round,
+                         chambers=chambers, revolvers=revolvers)
+    results = []
+    for _ in range(games):
+        with pool.table(player1_name, player2_name) as game:
+            game.play_auto()
+            results.append({"table": table, **game.summary()})
+    return results
+
+
+def run_tables(tables, games_per_table, workers=None, **kwargs):
+    """Host several tables in threads of this process.
+
+    On a free-threaded build (Python 3.13t) the tables run in parallel;
+    with the GIL they take turns.
+
+    Args:
+        tables: Number of tables
+        games_per_table: Games played at each table
+        workers: Thread pool size (default: one thread per table)
+        **kwargs: Passed to play_table
+
+    Returns:
+        list: Game summaries of all tables, ordered by table
+    """
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers or tables,
+                                               thread_name_prefix="table") as pool:
+        futures = [pool.submit(play_table, table, games_per_table, **kwargs)
+                   for table in range(tables)]
+        return [result for future in futures for result in future.result()]
+
+
+def timed_run_tables(tables, games_per_table, workers=None, **kwargs):
+    """run_tables plus throughput.
+
+    Returns:
+        tuple: (results, elapsed seconds, games per second)
+    """
+    start = time.perf_counter()
+    results = run_tables(tables, games_per_table, workers=workers, **kwargs)
+    elapsed = time.perf_counter() - start
+    return results, elapsed, len(results) / elapsed if elapsed else 0.0
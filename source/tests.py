@@ -1,11 +1,40 @@
 import unittest
 import os
+import tempfile
+import json
+import random
+import socket
+import gzip
+import sys
+import threading
+import io
+import contextlib
+import datetime
+import time
+from fractions import Fraction
+from unittest import mock
 import revolver
 import graphics
 import soundEffects
+import benchmarks
+from profiler import Profiler
+from game import RussianRoulette
+import game
+import simulation
+from broadcast import Broadcaster, _Subscriber
+from historyStore import HistoryStore
+from recordWriter import RecordWriter
+from recordArchive import RecordArchive, fold_records
+import kernel
+import estimator
+import sweep
+import enumerator
+import tables
+import events
 from player import Player
 from crupier import Crupier
 from logger import Logger
+import logger as logger_module
 
 # Aliases for test logging helpers
 log_test = Logger.Tests.log_test
@@ -15,6 +44,9 @@ log_result = Logger.Tests.log_result
 log_pass_fail = Logger.Tests.log_pass_fail
 count_bullets = Logger.Tests.count_bullets
 
+# Quiet mode (ROULETTE_QUIET_TESTS=1) prints helper output only for failed tests
+load_tests = Logger.Tests.load_tests
+
 
 # === Revolver Tests ===
 
@@ -253,6 +285,61 @@ class TestGraphics(unittest.TestCase):
         self.assertTrue(True)
 
 
+    # === Frame Generator Tests ===
+
+    def test_70_render_drum_returns_string(self):
+        """Test render_drum returns the drum art without printing"""
+        log_test("70 Testing render_drum")
+        text = graphics.render_drum([True, None, None, None, None, False])
+        log_info("Lines", len(text.splitlines()))
+        self.assertIn(" /    [@]    \\", text)
+        self.assertIn(" | [ ]   [O] |", text)
+
+    def test_71_fire_frames_return_result(self):
+        """Test fire_revolver_frames yields frames and returns the shot result"""
+        log_test("71 Testing fire_revolver_frames with collect_frames")
+        gun = revolver.Revolver()
+        gun.load_bullet(0)
+        fired = gun.pull_trigger()
+        frames, result = graphics.collect_frames(
+            graphics.fire_revolver_frames(gun, fired, delay=0.1))
+        log_info("Frames", len(frames))
+        log_drum("Drum after", gun.drum, gun.activeChamberPosition)
+        self.assertEqual(len(frames), 4)
+        self.assertTrue(result)
+        self.assertTrue(frames[-1].text.startswith("BANG!"))
+        self.assertAlmostEqual(sum(frame.duration for frame in frames), 1.3)
+        # The bullet shows live until the reveal, first next to fire, then under the hammer
+        self.assertIn(" | [ ]   [O] |", frames[0].text)
+        self.assertIn(" /    [O]    \\", frames[1].text)
+        self.assertIn(" /    [@]    \\", frames[-1].text)
+        self.assertIs(gun.drum[0], False)
+
+    def test_72_spin_frames_count(self):
+        """Test spin_drum_frames yields one frame per step plus pause and final frame"""
+        log_test("72 Testing spin_drum_frames")
+        gun = revolver.Revolver()
+        gun.load_bullet(0)
+        before = graphics.render_drum(graphics.DrumView(gun))
+        gun.activeChamberPosition = (gun.activeChamberPosition + 13) % 6
+        frames, _ = graphics.collect_frames(graphics.spin_drum_frames(gun, 13))
+        log_info("Frames", len(frames))
+        self.assertEqual(len(frames), 15)
+        self.assertIsNone(frames[0].text)
+        # From the drum before the spin to the revolver's real position
+        self.assertEqual(frames[1].text, before)
+        self.assertEqual(frames[-1].text, graphics.render_drum(graphics.DrumView(gun)))
+        self.assertEqual(gun.drum, [True, None, None, None, None, None])
+
+    def test_73_frame_encode(self):
+        """Test Frame.encode returns bytes with clear-screen prefix"""
+        log_test("73 Testing Frame.encode")
+        frame = graphics.Frame("BANG!\n", 0.1)
+        log_info("Bytes", frame.encode())
+        self.assertEqual(frame.encode(), (graphics.CLEAR_SEQUENCE + "BANG!\n").encode())
+        self.assertEqual(graphics.Frame(None, 0.3).encode(), b"")
+
+
 # === Sound Effects Tests ===
 
 class TestSoundEffects(unittest.TestCase):
@@ -609,6 +696,1426 @@ class TestLogger(unittest.TestCase):
         log_info("History after", len(self.logger.history))
         self.assertEqual(len(self.logger.history), 0)
 
+    def test_60_logger_echo_disabled(self):
+        """Test echo=False still records history"""
+        log_test("60 Testing Logger with echo disabled")
+        logger = Logger(echo=False)
+        logger.info("Silent message")
+        log_info("History length", len(logger.history))
+        self.assertEqual(len(logger.history), 1)
+        self.assertEqual(logger.history[0][2], "Silent message")
+
+
+# === Benchmark Tests ===
+
+class TestBenchmarks(unittest.TestCase):
+
+    def test_61_run_all_results(self):
+        """Test run_all returns timings for the requested benchmarks"""
+        log_test("61 Testing benchmarks.run_all")
+        document = benchmarks.run_all(["revolver.pull_trigger"], repeat=1)
+        result = document["results"]["revolver.pull_trigger"]
+        log_info("Median", f"{result['median_ns']:.0f} ns")
+        self.assertEqual(list(document["results"]), ["revolver.pull_trigger"])
+        self.assertGreater(result["median_ns"], 0)
+
+    def test_62_compare_flags_regressions(self):
+        """Test compare flags benchmarks slower than the threshold"""
+        log_test("62 Testing benchmarks.compare")
+        baseline = {"results": {"fast": {"median_ns": 100.0}, "slow": {"median_ns": 100.0}}}
+        current = {"results": {"fast": {"median_ns": 105.0}, "slow": {"median_ns": 150.0},
+                               "new": {"median_ns": 10.0}}}
+        rows = benchmarks.compare(current, baseline, threshold=0.10)
+        regressed = [row[0] for row in rows if row[4]]
+        log_info("Regressed", regressed)
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(regressed, ["slow"])
+
+    def test_143_filter_without_matches(self):
+        """Test a -k filter matching nothing runs nothing and fails"""
+        log_test("143 Testing benchmarks -k with no match")
+        self.assertEqual(benchmarks.run_all([], repeat=1)["results"], {})
+        with tempfile.TemporaryDirectory() as tmp, \
+                contextlib.redirect_stderr(io.StringIO()) as errors:
+            output = os.path.join(tmp, "results.json")
+            status = benchmarks.main(["-k", "no-such-benchmark", "-o", output])
+            self.assertFalse(os.path.exists(output))
+        log_info("Message", errors.getvalue().strip())
+        self.assertNotEqual(status, 0)
+        self.assertIn("No benchmarks match", errors.getvalue())
+
+    def test_149_benchmarks_measure_intended_paths(self):
+        """Test the pull_trigger benchmark always fires and logging=off keeps no history or records"""
+        log_test("149 Testing pull_trigger and logging=off benchmarks")
+        results = []
+
+        class RecordingRevolver(revolver.Revolver):
+            __slots__ = ()
+
+            def pull_trigger(self):
+                results.append(super().pull_trigger())
+
+        with tempfile.TemporaryDirectory() as scratch:
+            with mock.patch.object(benchmarks, "Revolver", RecordingRevolver):
+                stmt, setup = benchmarks.BENCHMARKS["revolver.pull_trigger"](scratch)
+            for _ in range(2):
+                setup()
+                for _ in range(15):
+                    stmt()
+            log_info("Pulls that fired", f"{sum(results)}/{len(results)}")
+            self.assertTrue(all(results))
+
+            logger = Logger(echo=False, record=False)
+            logger.action("not kept")
+            self.assertEqual(logger.get_history(), [])
+            stmt, _ = benchmarks.BENCHMARKS["game.play_auto[logging=off]"](scratch)
+            stmt()
+            self.assertEqual(os.listdir(scratch), [])
+
+
+
+# === Profiler Tests ===
+
+class TestProfiler(unittest.TestCase):
+
+    def test_63_profiler_span_records(self):
+        """Test span context manager records a named span"""
+        log_test("63 Testing Profiler.span")
+        profiler = Profiler()
+        with profiler.span("load"):
+            pass
+        spans = profiler.spans()
+        log_info("Spans", spans)
+        self.assertEqual(len(spans), 1)
+        self.assertEqual(spans[0][0], "load")
+        self.assertGreaterEqual(spans[0][2], spans[0][1])
+
+    def test_64_profiler_ring_buffer_wraps(self):
+        """Test ring buffer keeps only the newest spans in order"""
+        log_test("64 Testing Profiler ring buffer wrap-around")
+        profiler = Profiler(capacity=3)
+        for i in range(5):
+            profiler.record(f"span{i}", i, i + 1)
+        names = [span[0] for span in profiler.spans()]
+        log_info("Kept spans", names)
+        self.assertEqual(names, ["span2", "span3", "span4"])
+
+    def test_65_profiler_chrome_trace(self):
+        """Test Chrome trace export uses complete events in microseconds"""
+        log_test("65 Testing Profiler.to_chrome_trace")
+        profiler = Profiler()
+        profiler.record("fire", 1000, 3000)
+        event = profiler.to_chrome_trace()["traceEvents"][0]
+        log_info("Event", event)
+        self.assertEqual(event["ph"], "X")
+        self.assertEqual(event["ts"], 1.0)
+        self.assertEqual(event["dur"], 2.0)
+
+    def test_66_game_records_phases(self):
+        """Test play_auto records spans for each engine phase"""
+        log_test("66 Testing RussianRoulette phase spans")
+        profiler = Profiler()
+        with tempfile.TemporaryDirectory() as records:
+            game = RussianRoulette(animations=False, sound=False,
+                                   records_directory=records, profiler=profiler)
+            game.logger.echo = False
+            game.play_auto()
+        phases = set(profiler.summary())
+        log_info("Phases", sorted(phases))
+        for phase in ("load", "spin", "take", "aim", "fire", "persist"):
+            self.assertIn(phase, phases)
+
+    def test_147_fire_span_excludes_render(self):
+        """Test the shot's animation is timed as "render" after the "fire" span, not inside it"""
+        log_test("147 Testing fire and render spans do not overlap")
+        profiler = Profiler()
+        game = RussianRoulette(animations=True, sound=False, records_directory=None,
+                               profiler=profiler)
+        game.logger.echo = False
+        game.crupier.revolverInHand.load_bullet(3)
+
+        def slow_frames(frames):
+            graphics.collect_frames(frames)
+            time.sleep(0.05)
+
+        with contextlib.redirect_stdout(io.StringIO()), \
+                mock.patch("builtins.input", return_value="1"), \
+                mock.patch.object(graphics, "play_frames", slow_frames):
+            game.play_turn()
+        spans = {name: (start, end) for name, start, end in profiler.spans()}
+        summary = profiler.summary()
+        log_info("fire / render ns", (summary["fire"]["total_ns"], summary["render"]["total_ns"]))
+        self.assertGreaterEqual(spans["render"][0], spans["fire"][1])
+        self.assertLess(summary["fire"]["total_ns"], 50_000_000)
+        self.assertGreaterEqual(summary["render"]["total_ns"], 50_000_000)
+
+
+
+# === Simulation / CLI Tests ===
+
+class TestSimulation(unittest.TestCase):
+
+    def test_67_run_game_same_seed_replays(self):
+        """Test the same seed reproduces the same game"""
+        log_test("67 Testing simulation.run_game determinism")
+        first = simulation.run_game(42, bullets_per_round=2)
+        second = simulation.run_game(42, bullets_per_round=2)
+        log_info("Result", first)
+        self.assertEqual(first, second)
+        self.assertIn(first["winner"], ("Player 1", "Player 2", None))
+        self.assertEqual(first["shots"], 6 - sum(first["remaining_lives"]))
+
+    def test_68_iter_games_uses_consecutive_seeds(self):
+        """Test iter_games yields one result per game with seed + index"""
+        log_test("68 Testing simulation.iter_games")
+        results = list(simulation.iter_games(5, seed=100))
+        log_info("Seeds", [result["seed"] for result in results])
+        self.assertEqual([result["game"] for result in results], [0, 1, 2, 3, 4])
+        self.assertEqual([result["seed"] for result in results], [100, 101, 102, 103, 104])
+
+    def test_69_cli_auto_writes_json_lines(self):
+        """Test `auto` command streams one JSON line per game"""
+        log_test("69 Testing game.main auto --output")
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "results.jsonl")
+            status = game.main(["auto", "--games", "4", "--seed", "1", "--quiet",
+                                "--lives", "2", "--output", path])
+            with open(path) as f:
+                results = [json.loads(line) for line in f]
+        log_info("Games written", len(results))
+        self.assertEqual(status, 0)
+        self.assertEqual(len(results), 4)
+        self.assertTrue(all(result["lives"] == 2 for result in results))
+
+    def test_144_cli_profile_keeps_stdout_clean(self):
+        """Test --profile prints its stats to stderr, leaving stdout to the JSON lines"""
+        log_test("144 Testing game.main --profile auto")
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            status = game.main(["--profile", "auto", "--games", "3", "--seed", "1", "--quiet"])
+        lines = stdout.getvalue().splitlines()
+        log_info("Stdout lines", len(lines))
+        self.assertEqual(status, 0)
+        self.assertEqual(len([json.loads(line) for line in lines]), 3)
+        self.assertIn("function calls", stderr.getvalue())
+
+    def test_145_invalid_lives_and_revolvers(self):
+        """Test zero lives or revolvers are rejected instead of hanging or crashing"""
+        log_test("145 Testing lives and revolvers validation")
+        for options in ({"lives": 0}, {"revolvers": 0}):
+            with self.assertRaises(ValueError):
+                RussianRoulette(animations=False, sound=False, records_directory=None, **options)
+        with self.assertRaises(ValueError):
+            kernel.play_game(lives=0)
+        for argv in (["auto", "-l", "0", "-n", "1", "-q"], ["auto", "--revolvers", "0", "-q"]):
+            with contextlib.redirect_stderr(io.StringIO()) as errors, \
+                    self.assertRaises(SystemExit) as exit_:
+                game.main(argv)
+            log_info("Error", errors.getvalue().strip().splitlines()[-1])
+            self.assertEqual(exit_.exception.code, 2)
+
+    def test_146_bullets_checked_against_chambers(self):
+        """Test --bullets above --chambers is rejected, and non-kernel tables keep stdout clean"""
+        log_test("146 Testing --bullets against --chambers")
+        for argv in (["auto", "--chambers", "8", "-b", "9", "-q"], ["auto", "-b", "7", "-q"]):
+            with contextlib.redirect_stderr(io.StringIO()) as errors, \
+                    self.assertRaises(SystemExit):
+                game.main(argv)
+            log_info("Error", errors.getvalue().strip().splitlines()[-1])
+            self.assertIn("more than --chambers", errors.getvalue())
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(io.StringIO()):
+            result = simulation.run_game(1, bullets_per_round=9, chambers=8)
+        self.assertEqual(stdout.getvalue(), "")
+        self.assertEqual(result["chambers"], 8)
+
+
+
+# === Broadcast Tests ===
+
+class TestBroadcast(unittest.TestCase):
+
+    def test_74_slow_viewer_drops_frames_not_events(self):
+        """Test a full viewer queue drops frames but keeps events"""
+        log_test("74 Testing Broadcaster drop policy")
+        broadcaster = Broadcaster(max_queue=4)
+        viewer = _Subscriber(None, None)
+        broadcaster.subscribers.append(viewer)
+        for i in range(10):
+            broadcaster.publish_frame(graphics.Frame(f"frame {i}", 0))
+        broadcaster.publish_event("shot", fired=True)
+        kinds = [json.loads(payload)["type"] for payload, _ in viewer.queue]
+        log_info("Queued", kinds)
+        log_info("Dropped", viewer.dropped)
+        self.assertEqual(len(viewer.queue), 4)
+        self.assertEqual(kinds[-1], "event")
+        self.assertEqual(viewer.dropped, 7)
+
+    def test_75_payload_shared_between_viewers(self):
+        """Test every viewer queues the same encoded bytes object"""
+        log_test("75 Testing Broadcaster shared payloads")
+        broadcaster = Broadcaster()
+        viewers = [_Subscriber(None, None) for _ in range(3)]
+        broadcaster.subscribers.extend(viewers)
+        broadcaster.publish_event("round", round=1)
+        payloads = [viewer.queue[0][0] for viewer in viewers]
+        log_info("Payload", payloads[0])
+        self.assertTrue(all(payload is payloads[0] for payload in payloads))
+
+    def test_76_viewer_receives_game(self):
+        """Test a connected viewer receives a whole automatic game"""
+        log_test("76 Testing Broadcaster with a live game")
+        with Broadcaster(max_queue=1024) as broadcaster:
+            with socket.create_connection(broadcaster.address) as viewer:
+                while broadcaster.viewer_count() < 1:
+                    pass
+                random.seed(3)
+                game = RussianRoulette(animations=False, sound=False,
+                                       records_directory=None, broadcaster=broadcaster)
+                game.logger.echo = False
+                game.play_auto()
+                events = []
+                reader = viewer.makefile('r', encoding='utf-8')
+                while not events or events[-1] != "game_over":
+                    message = json.loads(reader.readline())
+                    if message["type"] == "event":
+                        events.append(message["event"])
+        log_info("Events", len(events))
+        self.assertEqual(events[0], "game_start")
+        self.assertEqual(events.count("shot"), game.turns_played)
+
+    def test_138_frame_on_the_wire_is_not_dropped(self):
+        """Test a frame being sent stays at the head of the queue while events make room"""
+        log_test("138 Testing Broadcaster drop policy during a send")
+        broadcaster = Broadcaster(max_queue=2)
+        viewer = _Subscriber(None, None)
+        broadcaster.subscribers.append(viewer)
+        broadcaster.publish_frame(graphics.Frame("sending", 0))
+        broadcaster.publish_frame(graphics.Frame("queued", 0))
+        head = viewer.queue[0]
+        viewer.sending = True
+        broadcaster.publish_event("shot", fired=False)
+        log_info("Queued", [json.loads(payload).get("text") for payload, _ in viewer.queue])
+        self.assertIs(viewer.queue[0], head)
+        self.assertEqual(len(viewer.queue), 2)
+        viewer.sending = False
+        self.assertTrue(viewer.drop_oldest_frame())
+
+    def test_139_close_drains_queues(self):
+        """Test close sends every queued message before disconnecting"""
+        log_test("139 Testing Broadcaster.close drain")
+        broadcaster = Broadcaster(max_queue=4096).start()
+        with socket.create_connection(broadcaster.address) as viewer:
+            while broadcaster.viewer_count() < 1:
+                pass
+            for index in range(500):
+                broadcaster.publish_event("tick", index=index, padding="x" * 200)
+            broadcaster.close()
+            reader = viewer.makefile('r', encoding='utf-8')
+            indexes = [json.loads(line)["index"] for line in reader]
+        log_info("Received", len(indexes))
+        self.assertEqual(indexes, list(range(500)))
+
+
+
+# === History Store Tests ===
+
+def make_summary(player1, player2, winner, bullets=1):
+    """Build a minimal game summary for the history store."""
+    return {"player1": player1, "player2": player2, "winner": winner, "lives": 3,
+            "bullets": bullets, "rounds": 1, "turns": 1, "shots": 1}
+
+
+class TestHistoryStore(unittest.TestCase):
+
+    def setUp(self):
+        self.store = HistoryStore(":memory:", batch_size=2)
+
+    def tearDown(self):
+        self.store.close()
+
+    def test_77_batched_inserts(self):
+        """Test games are buffered until the batch is full"""
+        log_test("77 Testing HistoryStore batching")
+        self.store.add_game(make_summary("Alice", "Bob", "Alice"))
+        log_info("Pending after 1", len(self.store.pending))
+        self.assertEqual(len(self.store.pending), 1)
+        self.store.add_game(make_summary("Alice", "Bob", "Bob"))
+        log_info("Pending after 2", len(self.store.pending))
+        self.assertEqual(len(self.store.pending), 0)
+        self.assertEqual(self.store.count_games(), 2)
+
+    def test_78_leaderboard_and_head_to_head(self):
+        """Test leaderboard and head-to-head queries"""
+        log_test("78 Testing HistoryStore.leaderboard / head_to_head")
+        self.store.add_game(make_summary("Alice", "Bob", "Alice"))
+        self.store.add_game(make_summary("Bob", "Alice", "Alice"))
+        self.store.add_game(make_summary("Bob", "Carol", "Bob"))
+        self.store.add_game(make_summary("Alice", "Bob", None))
+        leaderboard = self.store.leaderboard()
+        log_info("Leaderboard", leaderboard)
+        self.assertEqual(leaderboard[0], ("Alice", 2, 3))
+        self.assertEqual(self.store.head_to_head("Alice", "Bob"),
+                         {"Alice": 2, "Bob": 0, "none": 1})
+
+    def test_79_first_shot_query(self):
+        """Test finding games where the first shot hit a player"""
+        log_test("79 Testing HistoryStore.games_hit_on_first_shot")
+        self.store.add_game(make_summary("Alice", "Bob", "Bob"),
+                            shots=[(1, "Alice", "Alice", True)])
+        self.store.add_game(make_summary("Alice", "Bob", "Alice"),
+                            shots=[(1, "Alice", "Bob", False), (1, "Bob", "Alice", True)])
+        game_ids = self.store.games_hit_on_first_shot("Alice")
+        log_info("Games", game_ids)
+        self.assertEqual(game_ids, [1])
+
+    def test_80_game_saves_to_store(self):
+        """Test a finished game is saved with its shots and log events"""
+        log_test("80 Testing RussianRoulette with a history store")
+        game = RussianRoulette("Alice", "Bob", animations=False, sound=False,
+                               records_directory=None, history_store=self.store)
+        game.logger.echo = False
+        game.play_auto()
+        stored = self.store.games(player="Alice")
+        log_info("Stored", stored)
+        self.assertEqual(len(stored), 1)
+        self.assertEqual(stored[0]["turns"], game.turns_played)
+        self.assertEqual(len(self.store.events(stored[0]["id"])), len(game.logger.history))
+
+
+
+# === Record Writer Tests ===
+
+class TestRecordWriter(unittest.TestCase):
+
+    def test_81_writer_flush_writes_files(self):
+        """Test submitted records are on disk after flush"""
+        log_test("81 Testing RecordWriter.flush")
+        with tempfile.TemporaryDirectory() as tmp:
+            with RecordWriter(batch_size=4) as writer:
+                paths = [writer.submit(os.path.join(tmp, f"record_{i}.txt"), f"game {i}\n")
+                         for i in range(10)]
+                writer.flush()
+                metrics = writer.metrics()
+                log_info("Metrics", metrics)
+                self.assertEqual(metrics["written"], 10)
+                self.assertEqual(metrics["queue_depth"], 0)
+                with open(paths[3]) as f:
+                    self.assertEqual(f.read(), "game 3\n")
+
+    def test_82_writer_compress(self):
+        """Test compressed records get a .gz suffix and round-trip"""
+        log_test("82 Testing RecordWriter with compression")
+        with tempfile.TemporaryDirectory() as tmp:
+            writer = RecordWriter(compress=True, fsync="always")
+            path = writer.submit(os.path.join(tmp, "record.txt"), "BANG!\n")
+            writer.close()
+            log_info("Path", path)
+            self.assertTrue(path.endswith(".txt.gz"))
+            with gzip.open(path, 'rt') as f:
+                self.assertEqual(f.read(), "BANG!\n")
+
+    def test_83_writer_invalid_fsync(self):
+        """Test unknown fsync policy raises ValueError"""
+        log_test("83 Testing RecordWriter fsync validation")
+        with self.assertRaises(ValueError):
+            RecordWriter(fsync="sometimes")
+        log_info("Result", "ValueError raised as expected")
+
+    def test_84_game_uses_writer(self):
+        """Test a game hands its record to the writer"""
+        log_test("84 Testing RussianRoulette with a record writer")
+        with tempfile.TemporaryDirectory() as tmp:
+            with RecordWriter() as writer:
+                game = RussianRoulette(animations=False, sound=False,
+                                       records_directory=tmp, record_writer=writer)
+                game.logger.echo = False
+                game.play_auto()
+            log_info("Files", os.listdir(tmp))
+            self.assertEqual(writer.metrics()["written"], 1)
+            self.assertEqual(len(os.listdir(tmp)), 1)
+
+    def test_140_fsync_error_keeps_writer_alive(self):
+        """Test a failed batch fsync is counted and flush still returns"""
+        log_test("140 Testing RecordWriter with a failing fsync")
+        with tempfile.TemporaryDirectory() as tmp:
+            writer = RecordWriter(fsync="batch")
+            with mock.patch("recordWriter.os.fsync", side_effect=OSError("disk gone")), \
+                    contextlib.redirect_stderr(io.StringIO()):
+                writer.submit(os.path.join(tmp, "a.txt"), "a\n")
+                flusher = threading.Thread(target=writer.flush, daemon=True)
+                flusher.start()
+                flusher.join(timeout=5)
+                self.assertFalse(flusher.is_alive(), "flush() blocked")
+                writer.submit(os.path.join(tmp, "b.txt"), "b\n")
+                writer.close()
+            log_info("Metrics", writer.metrics())
+            self.assertEqual(writer.metrics()["errors"], 2)
+            self.assertEqual(sorted(os.listdir(tmp)), ["a.txt", "b.txt"])
+
+    def test_141_records_in_one_second_keep_distinct_names(self):
+        """Test games finishing in the same second do not overwrite each other's records"""
+        log_test("141 Testing unique record names")
+        with tempfile.TemporaryDirectory() as tmp:
+            with RecordWriter() as writer:
+                for _ in range(5):
+                    game = RussianRoulette(animations=False, sound=False,
+                                           records_directory=tmp, record_writer=writer)
+                    game.logger.echo = False
+                    game.play_auto()
+            log_info("Files", sorted(os.listdir(tmp)))
+            self.assertEqual(len(os.listdir(tmp)), 5)
+
+
+
+# === Record Archive Tests ===
+
+class TestRecordArchive(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "archive.dat")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_85_archive_random_access(self):
+        """Test reading one game decompresses only its block"""
+        log_test("85 Testing RecordArchive.read")
+        archive = RecordArchive(self.path, codec="zlib")
+        added = archive.add_records(((f"game_{i}", f"record {i}\n") for i in range(10)),
+                                    block_size=4)
+        log_info("Blocks", len(archive.blocks))
+        self.assertEqual(added, 10)
+        self.assertEqual(len(archive.blocks), 3)
+        self.assertEqual(archive.read("game_5"), "record 5\n")
+        self.assertEqual(archive._cached_block[0], 1)
+
+    def test_86_archive_reopen_and_skip_duplicates(self):
+        """Test a reopened archive keeps its index and skips archived ids"""
+        log_test("86 Testing RecordArchive reopen")
+        RecordArchive(self.path, codec="zlib").add_records([("a", "A"), ("b", "B")])
+        archive = RecordArchive(self.path)
+        log_info("Games", archive.game_ids())
+        self.assertEqual(archive.codec, "zlib")
+        self.assertEqual(archive.add_records([("b", "B"), ("c", "C")]), 1)
+        self.assertEqual(archive.read("a"), "A")
+        self.assertEqual(len(archive), 3)
+
+    def test_87_fold_records(self):
+        """Test fold_records archives record files and removes them"""
+        log_test("87 Testing fold_records")
+        for i in range(3):
+            with open(os.path.join(self.tmp.name, f"game_record_2025-01-01_00:00:0{i}.txt"), 'w') as f:
+                f.write(f"game {i}\n")
+        archive = RecordArchive(self.path)
+        added = fold_records(self.tmp.name, archive, remove=True)
+        remaining = sorted(os.listdir(self.tmp.name))
+        log_info("Remaining files", remaining)
+        self.assertEqual(added, 3)
+        self.assertEqual(remaining, ["archive.dat", "archive.dat.idx"])
+
+    def test_88_logger_read_record_from_archive(self):
+        """Test Logger.read_record falls back to the archive"""
+        log_test("88 Testing Logger.read_record")
+        archive = RecordArchive(self.path)
+        archive.add_records([("game_record_x", "archived\n")])
+        text = Logger.read_record("game_record_x", self.tmp.name, archive)
+        log_info("Record", text.strip())
+        self.assertEqual(text, "archived\n")
+        with self.assertRaises(KeyError):
+            Logger.read_record("game_record_missing", self.tmp.name, archive)
+
+
+
+# === Turn Kernel Tests ===
+
+class TestKernel(unittest.TestCase):
+
+    def test_89_trigger_table_matches_revolver(self):
+        """Test the lookup table agrees with Revolver.pull_trigger on every state"""
+        log_test("89 Testing kernel.TRIGGER against Revolver.pull_trigger")
+        checked = 0
+        for code in range(kernel.STATE_COUNT):
+            if kernel.TRIGGER[code] < 0:
+                continue
+            reference = revolver.Revolver()
+            kernel.state_to_revolver(code, reference)
+            fired = bool(reference.pull_trigger())
+            result = kernel.TRIGGER[code]
+            self.assertEqual(bool(result & 1), fired)
+            self.assertEqual(result >> 1, kernel.state_from_revolver(reference))
+            checked += 1
+        log_info("States checked", checked)
+        self.assertEqual(checked, 6 * 3 ** 6)
+
+    def test_90_headless_matches_play_auto(self):
+        """Test play_headless reproduces play_auto for the same seed"""
+        log_test("90 Testing RussianRoulette.play_headless against play_auto")
+        for seed in range(50):
+            outcomes = []
+            for headless in (False, True):
+                random.seed(seed)
+                game = RussianRoulette(lives=2, bullets_per_round=2, animations=False,
+                                       sound=False, records_directory=None)
+                game.logger.echo = False
+                winner = game.play_headless() if headless else game.play_auto()
+                outcomes.append((winner.name if winner else None, game.round_number,
+                                 game.turns_played, game.shots_fired,
+                                 game.crupier.revolverInHand.drum,
+                                 game.crupier.revolverInHand.activeChamberPosition))
+            self.assertEqual(outcomes[0], outcomes[1])
+        log_info("Seeds compared", 50)
+
+    def test_91_headless_has_no_observers(self):
+        """Test has_observers reflects logging and records"""
+        log_test("91 Testing RussianRoulette.has_observers")
+        game = RussianRoulette(animations=False, sound=False, records_directory=None)
+        self.assertTrue(game.has_observers())
+        game.logger.echo = False
+        log_info("Observers", game.has_observers())
+        self.assertFalse(game.has_observers())
+
+
+# === Estimator Tests ===
+
+class TestEstimator(unittest.TestCase):
+
+    def test_92_antithetic_draws_mirror(self):
+        """Test a mirrored random source reverses every index it draws"""
+        log_test("92 Testing antithetic random sources")
+        plain = estimator._Uniforms(7)
+        mirrored = estimator._Uniforms(7, antithetic=True)
+        for _ in range(200):
+            self.assertNotEqual(plain.choice(kernel.TARGETS), mirrored.choice(kernel.TARGETS))
+            self.assertEqual(plain.randint(0, 5) + mirrored.randint(0, 5), 5)
+        drawn = plain.sample(range(6), 3)
+        log_info("Sample", drawn)
+        self.assertEqual(len(set(drawn)), 3)
+
+    def test_93_first_round_layouts(self):
+        """Test strata cover every loading and the kernel plays them"""
+        log_test("93 Testing first-round layout strata")
+        for bullets, expected in ((1, 6), (2, 15), (3, 20), (6, 1)):
+            layouts = estimator.first_round_layouts(bullets)
+            self.assertEqual(len(set(layouts)), expected)
+        # Every chamber loaded: the first shot always hits, here player 1 shoots player 2
+        state = estimator.first_round_layouts(6)[0]
+        result = kernel.play_game(1, 6, first_state=state,
+                                  strategies=(kernel.always_other, kernel.always_other))
+        log_info("Winner", result.winner)
+        self.assertEqual((result.winner, result.turns), (0, 1))
+
+    def test_94_estimate_reaches_target_width(self):
+        """Test the estimator stops at the target width with a sensible value"""
+        log_test("94 Testing estimate_win_probability")
+        estimate = estimator.estimate_win_probability(2, 2, target_width=0.05, seed=1)
+        log_info("Estimate", estimator.format_estimate(estimate))
+        self.assertTrue(estimate.converged)
+        self.assertLessEqual(2 * estimate.half_width, 0.05)
+        # Random targets make both seats equally likely to win
+        self.assertLess(abs(estimate.value - 0.5), 0.05)
+        self.assertEqual(estimate, estimator.estimate_win_probability(2, 2, target_width=0.05, seed=1))
+
+        certain = estimator.estimate_win_probability(1, 6, ("other", "self"), seed=1)
+        self.assertEqual((certain.value, certain.half_width, certain.batches), (1.0, 0.0, 1))
+
+    def test_95_compare_strategies_common_random_numbers(self):
+        """Test strategy comparisons share their random numbers"""
+        log_test("95 Testing compare_strategies")
+        same = estimator.compare_strategies(("random", "random"), ("random", "random"), seed=2)
+        self.assertEqual((same.value, same.half_width), (0.0, 0.0))
+        better = estimator.compare_strategies(("other", "random"), ("random", "random"),
+                                              target_width=0.05, seed=2)
+        log_info("Difference", estimator.format_estimate(better))
+        self.assertTrue(better.converged)
+        self.assertGreater(better.value - better.half_width, 0)
+
+
+# === Sweep Tests ===
+
+class TestSweep(unittest.TestCase):
+
+    def test_96_grid_and_cache_keys(self):
+        """Test grid expansion and cache keys"""
+        log_test("96 Testing sweep.build_grid and sweep.cell_key")
+        self.assertEqual(sweep.parse_values("1-3,6"), [1, 2, 3, 6])
+        cells = sweep.build_grid([1, 2], [1, 2, 3], ["random", "other"])
+        log_info("Cells", len(cells))
+        self.assertEqual(len(cells), 2 * 3 * 4)
+        options = {"target_width": 0.05}
+        key = sweep.cell_key(cells[0], options, "v1")
+        self.assertEqual(key, sweep.cell_key(dict(reversed(cells[0].items())), options, "v1"))
+        self.assertNotEqual(key, sweep.cell_key(cells[1], options, "v1"))
+        self.assertNotEqual(key, sweep.cell_key(cells[0], options, "v2"))
+        self.assertNotEqual(key, sweep.cell_key(cells[0], {"target_width": 0.01}, "v1"))
+
+    def test_97_sweep_only_computes_new_cells(self):
+        """Test registering a new strategy keeps every cached cell and computes only the new ones"""
+        log_test("97 Testing run_sweep with a cache")
+
+        def cautious(rng, code):
+            # Genuinely new strategy: shoot yourself only on the first turn of a round
+            live, fired, position = kernel.unpack_state(code)
+            return "self" if fired == 0 else "other"
+
+        with tempfile.TemporaryDirectory() as directory:
+            cache = sweep.SweepCache(directory)
+            first = sweep.run_sweep(sweep.build_grid([1, 2], [1], ["random", "other"]),
+                                    cache=cache, target_width=0.1)
+            self.assertFalse(any(result["cached"] for result in first))
+
+            with mock.patch.dict(kernel.STRATEGIES, {"cautious": cautious}):
+                second = sweep.run_sweep(
+                    sweep.build_grid([1, 2], [1], ["random", "other", "cautious"]),
+                    cache=cache, target_width=0.1)
+            computed = [r for r in second if not r["cached"]]
+            log_info("Computed on re-run", f"{len(computed)} of {len(second)}")
+            self.assertEqual(len(computed), len(second) - len(first))
+            self.assertTrue(all("cautious" in r["strategies"] for r in computed))
+            previous = {(r["lives"], tuple(r["strategies"])): r["value"] for r in first}
+            for result in second:
+                key = (result["lives"], tuple(result["strategies"]))
+                if key in previous:
+                    self.assertTrue(result["cached"])
+                    self.assertEqual(result["value"], previous[key])
+
+        # Adding or editing a kernel strategy leaves the shared version alone;
+        # editing the kernel core changes it
+        core = sweep.code_version()
+        cautious.__module__ = kernel.__name__
+        with mock.patch.dict(kernel.STRATEGIES, {"cautious": cautious}), \
+                mock.patch.object(kernel, "cautious", cautious, create=True), \
+                mock.patch.object(kernel, "odds_strategy", cautious):
+            self.assertEqual(sweep.code_version(), core)
+        with mock.patch.object(kernel, "START_POSITION", 0):
+            self.assertNotEqual(sweep.code_version(), core)
+        self.assertNotIn("def odds_strategy", sweep.core_source())
+        self.assertIn("def play_game", sweep.core_source())
+
+
+# === Thread Safety Tests ===
+
+def run_threads(target, count=8):
+    """Run target(index) in several threads with frequent switching."""
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        threads = [threading.Thread(target=target, args=(i,)) for i in range(count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(interval)
+
+
+class TestThreadSafety(unittest.TestCase):
+
+    def test_98_shared_revolver_fires_each_bullet_once(self):
+        """Test concurrent trigger pulls fire every bullet exactly once"""
+        log_test("98 Testing a revolver shared by threads")
+        shared = revolver.Revolver()
+        shared.speed_reload()
+        fired = []
+
+        def pull(index):
+            hits = 0
+            for _ in range(600):
+                if shared.pull_trigger():
+                    hits += 1
+            fired.append(hits)
+
+        run_threads(pull)
+        log_info("Bullets fired", sum(fired))
+        self.assertEqual(sum(fired), 6)
+        self.assertEqual(shared.drum, [False] * 6)
+        self.assertEqual(shared.activeChamberPosition, (5 + 8 * 600) % 6)
+
+    def test_99_shared_player_loses_every_life(self):
+        """Test concurrent damage is never lost"""
+        log_test("99 Testing a player shared by threads")
+        target = Player("Target", lives=10000)
+
+        def damage(index):
+            for _ in range(1000):
+                target.take_damage()
+
+        run_threads(damage)
+        log_info("Lives left", target.lives)
+        self.assertEqual(target.lives, 2000)
+
+    def test_100_shared_logger_history(self):
+        """Test concurrent logging, clearing and snapshots keep history consistent"""
+        log_test("100 Testing a logger shared by threads")
+        logger = Logger(echo=False)
+
+        def log(index):
+            for turn in range(500):
+                logger.action(f"thread {index} turn {turn}")
+
+        run_threads(log)
+        history = logger.get_history()
+        log_info("Entries", len(history))
+        self.assertEqual(len(history), 8 * 500)
+        for index in range(8):
+            turns = [m for _, _, m in history if m.startswith(f"thread {index} ")]
+            self.assertEqual(turns, [f"thread {index} turn {t}" for t in range(500)])
+
+        def log_and_clear(index):
+            for turn in range(300):
+                if index == 0:
+                    logger.clear_history()
+                    logger.format_record()
+                else:
+                    logger.action("entry")
+
+        run_threads(log_and_clear)
+        logger.clear_history()
+        self.assertEqual(logger.get_history(), [])
+
+    def test_101_run_tables(self):
+        """Test tables run in threads each finish their games"""
+        log_test("101 Testing tables.run_tables")
+        results = tables.run_tables(4, 10, lives=2, bullets_per_round=2)
+        log_info("Games", len(results))
+        self.assertEqual(len(results), 40)
+        self.assertEqual([r["table"] for r in results], sorted(r["table"] for r in results))
+        for result in results:
+            self.assertEqual(min(result["remaining_lives"]), 0)
+            self.assertIn(result["winner"], ("Player 1", "Player 2"))
+
+
+# === Shared Results Tests ===
+
+class TestSharedResults(unittest.TestCase):
+
+    def test_102_shared_results_match_iter_games(self):
+        """Test games written to shared memory match iter_games"""
+        log_test("102 Testing simulation.run_shared")
+        expected = list(simulation.iter_games(20, seed=5, lives=2, bullets_per_round=2))
+        names = {"Player 1": 0, "Player 2": 1, None: -1}
+        with simulation.run_shared(20, 5, lives=2, bullets_per_round=2) as results:
+            records = list(results)
+            log_info("First record", records[0])
+            self.assertEqual(records[3], results[3])
+            for result, (seed, rounds, turns, shots, winner) in zip(expected, records):
+                self.assertEqual((result["seed"], result["rounds"], result["turns"],
+                                  result["shots"], names[result["winner"]]),
+                                 (seed, rounds, turns, shots, winner))
+            summary = results.aggregate()
+        self.assertEqual(sum(summary["wins"]) + summary["draws"], 20)
+
+    def test_103_shared_results_with_workers(self):
+        """Test workers fill the parent's buffer and the block is freed on close"""
+        log_test("103 Testing simulation.run_shared with worker processes")
+        with simulation.run_shared(10000, 1) as single:
+            expected = list(single)
+        results = simulation.run_shared(10000, 1, workers=2)
+        try:
+            self.assertEqual(list(results), expected)
+            log_info("Aggregate", results.aggregate())
+        finally:
+            results.close()
+        with self.assertRaises(FileNotFoundError):
+            simulation.SharedResults(10000, name=results.name)
+
+
+# === Logger Ring Buffer Tests ===
+
+class TestLoggerRingBuffer(unittest.TestCase):
+
+    def test_104_ring_buffer_keeps_newest(self):
+        """Test a bounded logger keeps only the newest entries"""
+        log_test("104 Testing Logger(capacity=...)")
+        logger = Logger(echo=False, capacity=5)
+        for turn in range(10000):
+            logger.action(f"turn {turn}")
+        log_info("Kept / dropped", (len(logger.history), logger.dropped))
+        self.assertEqual(len(logger.history), 5)
+        self.assertEqual(logger.dropped, 9995)
+        self.assertEqual([m for _, _, m in logger.iter_history()],
+                         [f"turn {t}" for t in range(9995, 10000)])
+        # The iterator hands out the stored entries themselves
+        self.assertIs(next(logger.iter_history()), logger.history[0])
+
+    def test_105_spill_to_disk(self):
+        """Test entries pushed out of the ring buffer are spilled and read back"""
+        log_test("105 Testing Logger(spill=True)")
+        logger = Logger(echo=False, capacity=3, spill=True)
+        for turn in range(10):
+            logger.player("Alice", f"turn {turn}\twith a tab")
+        history = logger.get_history()
+        log_info("Spilled", logger.spilled)
+        self.assertEqual(len(logger.history), 3)
+        self.assertEqual(logger.spilled, 7)
+        self.assertEqual([m for _, _, m in history], [f"turn {t}\twith a tab" for t in range(10)])
+        self.assertEqual(history[-1], logger.history[-1])
+        self.assertEqual(history[0][1], "[Alice]")
+        self.assertIn("turn 0", logger.format_record())
+
+        spill_path = logger._spill_path
+        logger.clear_history()
+        self.assertEqual(logger.get_history(), [])
+        logger.action("after clear")
+        self.assertEqual(len(logger.get_history()), 1)
+        del logger
+        self.assertFalse(os.path.exists(spill_path))
+
+    def test_148_bounded_game_log_and_shots(self):
+        """Test capacity 0 is rejected and log_capacity bounds a game's log and shots"""
+        log_test("148 Testing RussianRoulette(log_capacity=...)")
+        with self.assertRaises(ValueError):
+            Logger(capacity=0)
+
+        game = RussianRoulette(lives=6, animations=False, sound=False,
+                               records_directory=None, log_capacity=4)
+        game.logger.echo = False
+        random.seed(3)
+        game.play_auto()
+        log_info("Turns / kept shots / spilled", (game.turns_played, len(game.shots),
+                                                  game.logger.spilled))
+        self.assertEqual(len(game.logger.history), 4)
+        self.assertEqual(len(game.logger.get_history()), 4 + game.logger.spilled)
+        self.assertIn("Round 1 ", game.logger.format_record())
+        self.assertEqual(len(game.shots), min(game.turns_played, 4))
+        self.assertEqual(len(game.reset().shots), 0)
+        self.assertEqual(game.shots.maxlen, 4)
+
+        pool = tables.TablePool(1)
+        with pool.table() as pooled:
+            self.assertEqual(pooled.logger.capacity, tables.TABLE_LOG_CAPACITY)
+
+
+# === Logger Clock Tests ===
+
+class TestLoggerClock(unittest.TestCase):
+
+    def test_106_burst_logging_skips_datetime(self):
+        """Test logging a burst of events formats the clock at most once per second"""
+        log_test("106 Testing Logger timestamp caching")
+        clock = mock.Mock(wraps=datetime.datetime)
+        with mock.patch.object(logger_module, "datetime", clock):
+            quiet = Logger(echo=False)
+            for turn in range(500):
+                quiet.action(f"turn {turn}")
+            self.assertEqual(clock.mock_calls, [])
+
+            loud = Logger()
+            with contextlib.redirect_stdout(io.StringIO()) as output:
+                for turn in range(500):
+                    loud.action(f"turn {turn}")
+            quiet.format_record()
+        formatted = clock.fromtimestamp.call_count
+        log_info("Clock formats for 1000 events", formatted)
+        self.assertLessEqual(formatted, 6)
+        self.assertEqual(output.getvalue().count("\n"), 500)
+
+    def test_107_timestamps_map_to_wall_clock(self):
+        """Test monotonic timestamps convert back to the wall clock"""
+        log_test("107 Testing Logger.datetime_of")
+        logger = Logger(echo=False)
+        before = datetime.datetime.now()
+        logger.info("first")
+        logger.info("second")
+        after = datetime.datetime.now()
+        (first, _, _), (second, _, _) = logger.get_history()
+        self.assertLessEqual(first, second)
+        when = logger.datetime_of(first)
+        log_info("Logged at", when)
+        self.assertLessEqual(abs((when - before).total_seconds()), 1)
+        self.assertLessEqual(abs((after - when).total_seconds()), 1)
+        self.assertEqual(logger.format_clock(first), when.strftime('%H:%M:%S'))
+
+
+# === Drum Size Tests ===
+
+class TestDrumSize(unittest.TestCase):
+
+    def test_108_revolver_with_n_chambers(self):
+        """Test revolvers of any size from 1 to 64 chambers"""
+        log_test("108 Testing Revolver(chambers=N)")
+        for size in (1, 2, 12, 64):
+            gun = revolver.Revolver(size)
+            self.assertEqual(gun.drum, [None] * size)
+            self.assertEqual(gun.activeChamberPosition, size - 1)
+            gun.speed_reload()
+            self.assertEqual(gun.live_count(), size)
+            fired = [gun.pull_trigger() for _ in range(size + 1)]
+            self.assertEqual(fired, [True] * size + [False])
+            self.assertEqual(gun.drum, [False] * size)
+            self.assertFalse(gun.has_live_rounds())
+        log_info("Largest drum", revolver.MAX_CHAMBERS)
+
+        gun = revolver.Revolver(10)
+        gun.load_bullet_in_given_order([9, 3])
+        self.assertEqual((gun.chamber_state(9), gun.chamber_state(3), gun.chamber_state(0)),
+                         (True, True, None))
+        self.assertEqual(gun.get_empty_chambers(), [0, 1, 2, 4, 5, 6, 7, 8])
+        with self.assertRaises(ValueError):
+            gun.load_bullet(9)
+        with self.assertRaises(IndexError):
+            gun.load_bullet(10)
+        with self.assertRaises(ValueError):
+            gun.drum = [None] * 6
+        for size in (0, 65):
+            with self.assertRaises(ValueError):
+                revolver.Revolver(size)
+
+    def test_109_render_any_drum_size(self):
+        """Test drums other than six chambers render as a ring"""
+        log_test("109 Testing graphics for N-chamber drums")
+        drum = [True, None, False, None, None, True, None, None]
+        art = graphics.render_drum(drum)
+        print(art)
+        self.assertEqual(art.count("["), 8)
+        self.assertEqual(art.count("O"), 2)
+        self.assertIn("^", art)
+        gun = revolver.Revolver(8)
+        gun.drum = drum
+        frames, state = graphics.collect_frames(graphics.fire_revolver_frames(gun, gun.pull_trigger()))
+        self.assertIs(state, True)
+        self.assertEqual(gun.drum, [False] + drum[1:])
+        self.assertEqual(frames[-1].text.count("@"), 2)
+
+    def test_110_table_with_several_revolvers(self):
+        """Test a table passing several N-chamber revolvers around"""
+        log_test("110 Testing RussianRoulette(chambers=..., revolvers=...)")
+        random.seed(3)
+        game = RussianRoulette(lives=2, bullets_per_round=2, animations=False, sound=False,
+                               records_directory=None, chambers=8, revolvers=3)
+        game.logger.echo = False
+        used = []
+        pull = revolver.Revolver.pull_trigger
+
+        def spy(gun):
+            used.append(game.revolvers.index(gun))
+            return pull(gun)
+
+        with mock.patch.object(revolver.Revolver, "pull_trigger", spy):
+            game.play_auto()
+        summary = game.summary()
+        log_info("Revolvers used", used[:9])
+        self.assertEqual((summary["chambers"], summary["revolvers"]), (8, 3))
+        self.assertEqual(used[:3], [0, 1, 2])
+        self.assertEqual(summary["shots"], 4 - sum(summary["remaining_lives"]))
+        self.assertEqual(game.bullets_per_round, 2)
+
+        random.seed(3)
+        headless = RussianRoulette(lives=2, bullets_per_round=2, animations=False, sound=False,
+                                   records_directory=None, chambers=8, revolvers=3)
+        headless.logger.echo = False
+        headless.play_headless()
+        self.assertEqual(headless.summary(), summary)
+
+
+# === Enumerator Tests ===
+
+class TestEnumerator(unittest.TestCase):
+
+    def test_111_exact_distribution(self):
+        """Test the enumerated distribution is exact on a game small enough to work by hand"""
+        log_test("111 Testing enumerator.enumerate_game")
+        # One bullet, one life each: the bullet is equally likely to be 1-6 chambers away
+        tree = enumerator.enumerate_game(1, 1)
+        log_info("States", (tree.states, tree.transpositions))
+        self.assertEqual(sum(tree.outcomes.values()), 1)
+        self.assertEqual(enumerator.marginal(tree.outcomes, "turns"),
+                         {turns: Fraction(1, 6) for turns in range(1, 7)})
+        self.assertEqual(enumerator.win_probability(tree.outcomes), Fraction(1, 2))
+        self.assertGreater(tree.transpositions, 0)
+
+        tree = enumerator.enumerate_game(3, 2, ("other", "random"))
+        self.assertEqual(sum(tree.outcomes.values()), 1)
+        self.assertTrue(all(outcome.shots == 6 - sum(outcome.lives) for outcome in tree.outcomes))
+        rough = enumerator.enumerate_game(3, 2, ("other", "random"), exact=False)
+        self.assertAlmostEqual(enumerator.win_probability(rough.outcomes),
+                               float(enumerator.win_probability(tree.outcomes)))
+        certain = enumerator.enumerate_game(1, 6, ("other", "self"))
+        self.assertEqual(certain.outcomes, {enumerator.Outcome(0, 1, 1, 1, (1, 0)): 1})
+
+    def test_112_oracle_for_sampled_engines(self):
+        """Test the kernel and the estimator agree with the exact distribution"""
+        log_test("112 Testing sampled engines against the enumerator")
+        strategies = ("other", "random")
+        tree = enumerator.enumerate_game(3, 2, strategies)
+        exact_win = enumerator.win_probability(tree.outcomes)
+        exact_rounds = enumerator.marginal(tree.outcomes, "rounds")
+        log_info("Exact P(player 1 wins)", float(exact_win))
+
+        games = 20000
+        rng = random.Random(12)
+        plays = estimator.resolve_strategies(strategies)
+        results = [kernel.play_game(3, 2, rng=rng, strategies=plays) for _ in range(games)]
+        wins = sum(result.winner == 0 for result in results) / games
+        self.assertLess(abs(wins - exact_win), 4 * enumerator.standard_error(exact_win, games))
+        for rounds, p in exact_rounds.items():
+            sampled = sum(result.rounds == rounds for result in results) / games
+            self.assertLess(abs(sampled - p), 4 * enumerator.standard_error(p, games) + 1e-9)
+
+        estimate = estimator.estimate_win_probability(3, 2, strategies, target_width=0.02, seed=5)
+        self.assertLess(abs(estimate.value - exact_win), 2 * estimate.half_width)
+
+    def test_113_exact_estimate_command(self):
+        """Test estimate --exact prints the enumerated probability"""
+        log_test("113 Testing the estimate --exact command")
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            status = game.main(["estimate", "-l", "1", "-b", "1", "--exact"])
+        log_info("Output", output.getvalue().strip())
+        self.assertEqual(status, 0)
+        self.assertIn("0.500000 (exact, 1/2)", output.getvalue())
+
+
+# === Quiet Mode Tests ===
+
+class TestQuietMode(unittest.TestCase):
+
+    def test_124_quiet_helpers_report_only_failures(self):
+        """Test quiet mode keeps helper output and prints it only for failed tests"""
+        log_test("124 Testing Logger.Tests quiet mode")
+
+        class Sample(unittest.TestCase):
+            def test_pass(self):
+                log_info("Hidden", "passing output")
+
+            def test_fail(self):
+                drum = [True, None, None, None, None, None]
+                log_drum("Drum", drum)
+                drum[0] = False
+                self.fail("expected")
+
+        output = io.StringIO()
+        with mock.patch.object(Logger.Tests, "quiet", True), \
+                mock.patch.object(Logger.Tests, "_captured", []), \
+                contextlib.redirect_stdout(output):
+            suite = Logger.Tests.load_tests(None, unittest.TestSuite(
+                [Sample("test_pass"), Sample("test_fail")]), None)
+            result = unittest.TestResult()
+            suite.run(result)
+        log_info("Printed", output.getvalue().strip())
+        self.assertEqual(len(result.failures), 1)
+        self.assertNotIn("passing output", output.getvalue())
+        # Captured arguments are copies: the drum is shown as it was logged
+        self.assertIn("Drum", output.getvalue())
+        self.assertIn("●", output.getvalue())
+
+    def test_125_stub_mixer(self):
+        """Test sounds play through the stub mixer without pygame"""
+        log_test("125 Testing soundEffects.StubMixer")
+        stub = soundEffects.StubMixer()
+        with mock.patch.object(soundEffects, "mixer", stub), \
+                mock.patch.object(soundEffects, "SOUND_ENABLED", True):
+            soundEffects.play_gunshot()
+            soundEffects.play_spin(block=False)
+        log_info("Played", stub.played)
+        self.assertEqual(stub.played, ["single-pistol-gunshot.mp3", "revolver-spin.mp3"])
+
+
+# === Drum View Tests ===
+
+class TestDrumView(unittest.TestCase):
+
+    def test_126_drum_view_reads_revolver(self):
+        """Test a drum view follows the revolver without copying the drum"""
+        log_test("126 Testing graphics.DrumView")
+        gun = revolver.Revolver()
+        view = graphics.DrumView(gun)
+        self.assertEqual(list(view), [None] * 6)
+        gun.load_bullet(2)
+        gun.rotate_drum_counter_clockwise()
+        # Active chamber 0: index 0 is chamber 1, the last index is chamber 0
+        log_drum("View", list(view))
+        self.assertEqual(list(view), [None, True, None, None, None, None])
+        self.assertIs(view[-1], None)
+        self.assertEqual(list(graphics.DrumView(gun, -1)), [None, None, True, None, None, None])
+        self.assertIs(graphics.DrumView(gun, shown=(1, False))[0], False)
+        with self.assertRaises(IndexError):
+            view[6]
+
+    def test_127_animated_turn_fires_like_auto(self):
+        """Test an animated turn fires through pull_trigger and keeps the revolver in sync"""
+        log_test("127 Testing animated play_turn against auto play_turn")
+        drums = {}
+        for auto in (False, True):
+            random.seed(8)
+            game = RussianRoulette(animations=True, sound=False, records_directory=None)
+            game.logger.echo = False
+            game.crupier.revolverInHand.load_bullet(3)
+            game.crupier.revolverInHand.activeChamberPosition = 1
+            with mock.patch("builtins.input", return_value="1"), \
+                    mock.patch.object(graphics, "play_frames",
+                                      lambda frames: graphics.collect_frames(frames)[1]), \
+                    mock.patch.object(revolver.Revolver, "pull_trigger",
+                                      autospec=True, side_effect=revolver.Revolver.pull_trigger) as pull:
+                fired = [game.play_turn(auto=auto) for _ in range(2)]
+            gun = game.crupier.revolverInHand
+            drums[auto] = (fired, gun.drum, gun.activeChamberPosition, game.player1.lives)
+            self.assertEqual(pull.call_count, 2)
+        log_info("Animated", drums[False])
+        self.assertEqual(drums[False][:3], drums[True][:3])
+        self.assertEqual(drums[False][:3], ([None, True], [None, None, None, False, None, None], 3))
+
+
+# === Event Bus Tests ===
+
+class TestEventBus(unittest.TestCase):
+
+    def test_128_bus_dispatch(self):
+        """Test handlers get their event type, in order, and emit skips unsubscribed types"""
+        log_test("128 Testing events.EventBus")
+        bus = events.EventBus()
+        seen = []
+        first = lambda event: seen.append(("first", event))
+        bus.subscribe(events.GameOver, first)
+        bus.subscribe(events.GameOver, lambda event: seen.append(("second", event)))
+        bus.emit(events.GameOver, "Player 1")
+        bus.emit(events.LifeLost, "Player 2", 0)
+        self.assertEqual([name for name, _ in seen], ["first", "second"])
+        self.assertEqual(seen[0][1], events.GameOver("Player 1"))
+        self.assertEqual(bus.subscribed, {events.GameOver})
+        bus.unsubscribe(events.GameOver, first)
+        bus.unsubscribe(events.LifeLost, first)
+        bus.emit(events.GameOver, None)
+        self.assertEqual([name for name, _ in seen], ["first", "second", "second"])
+        # An event type without subscribers is never built
+        with mock.patch.object(events, "LifeLost") as life_lost:
+            bus.emit(life_lost, "Player 2", 0)
+        life_lost.assert_not_called()
+
+    def test_129_engine_emits(self):
+        """Test the revolver, crupier and players report their changes"""
+        log_test("129 Testing engine events")
+        bus = events.EventBus()
+        seen = []
+        for event_type in (events.DrumLoaded, events.DrumSpun, events.TriggerPulled,
+                           events.RevolverHanded, events.LifeLost):
+            bus.subscribe(event_type, seen.append)
+        gun = revolver.Revolver()
+        crupier = Crupier(gun)
+        player = Player("Player 1", 1)
+        for obj in (gun, crupier, player):
+            obj.events = bus
+        random.seed(3)
+        crupier.setup_round_with_random_bullet_positions(6)
+        crupier.give_revolver_to_player(player)
+        player.shoot_himself()
+        player.take_damage()
+        player.give_revolver_to_crupier(crupier)
+        log_info("Events", [type(event).__name__ for event in seen])
+        self.assertEqual([type(event) for event in seen],
+                         [events.DrumLoaded, events.DrumSpun, events.RevolverHanded,
+                          events.TriggerPulled, events.LifeLost, events.RevolverHanded])
+        self.assertEqual(seen[0].bullets, 6)
+        self.assertIs(seen[3].result, True)
+        self.assertEqual(seen[4], events.LifeLost(player, 0))
+        self.assertEqual((seen[5].giver, seen[5].receiver), (player, crupier))
+
+    def test_130_game_events(self):
+        """Test a game publishes one event per turn and plays no effects in auto mode"""
+        log_test("130 Testing game events with an EventCounter")
+        random.seed(5)
+        game = RussianRoulette(lives=2, animations=False, sound=False, records_directory=None)
+        game.logger.echo = False
+        self.assertFalse(game.has_observers())
+        counter = events.EventCounter(game.events, (events.RoundStarted, events.TurnStarted,
+                                                    events.ShotResolved, events.TriggerPulled,
+                                                    events.LifeLost, events.GameOver))
+        self.assertTrue(game.has_observers())
+        game.play_auto()
+        log_info("Counts", dict(counter.counts))
+        self.assertEqual(counter.counts["RoundStarted"], game.round_number)
+        self.assertEqual(counter.counts["TurnStarted"], game.turns_played)
+        self.assertEqual(counter.counts["ShotResolved"], game.turns_played)
+        self.assertEqual(counter.counts["TriggerPulled"], game.turns_played)
+        self.assertEqual(counter.counts["LifeLost"], game.shots_fired)
+        self.assertEqual(counter.counts["GameOver"], 1)
+
+        stub = soundEffects.StubMixer()
+        with mock.patch.object(soundEffects, "mixer", stub), \
+                mock.patch.object(soundEffects, "SOUND_ENABLED", True):
+            game = RussianRoulette(animations=False, sound=True, records_directory=None)
+            game.logger.echo = False
+            game.play_auto()
+        self.assertEqual(stub.played, [])
+
+
+# === Memory Footprint Tests ===
+
+class TestMemoryFootprint(unittest.TestCase):
+
+    def test_131_shared_table_config(self):
+        """Test games of one table type share their config and carry no instance dicts"""
+        log_test("131 Testing slots and shared TableConfig")
+        first = RussianRoulette(lives=2, animations=False, sound=False, records_directory=None)
+        second = RussianRoulette("Ann", "Bob", lives=2, animations=False, sound=False,
+                                 records_directory=None)
+        log_info("Config", first.config)
+        self.assertIs(first.config, second.config)
+        self.assertEqual((first.lives, first.bullets_per_round, first.sound), (2, 1, False))
+        with self.assertRaises(AttributeError):
+            first.lives = 5
+        for obj in (first, first.crupier, first.player1, first.revolvers[0], first.logger):
+            self.assertFalse(hasattr(obj, "__dict__"), type(obj).__name__)
+        first.logger.player(first.player1.name, "takes the revolver")
+        second.logger.player("Player " + "1", "takes the revolver")
+        self.assertIs(first.logger.history[0][1], second.logger.history[0][1])
+
+    def test_132_memory_budget(self):
+        """Test idle tables and logged events stay within their memory budgets"""
+        log_test("132 Testing benchmarks.measure_memory against the budgets")
+        rows = benchmarks.check_memory(benchmarks.measure_memory(tables=200, events=2000))
+        for name, size, budget, over in rows:
+            log_info(f"Bytes per {name} (budget)", (round(size), budget))
+            self.assertFalse(over, f"{name}: {size:.0f} bytes, budget {budget}")
+
+
+# === Table Pool Tests ===
+
+class TestTablePool(unittest.TestCase):
+
+    def test_133_reset_replays_fresh_game(self):
+        """Test a reset game plays exactly like a new one with the same seed"""
+        log_test("133 Testing RussianRoulette.reset")
+        game = RussianRoulette(lives=2, bullets_per_round=2, animations=False, sound=False,
+                               records_directory=None, revolvers=2)
+        game.logger.echo = False
+        random.seed(4)
+        game.play_auto()
+        previous_shots = game.shots
+        objects = (game.revolvers, game.crupier, game.player1, game.logger, game.events)
+        random.seed(9)
+        game.reset("Ann", "Bob").play_auto()
+
+        fresh = RussianRoulette("Ann", "Bob", lives=2, bullets_per_round=2, animations=False,
+                                sound=False, records_directory=None, revolvers=2)
+        fresh.logger.echo = False
+        random.seed(9)
+        fresh.play_auto()
+        log_info("Reset game", game.summary())
+        self.assertEqual(game.summary(), fresh.summary())
+        self.assertEqual(game.shots, fresh.shots)
+        self.assertEqual([entry[1:] for entry in game.logger.get_history()],
+                         [entry[1:] for entry in fresh.logger.get_history()])
+        self.assertEqual(objects, (game.revolvers, game.crupier, game.player1, game.logger,
+                                   game.events))
+        self.assertIsNot(game.shots, previous_shots)
+
+    def test_134_pool_recycles_games(self):
+        """Test the pool hands back released games, reset, and caps its idle games"""
+        log_test("134 Testing tables.TablePool")
+        pool = tables.TablePool(capacity=1, lives=1)
+        with pool.table() as first:
+            first.play_auto()
+        with pool.table("Ann", "Bob") as second:
+            self.assertIs(second, first)
+            self.assertEqual((second.turns_played, second.player1.name, second.player1.lives),
+                             (0, "Ann", 1))
+            self.assertIsNone(second.player1.revolverInHand)
+            other = pool.acquire()
+        pool.release(other)
+        log_info("Created, reused, idle", (pool.created, pool.reused, len(pool)))
+        self.assertEqual((pool.created, pool.reused, len(pool)), (2, 1, 1))
+        results = tables.play_table(0, 5, pool=pool)
+        self.assertEqual(len(results), 5)
+        self.assertEqual(pool.reused, 6)
+
+    def test_135_pool_avoids_gc_pauses(self):
+        """Test pooled games trigger fewer collections than a new game per match"""
+        log_test("135 Testing benchmarks.measure_gc_pauses")
+        fresh = benchmarks.measure_gc_pauses(400, pooled=False, sound=True)
+        pooled = benchmarks.measure_gc_pauses(400, pooled=True, sound=True)
+        log_info("Collections (new, pooled)", (fresh["collections"], pooled["collections"]))
+        self.assertGreater(fresh["collections"], 0)
+        self.assertLess(pooled["collections"], fresh["collections"])
+
+
+# === Status View Tests ===
+
+class TestStatusView(unittest.TestCase):
+
+    def test_136_status_redraws_on_change(self):
+        """Test the status redraws only on a change, at most once per interval"""
+        log_test("136 Testing graphics.StatusView")
+        now = [0.0]
+        players = [Player(f"Player {n}", lives=5) for n in (1, 2, 3)]
+        view = graphics.StatusView(players, 5, min_interval=1.0, clock=lambda: now[0])
+        text = view.render()
+        log_info("Status", text)
+        self.assertEqual(text.count("❤️"), 15)
+        self.assertIsNone(view.render())
+        players[2].take_damage()
+        players[2].take_damage()
+        now[0] = 0.5
+        self.assertIsNone(view.render())
+        now[0] = 1.5
+        text = view.render()
+        self.assertIn("Player 3: " + "❤️ " * 3 + "🖤 " * 2, text)
+        self.assertIsNone(view.render())
+        self.assertIsNotNone(view.render(force=True))
+        view.reset()
+        self.assertIsNotNone(view.render())
+
+    def test_137_display_status_coalesces(self):
+        """Test display_status prints and publishes only when lives change"""
+        log_test("137 Testing RussianRoulette.display_status")
+        broadcaster = mock.Mock()
+        game = RussianRoulette(lives=4, animations=False, sound=False, records_directory=None,
+                               broadcaster=broadcaster)
+        game.logger.echo = False
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            game.display_status()
+            game.display_status()
+        self.assertEqual(output.getvalue().count("Player 1"), 1)
+        self.assertIn("❤️ " * 4, output.getvalue())
+        self.assertNotIn("🖤", output.getvalue())
+
+        random.seed(2)
+        game.reset()
+        broadcaster.reset_mock()
+        # No throttle: only the change check limits redraws
+        game.status.min_interval = 0
+        game.play_auto()
+        statuses = [call.kwargs["lives"] for call in broadcaster.publish_event.call_args_list
+                    if call.args[0] == "status"]
+        log_info("Statuses sent", statuses)
+        # One status for the start and one per change of lives, never a repeat
+        self.assertEqual(statuses[0], {"Player 1": 4, "Player 2": 4})
+        self.assertTrue(all(a != b for a, b in zip(statuses, statuses[1:])))
+        self.assertLess(len(statuses), game.turns_played)
+        self.assertEqual(statuses[-1], game._lives())
+
+    def test_142_status_after_animation_and_trailing_change(self):
+        """Test the status redraws after an animation clears the screen, and flush draws a held-back change"""
+        log_test("142 Testing status redraws after animations")
+        game = RussianRoulette(animations=True, sound=False, records_directory=None)
+        game.logger.echo = False
+        game.crupier.revolverInHand.load_bullet(3)
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output), \
+                mock.patch("builtins.input", return_value="1"), \
+                mock.patch.object(graphics, "play_frames",
+                                  lambda frames: graphics.collect_frames(frames)[1]):
+            game.display_status()
+            game.play_turn()
+            game.switch_player()
+            game.display_status()
+        log_info("Status bars drawn", output.getvalue().count("=" * 40) // 2)
+        self.assertEqual(game.player1.lives, 3)
+        self.assertEqual(output.getvalue().count("Player 1: "), 2)
+
+        now = [0.0]
+        player = Player("Player 1", lives=2)
+        view = graphics.StatusView([player], 2, min_interval=1.0, clock=lambda: now[0])
+        view.render()
+        player.take_damage()
+        self.assertIsNone(view.render())
+        self.assertTrue(view.pending())
+        self.assertIn("🖤", view.render(flush=True))
+        self.assertFalse(view.pending())
+        self.assertIsNone(view.render(flush=True))
+
 
 if __name__ == '__main__':
     unittest.main()